@@ -1,17 +1,14 @@
 # project-agentic-system-interview-report/backend/app/agents/agent1_job_analysis.py
 import os
-import json
-import re
-from openai import OpenAI
-from backend.app.core.config import OPENAI_API_KEY, OUTPUT_DIR
+from backend.app.core.config import OUTPUT_DIR
+from backend.app.core.artifact_io import write_json
 from backend.app.core.utils import scrape_job_description
+from backend.app.core.structured_output import JOB_ANALYSIS_SECTIONS, complete_json
+from backend.app.core.openai_client import get_client
+from backend.app.core.prompt_budget import assemble_prompt
+from backend.app.core.job_dedup import find_duplicate, remember_job, reuse_analysis
 from backend.app.core.logging import logger
-
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+from backend.app.db.models import save_report, url_hash
 
 
 def refine_with_openai(structured_data: dict) -> dict:
@@ -20,7 +17,8 @@ def refine_with_openai(structured_data: dict) -> dict:
     """
     job_text = structured_data.get("job_description", "")
 
-    prompt = f"""
+    prompt = assemble_prompt(
+        """
     You are an expert job description analyst. Analyze this job posting and extract comprehensive information.
 
     JOB POSTING TEXT:
@@ -73,26 +71,28 @@ def refine_with_openai(structured_data: dict) -> dict:
        - Communication Skills
 
     Return ONLY valid JSON format. Do not include markdown code blocks or any other text.
-    """
+    """,
+        label="job_analysis",
+        job_text=job_text,
+    )
     try:
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        final_data = complete_json(
+            get_client(),
+            "gpt-4o-mini",
+            [
                 {
                     "role": "system",
                     "content": "You are a helpful assistant that formats job data cleanly.",
                 },
                 {"role": "user", "content": prompt},
             ],
-            temperature=0.3,
+            0.3,
+            JOB_ANALYSIS_SECTIONS,
+            "job_analysis",
         )
-
-        text_response = completion.choices[0].message.content.strip()
-        cleaned_text = re.sub(
-            r"^```json\s*|\s*```$", "", text_response, flags=re.DOTALL
-        ).strip()
-
-        return json.loads(cleaned_text)
+        if not final_data:
+            raise ValueError("the answer contained no JSON object")
+        return final_data
     except Exception as e:
         logger.error(f"OpenAI refinement failed: {e}")
         return {
@@ -101,6 +101,11 @@ def refine_with_openai(structured_data: dict) -> dict:
         }
 
 
+def job_output_name(job_url: str) -> str:
+    """File name of a job's analysis in data/job_descriptions, unique per URL"""
+    return f"job_{url_hash(job_url)[:12]}.json"
+
+
 def process_job_url(job_url: str) -> dict:
     """
     Main pipeline: scrape job description, structure with Docling, refine with OpenAI, save JSON.
@@ -109,20 +114,35 @@ def process_job_url(job_url: str) -> dict:
     try:
         # Scrape + structure with Docling
         structured_data = scrape_job_description(job_url)
+        return analyze_job_page(job_url, structured_data)
+    except Exception as e:
+        logger.error(f"Error processing job URL: {e}")
+        return {"error": str(e)}
+
 
-        # Refine/enrich with OpenAI (optional)
+def analyze_job_page(job_url: str, structured_data: dict) -> dict:
+    """
+    Refine an already scraped job page with OpenAI and save the analysis
+    (shared by process_job_url and bulk ingestion).
+    """
+    # Refine/enrich with OpenAI (optional), unless the same posting was
+    # already analyzed under another URL
+    job_text = structured_data.get("job_description", "")
+    duplicate = find_duplicate(job_url, job_text)
+    if duplicate:
+        final_data = reuse_analysis(duplicate)
+    else:
         final_data = refine_with_openai(structured_data)
+        if "note" not in final_data:
+            remember_job(job_url, job_text, final_data)
 
-        # Save output
-        output_path = os.path.join(OUTPUT_DIR, "output.json")
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(final_data, f, indent=4, ensure_ascii=False)
+    # Save output: indexed in the report store, plus a per-URL file that
+    # agent 2 can be pointed at
+    report = save_report(job_url=job_url, job_analysis=final_data)
+    output_path = write_json(os.path.join(OUTPUT_DIR, job_output_name(job_url)), final_data)
 
-        logger.info(f"Output saved to {output_path}")
-        return final_data
-    except Exception as e:
-        logger.error(f"Error processing job URL: {e}")
-        return {"error": str(e)}
+    logger.info(f"Output saved to {output_path} (report {report['id']})")
+    return final_data
 
 
 def main():
@@ -133,7 +153,9 @@ def main():
         return
 
     result = process_job_url(job_url)
-    print("Structured Job Description saved to data/job_description/output.json")
+    print(
+        f"Structured Job Description saved to data/job_descriptions/{job_output_name(job_url)}"
+    )
     # print(json.dumps(result, indent=4, ensure_ascii=False))
 
 
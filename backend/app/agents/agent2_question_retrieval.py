@@ -1,46 +1,45 @@
 # project-agentic-system-interview-report/backend/app/agents/agent2_question_retrieval.py
 import os
 import json
-import re
-from openai import OpenAI
 
 # from config_agent2 import OPENAI_API_KEY, RESUME_DIR, JOB_DESC_DIR, OUTPUT_DIR
 # from utils_agent2 import read_resume
 # from logging_agent2 import logger
 
 from backend.app.core.config_agent2 import (
-    OPENAI_API_KEY,
     RESUME_DIR,
     JOB_DESC_DIR,
     OUTPUT_DIR,
 )
 from backend.app.core.utils_agent2 import read_resume
+from backend.app.core.artifact_io import artifact_exists, read_json, write_json
+from backend.app.core.report_sections import REPORT_SECTIONS
+from backend.app.core.structured_output import complete_json, report_section_points
+from backend.app.core.openai_client import get_client
+from backend.app.core.prompt_budget import assemble_prompt
 from backend.app.core.logging_agent2 import logger
-
-
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+from backend.app.db.question_bank import index_question_bank
 
 
 def generate_resume_analysis(job_desc_file: str, resume_file: str) -> dict:
     """Enhanced resume analysis with comprehensive interview preparation guidance"""
     # Load job description
     job_path = os.path.join(JOB_DESC_DIR, job_desc_file)
-    if not os.path.exists(job_path):
+    if not artifact_exists(job_path):
         raise FileNotFoundError(f"Job description file not found: {job_path}")
 
-    with open(job_path, "r", encoding="utf-8") as f:
-        job_desc = json.load(f)
+    job_desc = read_json(job_path)
 
     # Read resume
     resume_text = read_resume(resume_file, RESUME_DIR)
 
     # Enhanced OpenAI prompt for comprehensive analysis
-    prompt = f"""
+    prompt = assemble_prompt(
+        """
     You are an expert career coach and interview preparation specialist. Analyze this candidate's resume against the job description and create a comprehensive 10+ page interview preparation report.
 
     JOB DESCRIPTION:
-    {json.dumps(job_desc, indent=4)}
+    {job_description}
 
     CANDIDATE RESUME:
     {resume_text}
@@ -132,38 +131,42 @@ def generate_resume_analysis(job_desc_file: str, resume_file: str) -> dict:
         - Challenges to Anticipate
 
     Return ONLY valid JSON format. Make this comprehensive and actionable for interview preparation.
-    """
+    """,
+        label="resume_analysis",
+        job_description=job_desc,
+        resume_text=resume_text,
+    )
 
-    # Call OpenAI API
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
+    # Call OpenAI API; a cut-off or slightly invalid answer is repaired locally
+    # and only the sections still missing are requested again
+    data = complete_json(
+        get_client(),
+        "gpt-4o-mini",
+        [
             {
                 "role": "system",
                 "content": "You are a helpful assistant that provides structured resume-job analysis.",
             },
             {"role": "user", "content": prompt},
         ],
-        temperature=0.3,
+        0.3,
+        report_section_points(REPORT_SECTIONS),
+        "resume_analysis",
     )
-
-    # Extract and clean response
-    text_response = response.choices[0].message.content.strip()
-    text_response = re.sub(
-        r"^```json\s*|\s*```$", "", text_response, flags=re.DOTALL
-    ).strip()
-
-    try:
-        data = json.loads(text_response)
-    except json.JSONDecodeError:
-        data = {"analysis": text_response}
+    if not data:
+        logger.error("Resume analysis returned no usable JSON")
+        data = {"analysis": "The model returned no usable JSON analysis"}
 
     # Save JSON output
-    output_file = os.path.join(OUTPUT_DIR, f"{resume_file}_analysis.json")
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    output_file = write_json(os.path.join(OUTPUT_DIR, f"{resume_file}_analysis.json"), data)
 
     logger.info(f"Resume analysis saved at {output_file}")
+
+    # Generated questions feed the question index used by later reports
+    try:
+        index_question_bank(data, job_desc, source=job_desc_file)
+    except Exception as e:
+        logger.warning(f"Could not index interview questions: {e}")
     return data
 
 
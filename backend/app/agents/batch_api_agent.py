@@ -0,0 +1,386 @@
+# Offline Bulk Screening with the OpenAI Batch API
+# Screens a directory of resumes against one or more job postings through the
+# Batch API: half the price of interactive calls, results within the batch
+# completion window. Meant for overnight runs; an interrupted run continues
+# from its state file (python -m ... --run-dir <dir>) without resubmitting.
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+from backend.app.core.config import BATCH_API_POLL_SECONDS
+from backend.app.core.config_agent2 import OUTPUT_DIR, RESUME_DIR
+from backend.app.core.crawler import crawl
+from backend.app.core.artifact_io import artifact_exists, read_json, write_json
+from backend.app.core.utils_agent2 import read_resume
+from backend.app.core.llm_cache import is_json_response
+from backend.app.core.openai_client import get_client
+from backend.app.core.openai_batch import (
+    TERMINAL_STATUSES,
+    batch_request,
+    cached_result,
+    remember_results,
+    run_batch,
+)
+from backend.app.core.report_render import render_report_chunks
+from backend.app.core.report_sections import REPORT_SECTIONS, section_field
+from backend.app.core.structured_output import JOB_ANALYSIS_SECTIONS, json_schema_format
+from backend.app.core.job_dedup import reuse_analysis
+from backend.app.core.logging_agent2 import logger
+from backend.app.agents.batch_report_agent import list_resumes, url_digest
+from backend.app.agents.job_ingest_agent import read_urls
+from backend.app.agents.enhanced_comprehensive_agent import (
+    analysis_sections,
+    attach_job_metadata,
+    build_comprehensive_analysis_messages,
+    build_job_analysis_messages,
+    find_job_duplicate,
+    parse_comprehensive_analysis,
+    parse_job_analysis,
+    remember_job_analysis,
+    retrieve_questions,
+    save_outputs,
+)
+from backend.app.db.question_bank import merge_question_bank
+
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.3
+STATE_FILE = "state.json"
+
+
+def run_bulk_screening(
+    job_urls: list = None,
+    resume_dir: str = RESUME_DIR,
+    run_dir: str = None,
+    wait: bool = True,
+    poll_seconds: float = BATCH_API_POLL_SECONDS,
+    client=None,
+) -> dict:
+    """
+    Screen every resume in resume_dir against every job URL in four resumable steps:
+    fetch the inputs, analyze the jobs (one batch), analyze each job/resume pair
+    (a second batch) and save the reports. Pass the run_dir of an earlier call to
+    continue it; with wait=False the call returns as soon as a batch is pending.
+    """
+    started = time.perf_counter()
+    state = load_state(run_dir) if run_dir else None
+    if state is None:
+        state = new_run(job_urls or [], resume_dir, run_dir)
+        if "error" in state:
+            return state
+    run_dir = state["run_dir"]
+    client = client or get_client().with_options(max_retries=3)
+
+    def save(_=None):
+        save_state(run_dir, state)
+
+    save()
+    prepare_inputs(state)
+    save()
+
+    job_analyses = analyze_jobs(client, state, save, wait, poll_seconds)
+    if job_analyses is None:
+        return pending_result(state)
+
+    analyses = analyze_pairs(client, state, job_analyses, save, wait, poll_seconds)
+    if analyses is None:
+        return pending_result(state)
+
+    save_reports(state, job_analyses, analyses, save)
+    state["status"] = "completed"
+    save()
+
+    reports = state["reports"]
+    index_path = write_json(
+        os.path.join(run_dir, "index.json"),
+        {"run_dir": run_dir, "reports": reports, "failed": state["failed"]},
+    )
+    summary = {
+        "success": True,
+        "run_dir": run_dir,
+        "index_path": index_path,
+        "succeeded": len(reports),
+        "failed": len(state["failed"]),
+        "duration_s": round(time.perf_counter() - started, 3),
+    }
+    logger.info(f"Batch API run finished: {json.dumps(summary)}")
+    return summary
+
+
+def new_run(job_urls: list, resume_dir: str, run_dir: str = None) -> dict:
+    job_urls = list(dict.fromkeys(url.strip() for url in job_urls if url.strip()))
+    resumes = list_resumes(resume_dir)
+    if not job_urls:
+        return {"error": "No job URLs given"}
+    if not resumes:
+        return {"error": f"No PDF or DOCX resumes found in {resume_dir}"}
+    if run_dir is None:
+        digest = url_digest("\n".join(job_urls))[:8]
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{digest}"
+        run_dir = os.path.join(OUTPUT_DIR, "batch_api", name)
+    os.makedirs(run_dir, exist_ok=True)
+    logger.info(f"New Batch API run in {run_dir}: {len(job_urls)} jobs x {len(resumes)} resumes")
+    return {
+        "run_dir": os.path.abspath(run_dir),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "status": "running",
+        "job_urls": job_urls,
+        "resume_dir": os.path.abspath(resume_dir),
+        "resumes": resumes,
+        "job_batches": {},
+        "analysis_batches": {},
+        "reports": {},
+        "failed": {},
+    }
+
+
+def load_state(run_dir: str):
+    path = os.path.join(run_dir, STATE_FILE)
+    if not artifact_exists(path):
+        return None
+    return read_json(path)
+
+
+def save_state(run_dir: str, state: dict):
+    """Write state.json atomically, so a crash never leaves half a state"""
+    # Rewritten after every step and read by hand, so never compressed
+    write_json(os.path.join(run_dir, STATE_FILE), state, compression="none")
+
+
+def pending_result(state: dict) -> dict:
+    return {
+        "success": True,
+        "pending": True,
+        "run_dir": state["run_dir"],
+        "message": "Batches submitted; run again with the same --run-dir to continue",
+    }
+
+
+def input_path(state: dict, kind: str, name: str) -> str:
+    return os.path.join(state["run_dir"], kind, name)
+
+
+def prepare_inputs(state: dict):
+    """Fetch the job pages and extract the resumes not fetched by an earlier call"""
+    job_paths = {
+        url: input_path(state, "jobs", f"{url_digest(url)[:16]}.json") for url in state["job_urls"]
+    }
+    missing = [url for url, path in job_paths.items() if not artifact_exists(path)]
+    missing = [url for url in missing if url not in state["failed"]]
+
+    async def fetch():
+        async for url, job_data in crawl(missing):
+            if "error" in job_data:
+                state["failed"][url] = f"Job scraping failed: {job_data['error']}"
+            else:
+                write_json(job_paths[url], job_data)
+
+    if missing:
+        logger.info(f"Fetching {len(missing)} job pages...")
+        asyncio.run(fetch())
+
+    for name in state["resumes"]:
+        path = input_path(state, "resumes", f"{name}.json")
+        if artifact_exists(path) or name in state["failed"]:
+            continue
+        try:
+            write_json(path, {"text": read_resume(name, state["resume_dir"])})
+        except Exception as e:
+            logger.error(f"Reading resume {name} failed: {e}")
+            state["failed"][name] = f"Reading resume failed: {e}"
+
+
+def analyze_jobs(client, state: dict, save, wait: bool, poll_seconds: float):
+    """{job_url: job analysis}, or None while the job batch is still running"""
+    analyses, requests, job_data_by_id = {}, [], {}
+    for url in state["job_urls"]:
+        digest = url_digest(url)[:16]
+        analysis_path = input_path(state, "job_analyses", f"{digest}.json")
+        data_path = input_path(state, "jobs", f"{digest}.json")
+        if artifact_exists(analysis_path):
+            analyses[url] = read_json(analysis_path)
+            continue
+        if not artifact_exists(data_path):
+            continue
+        job_data = read_json(data_path)
+        duplicate = find_job_duplicate(job_data)
+        if duplicate:
+            analyses[url] = attach_job_metadata(reuse_analysis(duplicate), job_data)
+            write_json(analysis_path, analyses[url])
+            continue
+        request = batch_request(
+            f"job-{digest}",
+            MODEL,
+            build_job_analysis_messages(job_data),
+            TEMPERATURE,
+            json_schema_format("job_analysis", JOB_ANALYSIS_SECTIONS),
+        )
+        requests.append(request)
+        job_data_by_id[request["custom_id"]] = (url, job_data, analysis_path)
+
+    results = collect(client, requests, state["job_batches"], state, save, wait, poll_seconds)
+    if results is None:
+        return None
+    for custom_id, (url, job_data, analysis_path) in job_data_by_id.items():
+        try:
+            job_analysis = parse_job_analysis(result_text(results, custom_id), job_data)
+        except Exception as e:
+            logger.error(f"Job analysis failed for {url}: {e}")
+            state["failed"][url] = f"Job analysis failed: {e}"
+            continue
+        remember_job_analysis(job_data, job_analysis)
+        write_json(analysis_path, job_analysis)
+        analyses[url] = job_analysis
+    save()
+    return analyses
+
+
+def analyze_pairs(client, state: dict, job_analyses: dict, save, wait: bool, poll_seconds: float):
+    """{pair id: comprehensive analysis}, or None while the analysis batch is still running"""
+    requests, pairs = [], {}
+    for url, job_analysis in job_analyses.items():
+        for name in state["resumes"]:
+            pair_id = pair_key(url, name)
+            resume_path = input_path(state, "resumes", f"{name}.json")
+            if pair_id in state["reports"] or not artifact_exists(resume_path):
+                continue
+            # Retrieved questions are kept with the run, so the answers are
+            # merged with the same bank the requests were built from
+            retrieved_path = input_path(state, "retrieved", f"{pair_id}.json")
+            if artifact_exists(retrieved_path):
+                retrieved = read_json(retrieved_path)
+            else:
+                retrieved = retrieve_questions(job_analysis)
+                write_json(retrieved_path, retrieved)
+            messages = build_comprehensive_analysis_messages(
+                job_analysis, read_json(resume_path)["text"], retrieved
+            )
+            request = batch_request(
+                f"analysis-{pair_id}",
+                MODEL,
+                messages,
+                TEMPERATURE,
+                json_schema_format(
+                    "resume_analysis", analysis_sections(REPORT_SECTIONS, retrieved)
+                ),
+            )
+            requests.append(request)
+            pairs[request["custom_id"]] = (pair_id, retrieved)
+
+    results = collect(
+        client, requests, state["analysis_batches"], state, save, wait, poll_seconds
+    )
+    if results is None:
+        return None
+    analyses = {}
+    for custom_id, (pair_id, retrieved) in pairs.items():
+        try:
+            analysis = parse_comprehensive_analysis(result_text(results, custom_id))
+            analyses[pair_id] = merge_question_bank(analysis, retrieved)
+        except Exception as e:
+            logger.error(f"Comprehensive analysis failed for {pair_id}: {e}")
+            state["failed"][pair_id] = f"Analysis failed: {e}"
+    return analyses
+
+
+def collect(client, requests: list, batch_state: dict, state: dict, save, wait, poll_seconds):
+    """Results from the LLM cache or a batch; None if the batch is still running"""
+    results, uncached = {}, []
+    for request in requests:
+        cached = cached_result(request)
+        if cached is None:
+            uncached.append(request)
+        else:
+            results[request["custom_id"]] = cached
+    if not uncached:
+        return results
+
+    work_dir = os.path.join(state["run_dir"], "batches")
+    batch_results = run_batch(
+        client, uncached, batch_state, work_dir, save, wait=wait, poll_seconds=poll_seconds
+    )
+    if any(batch["status"] not in TERMINAL_STATUSES for batch in batch_state["batches"]):
+        return None
+    remember_results(uncached, batch_results, validate=is_json_response)
+    results.update(batch_results)
+    return results
+
+
+def result_text(results: dict, custom_id: str) -> str:
+    result = results.get(custom_id) or {"error": "no result returned by the batch"}
+    if "text" not in result:
+        raise RuntimeError(result["error"])
+    return result["text"]
+
+
+def save_reports(state: dict, job_analyses: dict, analyses: dict, save):
+    """Fan the analyses out to save_outputs, rendering each HTML report into the store"""
+    for url, job_analysis in job_analyses.items():
+        for name in state["resumes"]:
+            pair_id = pair_key(url, name)
+            analysis = analyses.get(pair_id)
+            if analysis is None or pair_id in state["reports"]:
+                continue
+            report = save_outputs(
+                job_analysis, analysis, render_report_chunks(job_analysis, analysis), name, url
+            )
+            if report is None:
+                state["failed"][pair_id] = "Saving the report failed"
+                continue
+            state["reports"][pair_id] = {
+                "job_url": url,
+                "resume_file": name,
+                "report_id": report["id"],
+                "html_report_path": report["paths"].get("html_report"),
+                "match_percentage": section_field(
+                    analysis, "EXECUTIVE_SUMMARY", "Overall_Match_Percentage"
+                ),
+            }
+            save()
+
+
+def pair_key(job_url: str, resume_file: str) -> str:
+    """Short stable id of a job/resume pair (also used in batch custom_ids)"""
+    return hashlib.sha256(f"{job_url}\n{resume_file}".encode("utf-8")).hexdigest()[:20]
+
+
+def main():
+    """Main function for command-line usage"""
+    parser = argparse.ArgumentParser(
+        description="Screen resumes against job postings through the OpenAI Batch API."
+    )
+    parser.add_argument("job_urls", nargs="*", help="Job posting URLs")
+    parser.add_argument("--jobs-file", help='File with one job URL per line ("-" for stdin)')
+    parser.add_argument("--resume-dir", default=RESUME_DIR, help="Directory of PDF/DOCX resumes")
+    parser.add_argument("--run-dir", default=None, help="Run directory (continue an earlier run)")
+    parser.add_argument(
+        "--no-wait", action="store_true", help="Submit the pending batch and exit"
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=BATCH_API_POLL_SECONDS,
+        help="Seconds between batch status polls",
+    )
+    args = parser.parse_args()
+
+    job_urls = list(args.job_urls) + (read_urls(args.jobs_file) if args.jobs_file else [])
+
+    print("===== Batch API Interview Preparation Reports =====")
+    result = run_bulk_screening(
+        job_urls, args.resume_dir, args.run_dir, not args.no_wait, args.poll_seconds
+    )
+
+    if result.get("pending"):
+        print(f"⏳ {result['message']}: {result['run_dir']}")
+    elif result.get("success"):
+        print(f"✅ {result['succeeded']} reports generated, {result['failed']} failed")
+        print(f"📄 Index: {result['index_path']}")
+    else:
+        print(f"❌ Error: {result.get('error', 'Unknown error')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# Batch Interview Preparation Reports
+# Scrapes and analyzes one job posting, then screens a directory of resumes against it
+
+import os
+import time
+import asyncio
+import hashlib
+import argparse
+from backend.app.core.config_agent2 import (
+    RESUME_DIR,
+    OUTPUT_DIR,
+    BATCH_CONCURRENCY,
+    BATCH_MAX_CONCURRENCY,
+    ANALYSIS_INCREMENTAL,
+)
+from backend.app.core.config import REPORT_COMPRESSION
+from backend.app.core.report_render import write_report
+from backend.app.core.report_sections import section_field
+from backend.app.core.artifact_io import write_json
+from backend.app.core.utils_agent2 import read_resume
+from backend.app.core.utils import scrape_job_description_async
+from backend.app.core.llm_gateway import PRIORITY_BATCH, llm_priority
+from backend.app.core.logging_agent2 import logger
+from backend.app.agents.enhanced_comprehensive_agent import (
+    analyze_job_with_ai_async,
+    generate_comprehensive_analysis_async,
+    generate_incremental_analysis_async,
+)
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+
+def generate_batch_reports(
+    job_url: str,
+    resume_dir: str = RESUME_DIR,
+    output_dir: str = None,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> dict:
+    """
+    Screen every resume in resume_dir against a single job posting.
+    """
+    return asyncio.run(
+        generate_batch_reports_async(job_url, resume_dir, output_dir, concurrency)
+    )
+
+
+async def generate_batch_reports_async(
+    job_url: str,
+    resume_dir: str = RESUME_DIR,
+    output_dir: str = None,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> dict:
+    """
+    Scrape and analyze the job once, then fan out the resume analysis over all
+    resumes in resume_dir with at most `concurrency` reports in flight (capped
+    at BATCH_MAX_CONCURRENCY). Writes per-resume JSON/HTML outputs and an
+    index.json summary to output_dir.
+    """
+    started = time.perf_counter()
+    concurrency = min(max(1, concurrency), BATCH_MAX_CONCURRENCY)
+    resume_files = list_resumes(resume_dir)
+    if not resume_files:
+        return {"error": f"No PDF or DOCX resumes found in {resume_dir}"}
+
+    if output_dir is None:
+        batch_id = time.strftime("%Y%m%d-%H%M%S") + "-" + url_digest(job_url)[:8]
+        output_dir = os.path.join(OUTPUT_DIR, "batches", batch_id)
+    os.makedirs(output_dir, exist_ok=True)
+
+    logger.info(
+        f"Starting batch of {len(resume_files)} resumes for job URL: {job_url} "
+        f"(concurrency={concurrency})"
+    )
+
+    job_data = await scrape_job_description_async(job_url)
+    if "error" in job_data:
+        return {"error": f"Job scraping failed: {job_data['error']}"}
+
+    # Batch calls queue behind interactive and single-report work in the LLM gateway
+    with llm_priority(PRIORITY_BATCH):
+        job_analysis = await analyze_job_with_ai_async(job_data)
+    if "error" in job_analysis:
+        return {"error": job_analysis["error"]}
+
+    job_output_path = write_json(os.path.join(output_dir, "job_analysis.json"), job_analysis)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(resume_file: str) -> dict:
+        async with semaphore:
+            with llm_priority(PRIORITY_BATCH):
+                return await process_resume(
+                    job_analysis, job_url, resume_file, resume_dir, output_dir
+                )
+
+    results = await asyncio.gather(*(run(name) for name in resume_files))
+
+    index = {
+        "job_url": job_url,
+        "job_title": section_field(job_analysis, "BASIC_INFORMATION", "Job_Title", ""),
+        "job_analysis": job_output_path,
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "concurrency": concurrency,
+        "duration_s": round(time.perf_counter() - started, 3),
+        "succeeded": sum(1 for r in results if r["status"] == "success"),
+        "failed": sum(1 for r in results if r["status"] != "success"),
+        "resumes": results,
+    }
+    index_path = write_json(os.path.join(output_dir, "index.json"), index)
+
+    logger.info(
+        f"Batch finished: {index['succeeded']} succeeded, {index['failed']} failed, "
+        f"index saved at {index_path}"
+    )
+    return {"success": True, "output_dir": output_dir, "index_path": index_path, **index}
+
+
+async def process_resume(
+    job_analysis: dict, job_url: str, resume_file: str, resume_dir: str, output_dir: str
+) -> dict:
+    """Analyze one resume against the shared job analysis and save its outputs"""
+    started = time.perf_counter()
+    summary = {"resume_file": resume_file}
+    try:
+        resume_text = await asyncio.to_thread(read_resume, resume_file, resume_dir)
+        if ANALYSIS_INCREMENTAL:
+            resume_path = os.path.abspath(os.path.join(resume_dir, resume_file))
+            analysis, diff = await generate_incremental_analysis_async(
+                job_analysis, resume_text, job_url, resume_path
+            )
+            summary["sections_recomputed"] = diff["recomputed"]
+        else:
+            analysis = await generate_comprehensive_analysis_async(
+                job_analysis, resume_text, job_url
+            )
+        if "error" in analysis:
+            raise RuntimeError(analysis["error"])
+
+        analysis_path = os.path.join(
+            output_dir, f"{resume_file}_comprehensive_analysis.json"
+        )
+        report_path = os.path.join(output_dir, f"{resume_file}_comprehensive_report.html")
+        analysis_path = await asyncio.to_thread(
+            write_outputs, job_analysis, analysis, analysis_path, report_path
+        )
+
+        summary.update(
+            {
+                "status": "success",
+                "match_percentage": section_field(
+                    analysis, "EXECUTIVE_SUMMARY", "Overall_Match_Percentage"
+                ),
+                "analysis_path": analysis_path,
+                "report_path": report_path,
+            }
+        )
+    except Exception as e:
+        logger.error(f"Batch analysis failed for {resume_file}: {e}")
+        summary.update({"status": "failed", "error": str(e)})
+
+    summary["duration_s"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def write_outputs(
+    job_analysis: dict, analysis: dict, analysis_path: str, report_path: str
+) -> str:
+    """
+    Write one resume's analysis JSON and stream its HTML report to disk; returns
+    the path the analysis was written to (with .zst/.gz if compressed)
+    """
+    analysis_path = write_json(analysis_path, analysis)
+    write_report(report_path, job_analysis, analysis, REPORT_COMPRESSION)
+    return analysis_path
+
+
+def list_resumes(resume_dir: str) -> list:
+    """Return the sorted PDF/DOCX filenames in resume_dir"""
+    if not os.path.isdir(resume_dir):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(resume_dir)
+        if name.lower().endswith(RESUME_EXTENSIONS)
+        and os.path.isfile(os.path.join(resume_dir, name))
+    )
+
+
+def url_digest(url: str) -> str:
+    """Stable hex digest of a job URL"""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def main():
+    """Main function for command-line usage"""
+    parser = argparse.ArgumentParser(
+        description="Screen a directory of resumes against one job posting."
+    )
+    parser.add_argument("job_url", help="Job posting URL")
+    parser.add_argument(
+        "--resume-dir", default=RESUME_DIR, help="Directory of PDF/DOCX resumes"
+    )
+    parser.add_argument(
+        "--output-dir", default=None, help="Where to write reports and index.json"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BATCH_CONCURRENCY,
+        help="Maximum number of resumes analyzed at the same time",
+    )
+    args = parser.parse_args()
+
+    print("===== Batch Interview Preparation Reports =====")
+    print(f"Processing job URL: {args.job_url}")
+    print(f"Resumes from: {args.resume_dir}\n")
+
+    result = generate_batch_reports(
+        args.job_url, args.resume_dir, args.output_dir, args.concurrency
+    )
+
+    if result.get("success"):
+        print(f"✅ {result['succeeded']} reports generated, {result['failed']} failed")
+        print(f"📄 Index: {result['index_path']}")
+    else:
+        print(f"❌ Error: {result.get('error', 'Unknown error')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,77 +3,281 @@
 
 import os
 import json
-import re
-from openai import OpenAI
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from backend.app.core.config_agent2 import (
-    OPENAI_API_KEY,
     RESUME_DIR,
-    JOB_DESC_DIR,
-    OUTPUT_DIR,
+    ANALYSIS_SHARDED,
+    ANALYSIS_INCREMENTAL,
+    SHARD_RETRIES,
 )
+from backend.app.core.config import QUESTION_RETRIEVAL_ENABLED
 from backend.app.core.utils_agent2 import read_resume
-from backend.app.core.utils import scrape_job_description
+from backend.app.core.resume_cache import file_digest
+from backend.app.core.utils import scrape_job_description_async
+from backend.app.core.pipeline import run_stages, timed_stage
+from backend.app.core.metrics import collect_run, stage_timer
+from backend.app.core.llm_cache import chat_completion_stream, chat_completion_stream_async
+from backend.app.core.json_repair import parse_json_object, strip_json_fence
+from backend.app.core.structured_output import (
+    JOB_ANALYSIS_SECTIONS,
+    complete_json,
+    complete_json_async,
+    json_schema_format,
+    report_section_points,
+)
+from backend.app.core.json_stream import TopLevelObjectParser
+from backend.app.core.openai_client import get_async_client, get_client
+from backend.app.core.job_dedup import find_duplicate, remember_job, reuse_analysis
+from backend.app.core.prompt_budget import assemble_prompt
+from backend.app.core.report_render import (
+    get_report_template,
+    render_report,
+    render_report_chunks,
+    render_report_section,
+)
+from backend.app.core.report_sections import (
+    REPORT_SECTIONS,
+    SECTION_SHARDS,
+    find_section,
+    format_sections,
+    merge_sections,
+    shard_sections,
+)
+from backend.app.core.section_store import (
+    analysis_inputs,
+    format_section_diff,
+    plan_sections,
+    store_sections,
+)
 from backend.app.core.logging_agent2 import logger
-from jinja2 import Template
-
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+from backend.app.db.models import save_report
+from backend.app.db.question_bank import (
+    index_question_bank,
+    merge_question_bank,
+    reduce_bank_section,
+    retrieve_question_bank,
+)
 
 
 def generate_comprehensive_report(job_url: str, resume_file: str) -> dict:
     """
     Complete workflow: scrape job, analyze resume, generate comprehensive report
     """
-    logger.info(f"Starting comprehensive analysis for job URL: {job_url}")
+    return asyncio.run(generate_comprehensive_report_async(job_url, resume_file))
 
-    try:
-        # Step 1: Scrape and analyze job description
-        logger.info("Step 1: Scraping job description...")
-        job_data = scrape_job_description(job_url)
 
+async def generate_comprehensive_report_async(job_url: str, resume_file: str) -> dict:
+    """
+    Async workflow: runs each stage as soon as its inputs are ready.
+    Reading the resume overlaps with scraping and job analysis, so a report costs
+    the critical path instead of the sum of all stages. The result's "metrics"
+    holds the run's stage durations (render is part of save, as the report is
+    rendered into the store) and LLM token usage.
+    """
+    logger.info(f"Starting comprehensive analysis for job URL: {job_url}")
+
+    async def scrape():
+        logger.info("Scraping job description...")
+        job_data = await scrape_job_description_async(job_url)
         if "error" in job_data:
-            return {"error": f"Job scraping failed: {job_data['error']}"}
+            raise RuntimeError(f"Job scraping failed: {job_data['error']}")
+        return job_data
+
+    async def analyze_job(job_data):
+        logger.info("Analyzing job description with AI...")
+        return await analyze_job_with_ai_async(job_data)
+
+    async def read():
+        logger.info("Reading resume...")
+        return await asyncio.to_thread(read_resume, resume_file, RESUME_DIR)
+
+    section_diff = {}
+
+    async def analyze(job_analysis, resume_text):
+        logger.info("Generating comprehensive analysis...")
+        if not ANALYSIS_INCREMENTAL:
+            return await generate_comprehensive_analysis_async(
+                job_analysis, resume_text, job_url
+            )
+        resume_path = os.path.abspath(os.path.join(RESUME_DIR, resume_file))
+        analysis, diff = await generate_incremental_analysis_async(
+            job_analysis, resume_text, job_url, resume_path
+        )
+        section_diff.update(diff)
+        return analysis
 
-        # Step 2: Analyze job with OpenAI
-        logger.info("Step 2: Analyzing job description with AI...")
-        job_analysis = analyze_job_with_ai(job_data)
+    async def render_and_save(job_analysis, comprehensive_analysis):
+        # The HTML is rendered straight into the report store, never as one string
+        logger.info("Rendering HTML report and saving outputs...")
+        report = await asyncio.to_thread(
+            save_outputs,
+            job_analysis,
+            comprehensive_analysis,
+            render_report_chunks(job_analysis, comprehensive_analysis),
+            resume_file,
+            job_url,
+        )
+        if report is None:
+            raise RuntimeError("Saving the report failed")
+        return report
+
+    stages = {
+        "scrape": ((), timed_stage("scrape", scrape)),
+        "job_analysis": (("scrape",), timed_stage("job_analysis", analyze_job)),
+        "read_resume": ((), timed_stage("read_resume", read)),
+        "analysis": (("job_analysis", "read_resume"), timed_stage("analysis", analyze)),
+        "save": (("job_analysis", "analysis"), timed_stage("save", render_and_save)),
+    }
+
+    with collect_run() as metrics:
+        try:
+            results, timings = await run_stages(stages)
+        except Exception as e:
+            logger.error(f"Error in comprehensive report generation: {e}")
+            return {"error": str(e), "metrics": metrics}
+
+    logger.info(f"Stage timings: {json.dumps(timings)}")
+    logger.info(f"Run metrics: {json.dumps(metrics)}")
+    return {
+        "success": True,
+        "job_analysis": results["job_analysis"],
+        "resume_analysis": results["analysis"],
+        "html_report_path": results["save"]["paths"].get("html_report"),
+        "report": results["save"],
+        "timings": timings,
+        "metrics": metrics,
+        "section_diff": section_diff or None,
+        "message": "Comprehensive report generated successfully",
+    }
+
+
+async def stream_comprehensive_report(job_url: str, resume_file: str):
+    """
+    Async generator version of the workflow for progressive display. Yields
+    (event, data) pairs: "section" with the rendered HTML of one report block as
+    soon as its data exists, then "done" with the saved report, or "error".
+    """
+    logger.info(f"Starting streamed analysis for job URL: {job_url}")
+    template = await asyncio.to_thread(get_report_template)
+    resume_task = asyncio.create_task(
+        asyncio.to_thread(read_resume, resume_file, RESUME_DIR)
+    )
 
-        # Step 3: Read resume
-        logger.info("Step 3: Reading resume...")
-        resume_text = read_resume(resume_file, RESUME_DIR)
+    try:
+        with stage_timer("scrape"):
+            job_data = await scrape_job_description_async(job_url)
+            if "error" in job_data:
+                raise RuntimeError(f"Job scraping failed: {job_data['error']}")
+        with stage_timer("job_analysis"):
+            job_analysis = await analyze_job_with_ai_async(job_data)
+            if "error" in job_analysis:
+                raise RuntimeError(job_analysis["error"])
+
+        comprehensive_analysis = {}
+        yield "section", {
+            "block": "job_overview",
+            "html": render_report_section(
+                template, "job_overview", job_analysis, comprehensive_analysis
+            ),
+        }
 
-        # Step 4: Generate comprehensive analysis
-        logger.info("Step 4: Generating comprehensive analysis...")
-        comprehensive_analysis = generate_comprehensive_analysis(
+        resume_text = await resume_task
+        async for key, value in stream_comprehensive_analysis(
             job_analysis, resume_text, job_url
+        ):
+            comprehensive_analysis[key] = value
+            block = report_block_for(key)
+            if block:
+                yield "section", {
+                    "block": block,
+                    "html": render_report_section(
+                        template, block, job_analysis, comprehensive_analysis
+                    ),
+                }
+
+        with stage_timer("save"):
+            report = await asyncio.to_thread(
+                save_outputs,
+                job_analysis,
+                comprehensive_analysis,
+                render_report_chunks(job_analysis, comprehensive_analysis),
+                resume_file,
+                job_url,
+            )
+            if report is None:
+                raise RuntimeError("Saving the report failed")
+    except Exception as e:
+        logger.error(f"Error in streamed report generation: {e}")
+        resume_task.cancel()
+        yield "error", {"error": str(e)}
+        return
+
+    yield "done", {
+        "success": True,
+        "job_analysis": job_analysis,
+        "resume_analysis": comprehensive_analysis,
+        "html_report_path": report["paths"].get("html_report"),
+        "report": report,
+        "message": "Comprehensive report generated successfully",
+    }
+
+
+def analyze_job_with_ai(job_data: dict) -> dict:
+    """Enhanced job analysis with comprehensive extraction"""
+    try:
+        duplicate = find_job_duplicate(job_data)
+        if duplicate:
+            return attach_job_metadata(reuse_analysis(duplicate), job_data)
+
+        job_analysis = complete_json(
+            get_client(),
+            "gpt-4o-mini",
+            build_job_analysis_messages(job_data),
+            0.3,
+            JOB_ANALYSIS_SECTIONS,
+            "job_analysis",
         )
+        job_analysis = attach_job_metadata(require_json(job_analysis), job_data)
+        remember_job_analysis(job_data, job_analysis)
+        return job_analysis
 
-        # Step 5: Generate HTML report
-        logger.info("Step 5: Generating HTML report...")
-        html_report = generate_html_report(job_analysis, comprehensive_analysis)
+    except Exception as e:
+        logger.error(f"Job analysis failed: {e}")
+        return {"error": f"Job analysis failed: {e}"}
 
-        # Step 6: Save all outputs
-        logger.info("Step 6: Saving outputs...")
-        save_outputs(job_analysis, comprehensive_analysis, html_report, resume_file)
 
-        return {
-            "success": True,
-            "job_analysis": job_analysis,
-            "resume_analysis": comprehensive_analysis,
-            "html_report": html_report,
-            "message": "Comprehensive report generated successfully",
-        }
+async def analyze_job_with_ai_async(job_data: dict) -> dict:
+    """Async variant of analyze_job_with_ai"""
+    try:
+        duplicate = await asyncio.to_thread(find_job_duplicate, job_data)
+        if duplicate:
+            return attach_job_metadata(reuse_analysis(duplicate), job_data)
+
+        job_analysis = await complete_json_async(
+            get_async_client(),
+            "gpt-4o-mini",
+            build_job_analysis_messages(job_data),
+            0.3,
+            JOB_ANALYSIS_SECTIONS,
+            "job_analysis",
+        )
+        job_analysis = attach_job_metadata(require_json(job_analysis), job_data)
+        await asyncio.to_thread(remember_job_analysis, job_data, job_analysis)
+        return job_analysis
 
     except Exception as e:
-        logger.error(f"Error in comprehensive report generation: {e}")
-        return {"error": str(e)}
+        logger.error(f"Job analysis failed: {e}")
+        return {"error": f"Job analysis failed: {e}"}
 
 
-def analyze_job_with_ai(job_data: dict) -> dict:
-    """Enhanced job analysis with comprehensive extraction"""
+def build_job_analysis_messages(job_data: dict) -> list:
+    """Build the chat messages for the job analysis request"""
     job_text = job_data.get("job_description", "")
 
-    prompt = f"""
+    prompt = assemble_prompt(
+        """
     You are an expert job description analyst. Analyze this job posting and extract comprehensive information.
 
     JOB POSTING TEXT:
@@ -126,187 +330,498 @@ def analyze_job_with_ai(job_data: dict) -> dict:
        - Communication Skills
 
     Return ONLY valid JSON format. Do not include markdown code blocks or any other text.
-    """
+    """,
+        label="job_analysis",
+        job_text=job_text,
+    )
 
-    try:
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that formats job data cleanly.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that formats job data cleanly.",
+        },
+        {"role": "user", "content": prompt},
+    ]
 
-        text_response = completion.choices[0].message.content.strip()
-        cleaned_text = re.sub(
-            r"^```json\s*|\s*```$", "", text_response, flags=re.DOTALL
-        ).strip()
 
-        job_analysis = json.loads(cleaned_text)
-        job_analysis["scraped_at"] = job_data.get("metadata", {}).get("scraped_at", "")
-        job_analysis["source_url"] = job_data.get("url", "")
+def parse_job_analysis(text_response: str, job_data: dict) -> dict:
+    """Parse (and if needed repair) the job analysis JSON and attach source metadata"""
+    return attach_job_metadata(require_json(parse_json_object(text_response)), job_data)
 
-        return job_analysis
 
-    except Exception as e:
-        logger.error(f"Job analysis failed: {e}")
-        return {"error": f"Job analysis failed: {e}"}
+def require_json(data: dict) -> dict:
+    if not data:
+        raise ValueError("the answer contained no JSON object")
+    return data
+
+
+def attach_job_metadata(job_analysis: dict, job_data: dict) -> dict:
+    job_analysis["scraped_at"] = job_data.get("metadata", {}).get("scraped_at", "")
+    job_analysis["source_url"] = job_data.get("url", "")
+    return job_analysis
+
+
+def find_job_duplicate(job_data: dict):
+    """A stored analysis of a near-identical posting (reposts, other job boards)"""
+    return find_duplicate(
+        job_data.get("url", ""), job_data.get("job_description", ""), kind="enhanced"
+    )
+
+
+def remember_job_analysis(job_data: dict, job_analysis: dict):
+    remember_job(
+        job_data.get("url", ""), job_data.get("job_description", ""), job_analysis, kind="enhanced"
+    )
 
 
 def generate_comprehensive_analysis(
-    job_analysis: dict, resume_text: str, job_url: str
+    job_analysis: dict,
+    resume_text: str,
+    job_url: str,
+    stream: bool = False,
+    on_section=None,
+    sharded: bool = ANALYSIS_SHARDED,
 ) -> dict:
-    """Generate comprehensive resume analysis with detailed preparation guidance"""
-
-    prompt = f"""
-    You are an expert career coach and interview preparation specialist. Analyze this candidate's resume against the job description and create a comprehensive interview preparation report.
-
-    JOB DESCRIPTION:
-    {json.dumps(job_analysis, indent=4)}
-
-    CANDIDATE RESUME:
-    {resume_text}
-
-    Create a detailed JSON analysis with the following sections:
-
-    1. EXECUTIVE SUMMARY:
-       - Overall Match Percentage (0-100%)
-       - Key Strengths Summary
-       - Primary Concerns/Gaps
-       - Recommended Preparation Focus Areas
-
-    2. SKILLS ANALYSIS:
-       - Required Skills Assessment (match/missing/partial)
-       - Technical Skills Gap Analysis
-       - Soft Skills Evaluation
-       - Certifications & Education Alignment
-       - Experience Level Comparison
-
-    3. PERSONALIZED INTRODUCTION STRATEGY:
-       - 30-Second Elevator Pitch Template
-       - 2-Minute Detailed Introduction
-       - Key Value Propositions to Highlight
-       - Unique Selling Points
-       - Career Story Narrative
-
-    4. TECHNICAL PREPARATION:
-       - Technical Skills to Brush Up On
-       - Coding Challenges to Practice
-       - System Design Topics
-       - Architecture Questions to Study
-       - Tools & Technologies to Research
-       - Portfolio Projects to Highlight
-
-    5. BEHAVIORAL PREPARATION:
-       - STAR Method Examples to Prepare
-       - Leadership Stories
-       - Problem-Solving Examples
-       - Teamwork Scenarios
-       - Failure & Learning Stories
-       - Success Stories Relevant to Role
-
-    6. INTERVIEW QUESTIONS BANK:
-       - Technical Questions (20+ questions)
-       - Behavioral Questions (15+ questions)
-       - Company-Specific Questions (10+ questions)
-       - Role-Specific Questions (10+ questions)
-       - Situational Questions (10+ questions)
-
-    7. QUESTIONS TO ASK INTERVIEWER:
-       - Technical Questions (10+ questions)
-       - Team & Culture Questions (10+ questions)
-       - Growth & Development Questions (10+ questions)
-       - Role-Specific Questions (10+ questions)
-
-    8. KEYWORDS & PHRASES:
-       - Technical Keywords to Use
-       - Industry-Specific Terms
-       - Company Values to Reference
-       - Action Verbs to Include
-       - Metrics & Achievements to Highlight
-
-    9. RED FLAGS & CONCERNS:
-       - Potential Weaknesses to Address
-       - Gaps to Explain Proactively
-       - Difficult Questions to Prepare For
-       - Salary Negotiation Points
-       - Timeline Concerns
-
-    10. SUCCESS STRATEGIES:
-        - Interview Day Preparation
-        - Body Language Tips
-        - Communication Style Adjustments
-        - Follow-up Strategy
-        - Negotiation Preparation
-
-    11. COMPANY RESEARCH POINTS:
-        - Recent Company News
-        - Products/Services to Mention
-        - Competitors to Reference
-        - Industry Trends to Discuss
-        - Company Culture Insights
-
-    12. ROLE-SPECIFIC PREPARATION:
-        - Daily Responsibilities Understanding
-        - Team Dynamics Preparation
-        - Tools & Processes to Learn
-        - Metrics & KPIs to Know
-        - Challenges to Anticipate
-
-    Return ONLY valid JSON format. Make this comprehensive and actionable for interview preparation.
     """
-
+    Generate comprehensive resume analysis with detailed preparation guidance.
+    With stream=True the completion is parsed as it arrives and on_section(key, value)
+    is called for each top-level section as soon as it is complete.
+    With sharded=True the sections are requested as concurrent shards instead
+    (see generate_sharded_analysis); stream is then ignored.
+    """
     try:
-        response = client.chat.completions.create(
+        retrieved = retrieve_questions(job_analysis)
+        if sharded:
+            return generate_sharded_analysis(job_analysis, resume_text, retrieved)
+
+        messages = build_comprehensive_analysis_messages(job_analysis, resume_text, retrieved)
+        sections = analysis_sections(REPORT_SECTIONS, retrieved)
+        if not stream:
+            analysis = complete_json(
+                get_client(), "gpt-4o-mini", messages, 0.3, sections, "resume_analysis"
+            )
+            return merge_question_bank(require_json(analysis), retrieved)
+
+        parser = TopLevelObjectParser()
+        chunks = []
+        for chunk in chat_completion_stream(
+            get_client(),
             model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that provides structured resume-job analysis.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            messages=messages,
             temperature=0.3,
+            response_format=json_schema_format("resume_analysis", sections),
+        ):
+            chunks.append(chunk)
+            for key, value in parser.feed(chunk):
+                if on_section:
+                    on_section(key, merge_question_bank({key: value}, retrieved)[key])
+        analysis = complete_json(
+            get_client(),
+            "gpt-4o-mini",
+            messages,
+            0.3,
+            sections,
+            "resume_analysis",
+            text="".join(chunks),
         )
+        return merge_question_bank(require_json(analysis), retrieved)
 
-        text_response = response.choices[0].message.content.strip()
-        text_response = re.sub(
-            r"^```json\s*|\s*```$", "", text_response, flags=re.DOTALL
-        ).strip()
+    except Exception as e:
+        logger.error(f"Comprehensive analysis failed: {e}")
+        return {"error": f"Analysis failed: {e}"}
 
-        try:
-            analysis = json.loads(text_response)
-        except json.JSONDecodeError:
-            analysis = {"analysis": text_response}
 
-        return analysis
+async def generate_comprehensive_analysis_async(
+    job_analysis: dict, resume_text: str, job_url: str, sharded: bool = ANALYSIS_SHARDED
+) -> dict:
+    """Async variant of generate_comprehensive_analysis"""
+    try:
+        retrieved = await asyncio.to_thread(retrieve_questions, job_analysis)
+        if sharded:
+            return await generate_sharded_analysis_async(job_analysis, resume_text, retrieved)
+
+        analysis = await complete_json_async(
+            get_async_client(),
+            "gpt-4o-mini",
+            build_comprehensive_analysis_messages(job_analysis, resume_text, retrieved),
+            0.3,
+            analysis_sections(REPORT_SECTIONS, retrieved),
+            "resume_analysis",
+        )
+        return merge_question_bank(require_json(analysis), retrieved)
 
     except Exception as e:
         logger.error(f"Comprehensive analysis failed: {e}")
         return {"error": f"Analysis failed: {e}"}
 
 
-def generate_html_report(job_analysis: dict, resume_analysis: dict) -> str:
-    """Generate HTML report using Jinja2 template"""
+async def stream_comprehensive_analysis(
+    job_analysis: dict, resume_text: str, job_url: str, sharded: bool = ANALYSIS_SHARDED
+):
+    """
+    Async generator over the comprehensive analysis: yields (key, value) for each
+    top-level section as soon as the model has finished writing it. Sections the
+    incremental parser could not emit (malformed output) are yielded from the
+    final, repaired parse, and sections missing from it are re-requested on their
+    own, so the caller ends up with the complete analysis.
+    In sharded mode each shard's sections are yielded when that shard completes.
+    """
+    retrieved = await asyncio.to_thread(retrieve_questions, job_analysis)
+    if sharded:
+        async for result in iter_sharded_analysis_async(job_analysis, resume_text, retrieved):
+            for key, value in merge_sections([result]).items():
+                yield key, value
+        return
+
+    parser = TopLevelObjectParser()
+    chunks = []
+    emitted = set()
+    messages = build_comprehensive_analysis_messages(job_analysis, resume_text, retrieved)
+    sections = analysis_sections(REPORT_SECTIONS, retrieved)
+    async for chunk in chat_completion_stream_async(
+        get_async_client(),
+        model="gpt-4o-mini",
+        messages=messages,
+        temperature=0.3,
+        response_format=json_schema_format("resume_analysis", sections),
+    ):
+        chunks.append(chunk)
+        for key, value in parser.feed(chunk):
+            emitted.add(key)
+            yield key, merge_question_bank({key: value}, retrieved)[key]
+
+    # Repair the full answer; sections it lacks are requested on their own
+    analysis = await complete_json_async(
+        get_async_client(),
+        "gpt-4o-mini",
+        messages,
+        0.3,
+        sections,
+        "resume_analysis",
+        text="".join(chunks),
+    )
+    analysis = merge_question_bank(analysis, retrieved)
+    for key, value in analysis.items():
+        if key not in emitted:
+            yield key, value
+
+
+ANALYSIS_CONTEXT_PROMPT = """
+You are an expert career coach and interview preparation specialist. Analyze this candidate's resume against the job description and create a comprehensive interview preparation report.
+
+JOB DESCRIPTION:
+{job_description}
+
+CANDIDATE RESUME:
+{resume_text}
+"""
+
+
+def retrieve_questions(job_analysis: dict):
+    """
+    Question bank categories that can be served from the question index for this
+    job (see retrieve_question_bank), or None to generate the whole bank
+    """
+    if not QUESTION_RETRIEVAL_ENABLED:
+        return None
+    try:
+        return retrieve_question_bank(job_analysis)
+    except Exception as e:
+        logger.warning(f"Question retrieval failed, generating the question bank: {e}")
+        return None
+
+
+def without_retrieved(sections: list, retrieved: dict) -> list:
+    """Prompt sections minus the question bank categories already retrieved"""
+    if not retrieved:
+        return sections
+    return [
+        reduce_bank_section(section, retrieved)
+        if section["title"] == "INTERVIEW QUESTIONS BANK"
+        else section
+        for section in sections
+    ]
+
+
+def build_comprehensive_analysis_messages(
+    job_analysis: dict, resume_text: str, retrieved: dict = None
+) -> list:
+    """Build the chat messages for the comprehensive resume analysis request"""
+    template = (
+        ANALYSIS_CONTEXT_PROMPT.strip()
+        + "\n\nCreate a detailed JSON analysis with the following sections:\n\n"
+        + format_sections(without_retrieved(REPORT_SECTIONS, retrieved))
+        + "\n\nReturn ONLY valid JSON format. Make this comprehensive and actionable for interview preparation."
+    )
+    prompt = assemble_prompt(
+        template,
+        label="comprehensive_analysis",
+        job_description=job_analysis,
+        resume_text=resume_text,
+    )
+
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that provides structured resume-job analysis.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def build_shard_messages(context_prompt: str, sections: list) -> list:
+    """
+    Build the messages for one shard of the analysis. Every shard starts with the
+    same system message and job/resume context, so the provider can reuse the
+    cached prompt prefix; only the final message listing the sections differs.
+    """
+    keys = ", ".join(f'"{section["key"]}"' for section in sections)
+    return [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that provides structured resume-job analysis.",
+        },
+        {"role": "user", "content": context_prompt},
+        {
+            "role": "user",
+            "content": "Create a detailed JSON analysis with ONLY the following sections:\n\n"
+            + format_sections(sections)
+            + f"\n\nUse exactly these top-level keys: {keys}."
+            + "\nReturn ONLY valid JSON format. Make this comprehensive and actionable for interview preparation.",
+        },
+    ]
+
+
+def build_context_prompt(job_analysis: dict, resume_text: str) -> str:
+    return assemble_prompt(
+        ANALYSIS_CONTEXT_PROMPT,
+        label="analysis_context",
+        job_description=job_analysis,
+        resume_text=resume_text,
+    )
+
+
+def analysis_sections(sections: list, retrieved: dict = None) -> dict:
+    """{key: points} of the sections requested, for the JSON schema and missing-section checks"""
+    return report_section_points(without_retrieved(sections, retrieved))
+
+
+def generate_sharded_analysis(
+    job_analysis: dict, resume_text: str, retrieved: dict = None, shards: dict = None
+) -> dict:
+    """
+    Generate the comprehensive analysis as independent section shards requested
+    concurrently and merged into the usual schema. Latency is set by the slowest
+    shard rather than the length of one 12-section completion, and the sections
+    a shard's answer lacks are re-requested (up to SHARD_RETRIES times) on their
+    own instead of spoiling the whole report.
+    shards ({name: sections}, default SECTION_SHARDS) limits what is requested.
+    """
+    context_prompt = build_context_prompt(job_analysis, resume_text)
+    shards = shards or default_shards()
+
+    def run_shard(shard):
+        sections = without_retrieved(shards[shard], retrieved)
+        messages = build_shard_messages(context_prompt, sections)
+        try:
+            return require_json(
+                complete_json(
+                    get_client(),
+                    "gpt-4o-mini",
+                    messages,
+                    0.3,
+                    report_section_points(sections),
+                    "resume_analysis",
+                    retries=SHARD_RETRIES,
+                )
+            )
+        except Exception as e:
+            raise RuntimeError(f"shard {shard} failed: {e}") from e
+
+    # Each shard runs in a copy of this context, so its LLM calls keep the
+    # caller's gateway priority and are counted in the caller's run metrics
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, run_shard, shard) for shard in shards
+        ]
+        results = [future.result() for future in futures]
+    return merge_question_bank(merge_sections(results), retrieved)
+
+
+async def iter_sharded_analysis_async(
+    job_analysis: dict, resume_text: str, retrieved: dict = None, shards: dict = None
+):
+    """
+    Async generator over the sharded analysis: yields each shard's sections as
+    soon as that shard completes. Sections a shard's answer lacks are
+    re-requested up to SHARD_RETRIES times; if the shard still has nothing (or
+    its request fails) the remaining shards are cancelled and the error raised.
+    """
+    context_prompt = build_context_prompt(job_analysis, resume_text)
+    async_client = get_async_client()
+    shards = shards or default_shards()
+
+    async def run_shard(shard):
+        sections = without_retrieved(shards[shard], retrieved)
+        messages = build_shard_messages(context_prompt, sections)
+        try:
+            result = require_json(
+                await complete_json_async(
+                    async_client,
+                    "gpt-4o-mini",
+                    messages,
+                    0.3,
+                    report_section_points(sections),
+                    "resume_analysis",
+                    retries=SHARD_RETRIES,
+                )
+            )
+        except Exception as e:
+            raise RuntimeError(f"shard {shard} failed: {e}") from e
+        if needs_bank(sections):
+            result = merge_question_bank(merge_sections([result]), retrieved)
+        return result
+
+    tasks = [asyncio.create_task(run_shard(shard)) for shard in shards]
     try:
-        # Read the template file
-        template_path = os.path.join(
-            os.path.dirname(__file__), "..", "templates", "report_template.html"
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Also reached when the consumer stops early: wait for the cancelled
+        # shards so their gateway slots are released before returning
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def generate_sharded_analysis_async(
+    job_analysis: dict, resume_text: str, retrieved: dict = None, shards: dict = None
+) -> dict:
+    """Async variant of generate_sharded_analysis"""
+    results = [
+        result
+        async for result in iter_sharded_analysis_async(
+            job_analysis, resume_text, retrieved, shards
         )
-        with open(template_path, "r", encoding="utf-8") as f:
-            template_content = f.read()
+    ]
+    return merge_sections(results)
+
+
+def default_shards() -> dict:
+    return {shard: shard_sections(shard) for shard in SECTION_SHARDS}
+
+
+def stale_shards(sections: list, sharded: bool = ANALYSIS_SHARDED) -> dict:
+    """
+    Shards requesting only the given sections: their SECTION_SHARDS groups in
+    sharded mode, otherwise one request for all of them
+    """
+    if not sharded:
+        return {"stale": sections}
+    keys = {section["key"] for section in sections}
+    shards = {
+        shard: [section for section in shard_sections(shard) if section["key"] in keys]
+        for shard in SECTION_SHARDS
+    }
+    return {shard: sections for shard, sections in shards.items() if sections}
+
+
+def generate_incremental_analysis(
+    job_analysis: dict,
+    resume_text: str,
+    job_url: str,
+    resume_path: str,
+    sharded: bool = ANALYSIS_SHARDED,
+) -> tuple:
+    """
+    Comprehensive analysis that regenerates only the sections whose inputs
+    changed since the last analysis of this job and resume (see section_store)
+    and reuses the others. Returns (analysis, diff report).
+    """
+    inputs = analysis_inputs(job_analysis, resume_text)
+    reused, diff = plan_sections(job_url, resume_path, inputs)
+    stale = [section for section in REPORT_SECTIONS if section["key"] not in reused]
+    try:
+        if not reused:
+            analysis = generate_comprehensive_analysis(
+                job_analysis, resume_text, job_url, sharded=sharded
+            )
+        elif stale:
+            retrieved = retrieve_questions(job_analysis) if needs_bank(stale) else None
+            fresh = generate_sharded_analysis(
+                job_analysis, resume_text, retrieved, stale_shards(stale, sharded)
+            )
+            analysis = merge_sections([reused, fresh])
+        else:
+            analysis = merge_sections([reused])
+    except Exception as e:
+        logger.error(f"Incremental analysis failed: {e}")
+        return {"error": f"Analysis failed: {e}"}, diff
+
+    if "error" not in analysis:
+        store_sections(job_url, resume_path, inputs, analysis)
+    logger.info(f"Section diff for {job_url}:\n{format_section_diff(diff)}")
+    return analysis, diff
+
+
+async def generate_incremental_analysis_async(
+    job_analysis: dict,
+    resume_text: str,
+    job_url: str,
+    resume_path: str,
+    sharded: bool = ANALYSIS_SHARDED,
+) -> tuple:
+    """Async variant of generate_incremental_analysis"""
+    inputs = analysis_inputs(job_analysis, resume_text)
+    reused, diff = await asyncio.to_thread(plan_sections, job_url, resume_path, inputs)
+    stale = [section for section in REPORT_SECTIONS if section["key"] not in reused]
+    try:
+        if not reused:
+            analysis = await generate_comprehensive_analysis_async(
+                job_analysis, resume_text, job_url, sharded=sharded
+            )
+        elif stale:
+            retrieved = None
+            if needs_bank(stale):
+                retrieved = await asyncio.to_thread(retrieve_questions, job_analysis)
+            fresh = await generate_sharded_analysis_async(
+                job_analysis, resume_text, retrieved, stale_shards(stale, sharded)
+            )
+            analysis = merge_sections([reused, fresh])
+        else:
+            analysis = merge_sections([reused])
+    except Exception as e:
+        logger.error(f"Incremental analysis failed: {e}")
+        return {"error": f"Analysis failed: {e}"}, diff
+
+    if "error" not in analysis:
+        await asyncio.to_thread(store_sections, job_url, resume_path, inputs, analysis)
+    logger.info(f"Section diff for {job_url}:\n{format_section_diff(diff)}")
+    return analysis, diff
 
-        # Create Jinja2 template
-        template = Template(template_content)
 
-        # Render the template
-        html_content = template.render(job=job_analysis, resume=resume_analysis)
+def needs_bank(sections: list) -> bool:
+    return any(section["title"] == "INTERVIEW QUESTIONS BANK" for section in sections)
 
-        return html_content
+
+def parse_comprehensive_analysis(text_response: str) -> dict:
+    """
+    Parse (and if needed repair) the analysis JSON, keeping the raw text if not
+    even one section could be recovered
+    """
+    return parse_json_object(text_response) or {"analysis": strip_json_fence(text_response)}
+
+
+def report_block_for(section_key: str):
+    """Template block that displays an analysis section, or None"""
+    section = find_section(section_key)
+    return section["block"] if section else None
+
+
+def generate_html_report(job_analysis: dict, resume_analysis: dict) -> str:
+    """Generate HTML report using the compiled Jinja2 template"""
+    try:
+        return render_report(job_analysis, resume_analysis)
 
     except Exception as e:
         logger.error(f"HTML report generation failed: {e}")
@@ -314,36 +829,43 @@ def generate_html_report(job_analysis: dict, resume_analysis: dict) -> str:
 
 
 def save_outputs(
-    job_analysis: dict, resume_analysis: dict, html_report: str, resume_file: str
+    job_analysis: dict,
+    resume_analysis: dict,
+    html_report,
+    resume_file: str,
+    job_url: str = None,
 ):
-    """Save all outputs to appropriate directories"""
+    """
+    Save all outputs to the report store, indexed by job URL, resume and time.
+    html_report is the HTML text or the chunks of render_report_chunks.
+    Returns the stored report record (None if saving failed).
+    """
     try:
-        # Save job analysis
-        job_output_path = os.path.join(JOB_DESC_DIR, "enhanced_output.json")
-        with open(job_output_path, "w", encoding="utf-8") as f:
-            json.dump(job_analysis, f, indent=4, ensure_ascii=False)
-
-        # Save resume analysis
-        resume_output_path = os.path.join(
-            OUTPUT_DIR, f"{resume_file}_comprehensive_analysis.json"
+        resume_path = os.path.join(RESUME_DIR, resume_file)
+        report = save_report(
+            job_url=job_url or job_analysis.get("source_url"),
+            resume_file=resume_file,
+            resume_hash=file_digest(resume_path) if os.path.isfile(resume_path) else None,
+            job_analysis=job_analysis,
+            resume_analysis=resume_analysis,
+            html_report=html_report,
         )
-        with open(resume_output_path, "w", encoding="utf-8") as f:
-            json.dump(resume_analysis, f, indent=4, ensure_ascii=False)
 
-        # Save HTML report
-        html_output_path = os.path.join(
-            OUTPUT_DIR, f"{resume_file}_comprehensive_report.html"
-        )
-        with open(html_output_path, "w", encoding="utf-8") as f:
-            f.write(html_report)
+        logger.info(f"All outputs saved successfully (report {report['id']})")
+        logger.info(f"Job analysis: {report['paths'].get('job_analysis')}")
+        logger.info(f"Resume analysis: {report['paths'].get('resume_analysis')}")
+        logger.info(f"HTML report: {report['paths'].get('html_report')}")
 
-        logger.info(f"All outputs saved successfully")
-        logger.info(f"Job analysis: {job_output_path}")
-        logger.info(f"Resume analysis: {resume_output_path}")
-        logger.info(f"HTML report: {html_output_path}")
+        # Generated questions feed the question index for later reports
+        try:
+            index_question_bank(resume_analysis, job_analysis, source=report["job_url"] or "")
+        except Exception as e:
+            logger.warning(f"Could not index interview questions: {e}")
+        return report
 
     except Exception as e:
         logger.error(f"Error saving outputs: {e}")
+        return None
 
 
 def main():
@@ -369,12 +891,13 @@ def main():
     result = generate_comprehensive_report(job_url, resume_file)
 
     if result.get("success"):
+        paths = (result.get("report") or {}).get("paths", {})
         print("✅ Comprehensive report generated successfully!")
-        print(f"📄 HTML Report: data/reports/{resume_file}_comprehensive_report.html")
-        print(
-            f"📊 Analysis Data: data/reports/{resume_file}_comprehensive_analysis.json"
-        )
-        print(f"💼 Job Analysis: data/job_descriptions/enhanced_output.json")
+        print(f"📄 HTML Report: {paths.get('html_report')}")
+        print(f"📊 Analysis Data: {paths.get('resume_analysis')}")
+        print(f"💼 Job Analysis: {paths.get('job_analysis')}")
+        if result.get("section_diff"):
+            print(f"🔁 {format_section_diff(result['section_diff'])}")
     else:
         print(f"❌ Error: {result.get('error', 'Unknown error')}")
 
@@ -0,0 +1,181 @@
+# Bulk Job Ingestion
+# Crawls a list of job posting URLs concurrently and runs each page through the
+# job analysis (agent 1) as soon as it arrives, while the rest are still in flight
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from backend.app.core.config import (
+    CRAWL_CONCURRENCY,
+    CRAWL_DOMAIN_DELAY_SECONDS,
+    CRAWL_PER_DOMAIN,
+    INGEST_ANALYSIS_CONCURRENCY,
+    OUTPUT_DIR,
+)
+from backend.app.core.crawler import crawl
+from backend.app.core.llm_gateway import PRIORITY_BATCH, llm_priority
+from backend.app.core.logging import logger
+from backend.app.core.report_sections import section_field
+from backend.app.agents.agent1_job_analysis import analyze_job_page, job_output_name
+
+
+def ingest_job_urls(urls: list, index_path: str = None, **options) -> dict:
+    """Crawl and analyze every URL; see ingest_job_urls_async"""
+    return asyncio.run(ingest_job_urls_async(urls, index_path, **options))
+
+
+async def ingest_job_urls_async(
+    urls: list,
+    index_path: str = None,
+    concurrency: int = CRAWL_CONCURRENCY,
+    per_domain: int = CRAWL_PER_DOMAIN,
+    domain_delay: float = CRAWL_DOMAIN_DELAY_SECONDS,
+    analysis_concurrency: int = INGEST_ANALYSIS_CONCURRENCY,
+) -> dict:
+    """
+    Fetch the job pages with at most `concurrency` requests in flight (and
+    `per_domain` per site), analyzing each page as soon as it is fetched with at
+    most `analysis_concurrency` analyses at a time. One JSON line per URL is
+    appended to index_path as it finishes, so a long run can be followed (and
+    its failures retried) while it is going.
+    """
+    started = time.perf_counter()
+    urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+    if not urls:
+        return {"error": "No job URLs given"}
+
+    if index_path is None:
+        index_path = os.path.join(OUTPUT_DIR, "ingest", f"{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    logger.info(
+        f"Ingesting {len(urls)} job URLs (concurrency={concurrency}, per_domain={per_domain}, "
+        f"analysis_concurrency={analysis_concurrency})"
+    )
+
+    semaphore = asyncio.Semaphore(max(1, analysis_concurrency))
+    counts = {"succeeded": 0, "failed": 0}
+
+    with open(index_path, "a", encoding="utf-8") as index:
+
+        def record(entry: dict):
+            counts["succeeded" if entry["status"] == "success" else "failed"] += 1
+            index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            index.flush()
+
+        async def analyze(url: str, job_data: dict, fetched_s: float):
+            async with semaphore:
+                entry = await analyze_page(url, job_data)
+            entry["fetched_s"] = fetched_s
+            record(entry)
+
+        # Ingestion is background work: its LLM calls queue behind reports
+        with llm_priority(PRIORITY_BATCH):
+            analyses = []
+            async for url, job_data in crawl(urls, None, concurrency, per_domain, domain_delay):
+                fetched_s = round(time.perf_counter() - started, 3)
+                if "error" in job_data:
+                    logger.error(f"Ingest: fetching {url} failed: {job_data['error']}")
+                    record({"url": url, "status": "failed", "error": job_data["error"]})
+                    continue
+                analyses.append(asyncio.ensure_future(analyze(url, job_data, fetched_s)))
+            await asyncio.gather(*analyses)
+
+    duration_s = round(time.perf_counter() - started, 3)
+    logger.info(
+        f"Ingest finished: {counts['succeeded']} succeeded, {counts['failed']} failed "
+        f"in {duration_s}s, index saved at {index_path}"
+    )
+    return {
+        "success": True,
+        "index_path": index_path,
+        "urls": len(urls),
+        **counts,
+        "duration_s": duration_s,
+        "pages_per_hour": round(len(urls) / duration_s * 3600) if duration_s else 0,
+    }
+
+
+async def analyze_page(url: str, job_data: dict) -> dict:
+    """Analyze and save one fetched page; returns its index entry"""
+    started = time.perf_counter()
+    try:
+        analysis = await asyncio.to_thread(analyze_job_page, url, job_data)
+        if "note" in analysis:
+            raise RuntimeError(analysis["note"])
+        entry = {
+            "url": url,
+            "status": "success",
+            "job_title": section_field(analysis, "BASIC_INFORMATION", "Job_Title", ""),
+            "duplicate_of": analysis.get("duplicate_of"),
+            "output_path": os.path.join(OUTPUT_DIR, job_output_name(url)),
+        }
+    except Exception as e:
+        logger.error(f"Ingest: analyzing {url} failed: {e}")
+        entry = {"url": url, "status": "failed", "error": str(e)}
+    entry["analysis_s"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def read_urls(path: str) -> list:
+    """Job URLs from a file (or "-" for stdin): one per line, blank lines and # comments ignored"""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def main():
+    """Main function for command-line usage"""
+    parser = argparse.ArgumentParser(
+        description="Crawl and analyze many job postings concurrently."
+    )
+    parser.add_argument("urls", nargs="*", help="Job posting URLs")
+    parser.add_argument("--file", help='File with one job URL per line ("-" for stdin)')
+    parser.add_argument("--index", default=None, help="JSON lines file with one entry per URL")
+    parser.add_argument(
+        "--concurrency", type=int, default=CRAWL_CONCURRENCY, help="Pages fetched at the same time"
+    )
+    parser.add_argument(
+        "--per-domain", type=int, default=CRAWL_PER_DOMAIN, help="Pages fetched at once per site"
+    )
+    parser.add_argument(
+        "--domain-delay",
+        type=float,
+        default=CRAWL_DOMAIN_DELAY_SECONDS,
+        help="Minimum seconds between requests to one site",
+    )
+    parser.add_argument(
+        "--analysis-concurrency",
+        type=int,
+        default=INGEST_ANALYSIS_CONCURRENCY,
+        help="Job analyses running at the same time",
+    )
+    args = parser.parse_args()
+
+    urls = list(args.urls) + (read_urls(args.file) if args.file else [])
+    print("===== Bulk Job Ingestion =====")
+    print(f"{len(urls)} job URLs\n")
+
+    result = ingest_job_urls(
+        urls,
+        args.index,
+        concurrency=args.concurrency,
+        per_domain=args.per_domain,
+        domain_delay=args.domain_delay,
+        analysis_concurrency=args.analysis_concurrency,
+    )
+
+    if result.get("success"):
+        print(f"✅ {result['succeeded']} job postings analyzed, {result['failed']} failed")
+        print(f"📄 Index: {result['index_path']}")
+    else:
+        print(f"❌ Error: {result.get('error', 'Unknown error')}")
+
+
+if __name__ == "__main__":
+    main()
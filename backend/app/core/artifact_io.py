@@ -0,0 +1,233 @@
+# project-agentic-system-interview-report/backend/app/core/artifact_io.py
+# Writing and reading of the JSON artifacts the agents produce (job analyses,
+# resume analyses, batch indexes). Writes go through a temporary file and an
+# atomic rename, so a crash never leaves half a file behind; JSON is encoded with
+# orjson when it is installed and compressed with zstd or gzip if configured.
+# Reads find and decompress whichever variant of a path exists.
+import os
+import re
+import gzip
+import json
+import contextlib
+import threading
+from backend.app.core.config import ARTIFACT_COMPRESSION, ARTIFACT_FSYNC, ARTIFACT_JSON_PRETTY
+from backend.app.core.logging import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File suffix of each compression; reads try the plain path first
+COMPRESSION_SUFFIXES = {"none": "", "zstd": ".zst", "gzip": ".gz"}
+FSYNC_POLICIES = ("none", "file", "dir")
+# Integers that may not fit in 64 bits (2**63 has 19 digits)
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+_warned = set()
+
+
+def dumps_json(data, pretty: bool = ARTIFACT_JSON_PRETTY) -> bytes:
+    """UTF-8 JSON bytes of data: compact unless pretty (2-space indent)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # Non-string keys, integers beyond 64 bits: leave them to the stdlib
+            pass
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes):
+    """
+    Parsed JSON bytes. orjson reads integers beyond 64 bits as floats, so a
+    payload with a 19-digit run (or one orjson rejects) is left to the stdlib.
+    """
+    if orjson is not None and not _LONG_DIGITS.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def compression_codec(compression: str) -> str:
+    """The compression actually used: zstd falls back to gzip without zstandard"""
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown artifact compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        _warn_once("zstd", "zstandard is not installed; compressing artifacts with gzip")
+        return "gzip"
+    return compression
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    return data
+
+
+def decompress(data: bytes, path: str) -> bytes:
+    """Contents of a file read from path, decompressed according to its suffix"""
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if path.endswith(".gz"):
+        return gzip.decompress(data)
+    return data
+
+
+def write_atomic(path: str, data: bytes, fsync: str = ARTIFACT_FSYNC):
+    """
+    Write data to path through a temporary file in the same directory and an
+    atomic rename. fsync "file" flushes the file to disk before the rename,
+    "dir" also the directory entry after it (survives power loss, not only a
+    crash of the process); "none" leaves both to the OS.
+    """
+    write_atomic_stream(path, [data], fsync=fsync)
+
+
+def write_atomic_stream(
+    path, chunks, compression: str = "none", fsync: str = ARTIFACT_FSYNC, directory: str = None
+) -> int:
+    """
+    write_atomic for content produced as a stream of byte chunks, which is never
+    held in memory as a whole. With compression "gzip" or "zstd" a compressed
+    copy is written alongside in the same pass (path.gz or path.zst). path may
+    be a callable returning the path once all chunks are consumed, e.g. one named
+    after their digest; the temporary files are then created in directory.
+    Returns the number of (uncompressed) bytes written.
+    """
+    compression = compression_codec(compression)
+    directory = os.path.abspath(directory or os.path.dirname(os.path.abspath(path)))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = _tmp_path(path if isinstance(path, str) else os.path.join(directory, "stream"))
+    tmp_paths = [tmp_path]
+    if compression != "none":
+        tmp_paths.append(tmp_path + COMPRESSION_SUFFIXES[compression])
+    size = 0
+    try:
+        with open(tmp_paths[0], "wb") as f, _open_copy(tmp_paths[1:], compression, fsync) as copy:
+            for chunk in chunks:
+                f.write(chunk)
+                if copy:
+                    copy.write(chunk)
+                size += len(chunk)
+            sync_file(f, fsync)
+
+        final_path = path if isinstance(path, str) else path()
+        final_directory = os.path.dirname(os.path.abspath(final_path))
+        os.makedirs(final_directory, exist_ok=True)
+        os.replace(tmp_paths[0], final_path)
+        if len(tmp_paths) > 1:
+            os.replace(tmp_paths[1], final_path + COMPRESSION_SUFFIXES[compression])
+    except BaseException:
+        for leftover in tmp_paths:
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+        raise
+    sync_dir(final_directory, fsync)
+    return size
+
+
+def sync_file(f, fsync: str = ARTIFACT_FSYNC):
+    """fsync an open file unless the policy is "none" """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy: {fsync}")
+    if fsync != "none":
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def sync_dir(directory: str, fsync: str = ARTIFACT_FSYNC):
+    """fsync a directory after a rename into it, with the "dir" policy"""
+    if fsync != "dir" or not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json(
+    path: str,
+    data,
+    compression: str = ARTIFACT_COMPRESSION,
+    fsync: str = ARTIFACT_FSYNC,
+    pretty: bool = ARTIFACT_JSON_PRETTY,
+) -> str:
+    """
+    Atomically write data as JSON to path, compressed if configured (the file is
+    then path.zst or path.gz). Variants of path in another compression are
+    removed, so read_json never finds a stale one. Returns the path written.
+    """
+    compression = compression_codec(compression)
+    final_path = path + COMPRESSION_SUFFIXES[compression]
+    write_atomic(final_path, compress(dumps_json(data, pretty), compression), fsync)
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if path + suffix != final_path and os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+    return final_path
+
+
+def resolve_artifact(path: str):
+    """The existing file for path: path itself, path.zst or path.gz; None if none exists"""
+    for suffix in ("", ".zst", ".gz"):
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return None
+
+
+def read_bytes(path: str) -> bytes:
+    """Decompressed contents of path or its compressed variant"""
+    found = resolve_artifact(path)
+    if found is None:
+        raise FileNotFoundError(f"No such artifact: {path}")
+    with open(found, "rb") as f:
+        return decompress(f.read(), found)
+
+
+def read_json(path: str):
+    return loads_json(read_bytes(path))
+
+
+def artifact_exists(path: str) -> bool:
+    return resolve_artifact(path) is not None
+
+
+def _tmp_path(path: str) -> str:
+    # Unique per writer: concurrent writes of one path each rename their own file
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextlib.contextmanager
+def _open_copy(tmp_paths: list, compression: str, fsync: str):
+    """A compressing writer into tmp_paths[0], synced on close; None without tmp_paths"""
+    if not tmp_paths:
+        yield None
+        return
+    with open(tmp_paths[0], "wb") as f:
+        if compression == "zstd":
+            copy = zstandard.ZstdCompressor(level=3).stream_writer(f, closefd=False)
+        else:
+            copy = gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6)
+        with copy:
+            yield copy
+        sync_file(f, fsync)
+
+
+def _warn_once(key: str, message: str):
+    if key not in _warned:
+        _warned.add(key)
+        logger.warning(message)
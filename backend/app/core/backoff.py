@@ -0,0 +1,33 @@
+# project-agentic-system-interview-report/backend/app/core/backoff.py
+# Retry timing shared by the LLM gateway and the job page crawler.
+import time
+import random
+from email.utils import parsedate_to_datetime
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def retry_after_seconds(headers):
+    """The delay a response asks for in retry-after-ms or Retry-After (seconds or a date)"""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
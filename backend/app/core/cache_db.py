@@ -0,0 +1,34 @@
+# project-agentic-system-interview-report/backend/app/core/cache_db.py
+import os
+import sqlite3
+import threading
+
+_local = threading.local()
+
+
+def get_connection(db_path: str, schema: str) -> sqlite3.Connection:
+    """
+    Return this thread's SQLite connection for db_path, creating the file and
+    schema on first use. Connections use WAL so readers never block the writer
+    and several worker threads/processes can share one cache file.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(schema)
+        connections[db_path] = conn
+    return conn
+
+
+def close_connections():
+    """Close every connection opened by the current thread"""
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
@@ -6,6 +6,104 @@ from dotenv import load_dotenv
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Created on first write (agent 1), not on import
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "job_descriptions")
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Persistent caches (LLM responses, scraped pages, extracted resumes)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "cache")
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE_ENABLED", "1") != "0"
+RESUME_CACHE_ENABLED = os.getenv("RESUME_CACHE_ENABLED", "1") != "0"
+
+# LLM gateway: per-model request and token budgets (0 disables a limit), the
+# range the adaptive concurrency limit moves in, and retries of transient errors
+LLM_RPM = float(os.getenv("LLM_RPM", "500"))
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+# Completion tokens budgeted for a request until its actual usage is known
+LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "1500"))
+# Ask for JSON answers through response_format with the JSON schema of each
+# analysis (0 for endpoints without structured outputs), and how many times the
+# sections still missing after local repair are re-requested
+STRUCTURED_OUTPUTS = os.getenv("STRUCTURED_OUTPUTS", "1") != "0"
+MISSING_SECTION_RETRIES = int(os.getenv("MISSING_SECTION_RETRIES", "1"))
+
+# OpenAI Batch API runs: seconds between status polls, completion window,
+# requests per batch (the API accepts up to 50,000) and submission rounds
+BATCH_API_POLL_SECONDS = float(os.getenv("BATCH_API_POLL_SECONDS", "60"))
+BATCH_API_COMPLETION_WINDOW = os.getenv("BATCH_API_COMPLETION_WINDOW", "24h")
+BATCH_API_MAX_REQUESTS = int(os.getenv("BATCH_API_MAX_REQUESTS", "50000"))
+BATCH_API_MAX_SUBMISSIONS = int(os.getenv("BATCH_API_MAX_SUBMISSIONS", "3"))
+
+# Report store: SQLite index plus content-addressed artifact files
+REPORT_STORE_DIR = os.getenv(
+    "REPORT_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "store"),
+)
+
+# Report rendering: template reload on change (development only), compiled
+# template bytecode cache, and compressed copies of stored HTML reports
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "0") == "1"
+TEMPLATE_CACHE_DIR = os.path.join(CACHE_DIR, "jinja")
+REPORT_GZIP = os.getenv("REPORT_GZIP", "0") == "1"
+
+# JSON artifacts (analyses, batch indexes): compression ("none", "gzip" or "zstd",
+# which needs the zstandard package), fsync before the atomic rename ("none",
+# "file" or "dir", which also syncs the directory) and indented output
+ARTIFACT_COMPRESSION = os.getenv("ARTIFACT_COMPRESSION", "none")
+ARTIFACT_FSYNC = os.getenv("ARTIFACT_FSYNC", "none")
+ARTIFACT_JSON_PRETTY = os.getenv("ARTIFACT_JSON_PRETTY", "0") == "1"
+# With REPORT_GZIP, the compression of the copy kept next to each HTML report
+# (sent to clients that accept it): ARTIFACT_COMPRESSION, or gzip if that is "none"
+REPORT_COMPRESSION = os.getenv(
+    "REPORT_COMPRESSION",
+    (ARTIFACT_COMPRESSION if ARTIFACT_COMPRESSION != "none" else "gzip") if REPORT_GZIP else "none",
+)
+
+# Resume PDF extraction limits and page-parallel mode
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "200"))
+PDF_MAX_TEXT_BYTES = int(os.getenv("PDF_MAX_TEXT_BYTES", str(2 * 1024 * 1024)))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "12"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Job page extraction backend: "lxml" (single pass) or "bs4" (reference)
+HTML_EXTRACT_BACKEND = os.getenv("HTML_EXTRACT_BACKEND", "lxml")
+
+# Bulk job page crawling: pooled connections, concurrency overall and per
+# domain, minimum gap between requests to one domain, retries and size limits
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "32"))
+CRAWL_PER_DOMAIN = int(os.getenv("CRAWL_PER_DOMAIN", "4"))
+CRAWL_DOMAIN_DELAY_SECONDS = float(os.getenv("CRAWL_DOMAIN_DELAY_SECONDS", "0.25"))
+CRAWL_RETRIES = int(os.getenv("CRAWL_RETRIES", "3"))
+CRAWL_TIMEOUT_SECONDS = float(os.getenv("CRAWL_TIMEOUT_SECONDS", "20"))
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(5 * 1024 * 1024)))
+# Job analyses run concurrently while a bulk crawl is streaming pages in
+INGEST_ANALYSIS_CONCURRENCY = int(os.getenv("INGEST_ANALYSIS_CONCURRENCY", "8"))
+
+# Input token budget for a single analysis prompt (estimated offline)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "12000"))
+
+# Reuse the analysis of a near-duplicate job posting (MinHash similarity >= threshold)
+JOB_DEDUP_ENABLED = os.getenv("JOB_DEDUP_ENABLED", "1") != "0"
+JOB_DEDUP_THRESHOLD = float(os.getenv("JOB_DEDUP_THRESHOLD", "0.85"))
+
+# Vector index of interview questions: "local" (NumPy, offline) or "pinecone"
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "local")
+VECTOR_INDEX_DIR = os.getenv(
+    "VECTOR_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "vector_index"),
+)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+QUESTION_INDEX_QUANTIZE = os.getenv("QUESTION_INDEX_QUANTIZE", "1") != "0"
+# Fill the report's question bank from the index when it has enough close matches
+QUESTION_RETRIEVAL_ENABLED = os.getenv("QUESTION_RETRIEVAL_ENABLED", "1") != "0"
+# Calibrated on the hashing embeddings: questions of unrelated jobs score up to
+# about 0.08 against a job, the median question of the same job about 0.1
+QUESTION_MIN_SCORE = float(os.getenv("QUESTION_MIN_SCORE", "0.1"))
+QUESTION_MIN_PER_CATEGORY = int(os.getenv("QUESTION_MIN_PER_CATEGORY", "8"))
@@ -1,19 +1,32 @@
 # project-agentic-system-interview-report/backend/app/core/config_agent2.py
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Importing config loads the environment variables from .env (once per process)
+from backend.app.core.config import OPENAI_API_KEY
 
 # Base directories
 # Set backend root as base directory (one level up from 'app')
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-RESUME_DIR = os.path.join(BASE_DIR, "data/resumes")
+RESUME_DIR = os.getenv("RESUME_DIR", os.path.join(BASE_DIR, "data/resumes"))
 JOB_DESC_DIR = os.path.join(BASE_DIR, "data/job_descriptions")
-OUTPUT_DIR = os.path.join(BASE_DIR, "data/reports")
+OUTPUT_DIR = os.path.join(BASE_DIR, "data/reports")  # created on first write
+
+# Maximum number of resumes analyzed concurrently in batch mode
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+# Upper bound for the concurrency a caller may ask for (API requests included)
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+# Worker threads and queue limits for the API's background job queue
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+JOB_HISTORY_LIMIT = int(os.getenv("JOB_HISTORY_LIMIT", "1000"))
 
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Request the comprehensive analysis as concurrent section shards
+ANALYSIS_SHARDED = os.getenv("ANALYSIS_SHARDED", "0") != "0"
+# Re-requests of the sections an analysis shard's answer lacks (all of them when
+# it returned no JSON); transient API errors are retried by the LLM gateway
+SHARD_RETRIES = int(os.getenv("SHARD_RETRIES", "2"))
+# Reuse the stored sections of an earlier analysis of the same job and resume
+# whose inputs did not change, regenerating only the others
+ANALYSIS_INCREMENTAL = os.getenv("ANALYSIS_INCREMENTAL", "1") != "0"
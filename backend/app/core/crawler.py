@@ -0,0 +1,169 @@
+# project-agentic-system-interview-report/backend/app/core/crawler.py
+# Bulk job page fetching: one pooled keep-alive httpx client, a global and a
+# per-domain concurrency cap with a minimum gap between requests to the same
+# domain, retries with backoff, and a hard limit on response size. Pages are
+# parsed (and cached) exactly like scrape_job_description_async does.
+import time
+import asyncio
+from urllib.parse import urlsplit
+from contextlib import asynccontextmanager
+from backend.app.core.config import (
+    CRAWL_CONCURRENCY,
+    CRAWL_DOMAIN_DELAY_SECONDS,
+    CRAWL_PER_DOMAIN,
+    CRAWL_RETRIES,
+    CRAWL_TIMEOUT_SECONDS,
+    SCRAPE_CACHE_ENABLED,
+    SCRAPE_MAX_BYTES,
+)
+from backend.app.core.backoff import backoff_delay, retry_after_seconds
+from backend.app.core.scrape_cache import conditional_headers, get_cached_page
+from backend.app.core.utils import REQUEST_HEADERS, parse_or_reuse, reuse_cached_page
+from backend.app.core.logging import logger
+
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class DomainLimiter:
+    """At most per_domain requests in flight per host, started at least delay seconds apart"""
+
+    def __init__(
+        self, per_domain: int = CRAWL_PER_DOMAIN, delay: float = CRAWL_DOMAIN_DELAY_SECONDS
+    ):
+        self.per_domain = max(1, per_domain)
+        self.delay = delay
+        self._semaphores = {}
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.per_domain))
+        async with semaphore:
+            if self.delay:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+                await asyncio.sleep(start - now)
+            yield
+
+
+def new_http_client(concurrency: int = CRAWL_CONCURRENCY):
+    """An httpx.AsyncClient whose keep-alive pool matches the crawl concurrency"""
+    import httpx
+
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        headers=REQUEST_HEADERS,
+        timeout=httpx.Timeout(CRAWL_TIMEOUT_SECONDS, connect=10.0),
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    )
+
+
+async def fetch_page(
+    client,
+    url: str,
+    headers: dict = None,
+    max_bytes: int = SCRAPE_MAX_BYTES,
+    retries: int = CRAWL_RETRIES,
+) -> tuple:
+    """
+    GET url and return (status_code, headers, body). Connection errors, timeouts,
+    429 and 5xx responses are retried with jittered backoff (at least Retry-After);
+    other statuses are returned as they are. Raises ResponseTooLarge as soon as
+    the (decoded) body passes max_bytes.
+    """
+    import httpx
+
+    for attempt in range(retries + 1):
+        try:
+            async with client.stream("GET", url, headers=headers) as resp:
+                if resp.status_code in RETRY_STATUSES and attempt < retries:
+                    delay = max(
+                        backoff_delay(attempt, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS),
+                        min(retry_after_seconds(resp.headers) or 0, BACKOFF_MAX_SECONDS),
+                    )
+                    reason = f"HTTP {resp.status_code}"
+                else:
+                    declared = resp.headers.get("Content-Length", "")
+                    if declared.isdigit() and int(declared) > max_bytes:
+                        raise ResponseTooLarge(f"{url}: {declared} bytes > {max_bytes}")
+                    body = bytearray()
+                    async for chunk in resp.aiter_bytes():
+                        body += chunk
+                        if len(body) > max_bytes:
+                            raise ResponseTooLarge(f"{url}: more than {max_bytes} bytes")
+                    return resp.status_code, resp.headers, bytes(body)
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS)
+            reason = type(e).__name__
+        logger.warning(f"Fetching {url} failed ({reason}), retry {attempt + 1} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+async def scrape_job_page(client, url: str, max_bytes: int = SCRAPE_MAX_BYTES) -> dict:
+    """
+    Fetch and parse one job page with a shared client; errors are returned as
+    {"error": ...}. Cache lookups and parsing run in worker threads, so a slow
+    SQLite lock holds up only this URL, not the whole crawl.
+    """
+    import httpx
+
+    try:
+        cached = await asyncio.to_thread(get_cached_page, url) if SCRAPE_CACHE_ENABLED else None
+        status, headers, body = await fetch_page(
+            client, url, conditional_headers(cached), max_bytes
+        )
+        if status == 304 and cached:
+            return await asyncio.to_thread(reuse_cached_page, url, cached, headers)
+        if status >= 400:
+            return {"error": f"HTTP error: {status}"}
+        return await asyncio.to_thread(parse_or_reuse, url, cached, headers, body)
+    except (httpx.HTTPError, ResponseTooLarge) as e:
+        logger.error(f"HTTP error while fetching URL {url}: {e}")
+        return {"error": f"HTTP error: {e}"}
+    except Exception as e:
+        logger.error(f"Error processing job description {url}: {e}")
+        return {"error": str(e)}
+
+
+async def crawl(
+    urls,
+    client=None,
+    concurrency: int = CRAWL_CONCURRENCY,
+    per_domain: int = CRAWL_PER_DOMAIN,
+    domain_delay: float = CRAWL_DOMAIN_DELAY_SECONDS,
+    max_bytes: int = SCRAPE_MAX_BYTES,
+):
+    """
+    Async generator of (url, job data) for every URL, in completion order, so
+    callers can start analyzing the first pages while the rest are in flight.
+    """
+    urls = list(dict.fromkeys(urls))
+    limiter = DomainLimiter(per_domain, domain_delay)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(url: str):
+        # Wait for the domain first, so a busy domain does not hold global slots
+        async with limiter.slot(url), semaphore:
+            return url, await scrape_job_page(http_client, url, max_bytes)
+
+    http_client = client or new_http_client(concurrency)
+    tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if client is None:
+            await http_client.aclose()
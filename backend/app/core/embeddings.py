@@ -0,0 +1,70 @@
+# project-agentic-system-interview-report/backend/app/core/embeddings.py
+import re
+import math
+import zlib
+import numpy as np
+from backend.app.core.config import EMBEDDING_DIM
+
+# Words too common in interview questions to say anything about the topic
+STOPWORDS = frozenset(
+    """
+    a about an and are as at be can could describe did do does for from have how
+    i if in is it me of on or our tell that the this time to was we what when
+    where which who why will with would you your
+    """.split()
+)
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list:
+    """
+    Lowercased word tokens without stopwords; keeps tokens like c++, c#, node.js.
+    Plural "s" is stripped so "databases" and "database" hash to the same bucket.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def hashing_embed(texts: list, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Deterministic offline embedding: unigrams and bigrams are hashed (crc32) into
+    dim signed buckets with sublinear term frequency, then L2-normalized. Needs
+    no model download or corpus statistics, so vectors never change once stored.
+    Returns a float32 array of shape (len(texts), dim).
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = tokenize(text)
+        counts = {}
+        for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            h = zlib.crc32(term.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vectors[row, h % dim] += sign * (1.0 + math.log(count))
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+# The embedding function used by the question index. Any callable taking a list
+# of texts and returning an (n, EMBEDDING_DIM) float array can be plugged in
+# with set_embedder, e.g. a wrapper around an embeddings API.
+_embedder = hashing_embed
+
+
+def set_embedder(embedder):
+    global _embedder
+    _embedder = embedder
+
+
+def embed(texts: list) -> np.ndarray:
+    return np.asarray(_embedder(list(texts)), dtype=np.float32)
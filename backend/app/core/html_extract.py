@@ -0,0 +1,173 @@
+# project-agentic-system-interview-report/backend/app/core/html_extract.py
+import re
+from backend.app.core.config import HTML_EXTRACT_BACKEND
+from backend.app.core.logging import logger
+
+# Elements whose text never belongs to the job description
+UNWANTED_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside")
+
+# Job-specific content areas, most specific first. The first selector that
+# matches anything wins and the text of all of its matches is used.
+JOB_CONTENT_SELECTORS = [
+    '[class*="job-description"]',
+    '[class*="job-content"]',
+    '[class*="description"]',
+    '[class*="requirements"]',
+    '[class*="responsibilities"]',
+    '[id*="job-description"]',
+    '[id*="description"]',
+    "main",
+    "article",
+    ".content",
+]
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+_ATTR_CONTAINS_RE = re.compile(r'^\[(\w+)\*="([^"]*)"\]$')
+_CLASS_RE = re.compile(r"^\.([\w-]+)$")
+_TAG_RE = re.compile(r"^([a-z][a-z0-9]*)$")
+
+
+def decode_html(content: bytes, content_type: str = "") -> str:
+    """
+    Decode a page using the Content-Type charset, then a <meta charset> sniffed
+    from the first bytes, then UTF-8. Avoids the statistical charset detection
+    requests falls back to when the header does not name a charset.
+    """
+    candidates = []
+    header_charset = re.search(r"charset=([\w.:-]+)", content_type or "", re.IGNORECASE)
+    if header_charset:
+        candidates.append(header_charset.group(1))
+    meta_charset = _CHARSET_RE.search(content[:4096])
+    if meta_charset:
+        candidates.append(meta_charset.group(1).decode("ascii", "ignore"))
+
+    for encoding in candidates:
+        try:
+            return content.decode(encoding, errors="replace")
+        except LookupError:
+            continue
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode("cp1252", errors="replace")
+
+
+def extract_job_text(html: str, backend: str = HTML_EXTRACT_BACKEND) -> str:
+    """
+    Return the raw (uncleaned) job description text of a page.
+    The lxml backend does one traversal of the tree; BeautifulSoup is kept as
+    the reference implementation and as the fallback if lxml fails.
+    """
+    if backend == "lxml":
+        try:
+            return extract_job_text_lxml(html)
+        except Exception as e:
+            logger.warning(f"lxml extraction failed, falling back to BeautifulSoup: {e}")
+    return extract_job_text_bs4(html)
+
+
+def extract_job_text_bs4(html: str) -> str:
+    """Reference extractor: html.parser soup, one select() per selector"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove unwanted elements
+    for tag in soup(list(UNWANTED_TAGS)):
+        tag.extract()
+
+    job_text = ""
+    for selector in JOB_CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            for element in elements:
+                job_text += element.get_text() + "\n"
+            break
+
+    # If no specific job content found, use all text
+    if not job_text.strip():
+        job_text = soup.get_text()
+
+    return job_text
+
+
+def extract_job_text_lxml(html: str) -> str:
+    """
+    Fast extractor: parses with lxml and evaluates every selector in a single
+    pre-order walk, skipping unwanted subtrees instead of searching them.
+    """
+    import lxml.html
+
+    try:
+        root = lxml.html.document_fromstring(html)
+    except ValueError:
+        # str input with an XML encoding declaration; let lxml decode the bytes
+        root = lxml.html.document_fromstring(html.encode("utf-8"))
+
+    matchers = _compiled_matchers()
+    matches = [[] for _ in matchers]
+    dropped = []
+
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        tag = element.tag
+        if not isinstance(tag, str):
+            # Comments and processing instructions carry no page text
+            dropped.append(element)
+            continue
+        if tag in UNWANTED_TAGS:
+            dropped.append(element)
+            continue
+
+        classes = element.get("class")
+        for index, matcher in enumerate(matchers):
+            if matcher(tag, element, classes):
+                matches[index].append(element)
+        stack.extend(reversed(element))
+
+    for element in dropped:
+        element.drop_tree()
+
+    job_text = ""
+    for elements in matches:
+        if elements:
+            job_text = "".join("".join(element.itertext()) + "\n" for element in elements)
+            break
+
+    if not job_text.strip():
+        job_text = "".join(root.itertext())
+
+    return job_text
+
+
+_matchers = None
+
+
+def _compiled_matchers() -> list:
+    """Translate JOB_CONTENT_SELECTORS into element predicates (once)"""
+    global _matchers
+    if _matchers is None:
+        _matchers = [_compile_selector(selector) for selector in JOB_CONTENT_SELECTORS]
+    return _matchers
+
+
+def _compile_selector(selector: str):
+    attr_contains = _ATTR_CONTAINS_RE.match(selector)
+    if attr_contains:
+        attr, value = attr_contains.groups()
+        if attr == "class":
+            return lambda tag, element, classes: classes is not None and value in classes
+        return lambda tag, element, classes: value in (element.get(attr) or "")
+
+    class_name = _CLASS_RE.match(selector)
+    if class_name:
+        name = class_name.group(1)
+        return lambda tag, element, classes: classes is not None and name in classes.split()
+
+    tag_name = _TAG_RE.match(selector)
+    if tag_name:
+        name = tag_name.group(1)
+        return lambda tag, element, classes: tag == name
+
+    raise ValueError(f"Selector not supported by the lxml extractor: {selector}")
@@ -0,0 +1,176 @@
+# project-agentic-system-interview-report/backend/app/core/job_dedup.py
+import os
+import re
+import json
+import time
+import zlib
+import hashlib
+import sqlite3
+import numpy as np
+from backend.app.core.config import CACHE_DIR, JOB_DEDUP_ENABLED, JOB_DEDUP_THRESHOLD
+from backend.app.core.cache_db import get_connection
+from backend.app.core.logging import logger
+
+JOB_DEDUP_DB = os.path.join(CACHE_DIR, "job_fingerprints.sqlite3")
+
+# 128 MinHash permutations split into 16 LSH bands of 8 rows. Two postings become
+# candidates if any band matches, which is likely above ~0.7 Jaccard similarity
+# ((1/16) ** (1/8)); candidates are then checked against JOB_DEDUP_THRESHOLD.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+MIN_SHINGLES = 20  # shorter texts are not fingerprinted; the estimate is too noisy
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(20240611)
+# a < 2**31, b < 2**31 and 32-bit shingle hashes keep a * x + b below 2**64
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_fingerprints (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    analysis BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, url)
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (kind, bucket, url)
+);
+"""
+
+
+def shingles(text: str) -> set:
+    """Word 5-gram shingles of the lowercased, punctuation-free text"""
+    words = re.findall(r"\w+", text.lower())
+    count = len(words) - SHINGLE_WORDS + 1
+    return {" ".join(words[i : i + SHINGLE_WORDS]) for i in range(count)}
+
+
+def minhash(text: str):
+    """MinHash signature (NUM_PERM uint64 values) of text, or None if text is too short"""
+    grams = shingles(text)
+    if len(grams) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams)
+    )
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE
+    return permuted.min(axis=0)
+
+
+def similarity(signature_a, signature_b) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(signature_a == signature_b))
+
+
+def band_buckets(signature) -> list:
+    """One LSH bucket key per band: the band number and a hash of its rows"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS].tobytes()
+        buckets.append(f"{band}:{hashlib.blake2b(rows, digest_size=8).hexdigest()}")
+    return buckets
+
+
+def find_duplicate(
+    url: str, text: str, kind: str = "job", threshold: float = JOB_DEDUP_THRESHOLD
+):
+    """
+    The most similar previously analyzed posting at a different URL, as
+    {"source_url", "similarity", "analysis"}, or None if nothing reaches threshold.
+    kind separates analyses of different shapes (agent 1 vs the enhanced agent).
+    Lookup errors are logged and treated as no duplicate.
+    """
+    if not JOB_DEDUP_ENABLED:
+        return None
+    try:
+        return _find_duplicate(url, text, kind, threshold)
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning(f"Job dedup lookup failed: {e}")
+        return None
+
+
+def _find_duplicate(url: str, text: str, kind: str, threshold: float):
+    signature = minhash(text)
+    if signature is None:
+        return None
+
+    conn = get_connection(JOB_DEDUP_DB, _SCHEMA)
+    buckets = band_buckets(signature)
+    placeholders = ",".join("?" * len(buckets))
+    rows = conn.execute(
+        "SELECT DISTINCT f.url, f.signature FROM lsh_buckets b "
+        "JOIN job_fingerprints f ON f.kind = b.kind AND f.url = b.url "
+        f"WHERE b.kind = ? AND b.bucket IN ({placeholders}) AND b.url != ?",
+        (kind, *buckets, url),
+    ).fetchall()
+
+    best_url, best_score = None, 0.0
+    for candidate_url, blob in rows:
+        score = similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+        if score > best_score:
+            best_url, best_score = candidate_url, score
+    if best_url is None or best_score < threshold:
+        return None
+
+    row = conn.execute(
+        "SELECT analysis FROM job_fingerprints WHERE kind = ? AND url = ?", (kind, best_url)
+    ).fetchone()
+    logger.info(f"Job posting {url} duplicates {best_url} (similarity {best_score:.2f})")
+    return {
+        "source_url": best_url,
+        "similarity": round(best_score, 4),
+        "analysis": json.loads(zlib.decompress(row[0])),
+    }
+
+
+def remember_job(url: str, text: str, analysis: dict, kind: str = "job"):
+    """Fingerprint an analyzed posting so later near-duplicates can reuse its analysis"""
+    if not JOB_DEDUP_ENABLED or not url:
+        return
+    try:
+        _remember_job(url, text, analysis, kind)
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        logger.warning(f"Could not fingerprint job posting {url}: {e}")
+
+
+def _remember_job(url: str, text: str, analysis: dict, kind: str):
+    signature = minhash(text)
+    if signature is None:
+        return
+
+    payload = zlib.compress(json.dumps(analysis, ensure_ascii=False).encode("utf-8"))
+    conn = get_connection(JOB_DEDUP_DB, _SCHEMA)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM lsh_buckets WHERE kind = ? AND url = ?", (kind, url))
+        conn.execute(
+            "INSERT OR REPLACE INTO job_fingerprints "
+            "(kind, url, signature, analysis, created_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, url, signature.astype(np.uint64).tobytes(), payload, time.time()),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (kind, bucket, url) VALUES (?, ?, ?)",
+            [(kind, bucket, url) for bucket in band_buckets(signature)],
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def reuse_analysis(duplicate: dict) -> dict:
+    """A copy of the duplicate's analysis recording where it came from"""
+    analysis = dict(duplicate["analysis"])
+    analysis["duplicate_of"] = {
+        "source_url": duplicate["source_url"],
+        "similarity": duplicate["similarity"],
+    }
+    return analysis
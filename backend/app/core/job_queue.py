@@ -0,0 +1,156 @@
+# project-agentic-system-interview-report/backend/app/core/job_queue.py
+import time
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+from backend.app.core.logging import logger
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    """
+    In-process job queue with a fixed pool of worker threads.
+
+    Each job kind maps to a blocking handler (the agents' synchronous entry
+    points), which runs on a worker thread so the API event loop is never blocked
+    by OpenAI, scraping or pdfplumber calls. Handlers return a result dict; a dict
+    with an "error" key marks the job failed. Finished jobs are kept for polling,
+    oldest first out once more than history_limit have accumulated.
+
+    Cancelling a queued job removes it before it starts. A running job cannot be
+    interrupted mid-call; it is marked cancelled and its result is discarded.
+    """
+
+    def __init__(
+        self, handlers: dict, workers: int = 2, max_queued: int = 100, history_limit: int = 1000
+    ):
+        self.handlers = handlers
+        self.workers = workers
+        self.max_queued = max_queued
+        self.history_limit = history_limit
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, kind: str, **params) -> dict:
+        """Queue a job and return its status record"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job["status"] == QUEUED)
+            if queued >= self.max_queued:
+                raise QueueFull(f"{queued} jobs already queued")
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "kind": kind,
+                "params": params,
+                "status": QUEUED,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "result": None,
+            }
+            self._jobs[job["id"]] = job
+            self._start_workers()
+            self._queue.put(job["id"])
+            status = self._status(job)
+
+        logger.info(f"Queued {kind} job {job['id']}")
+        return status
+
+    def get(self, job_id: str):
+        """Status record of a job (without its result), or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._status(job) if job else None
+
+    def result(self, job_id: str):
+        """(status record, result) of a job, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return (self._status(job), job["result"]) if job else None
+
+    def cancel(self, job_id: str):
+        """Cancel a queued or running job; returns its status record or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in FINISHED:
+                job["status"] = CANCELLED
+                job["finished_at"] = time.time()
+                logger.info(f"Cancelled {job['kind']} job {job_id}")
+            return self._status(job)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self.workers, "jobs": counts}
+
+    def _status(self, job: dict) -> dict:
+        status = {key: value for key, value in job.items() if key != "result"}
+        if job["started_at"]:
+            end = job["finished_at"] or time.time()
+            status["run_seconds"] = round(end - job["started_at"], 3)
+        return status
+
+    def _start_workers(self):
+        # Called with the lock held; threads start on first use
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] != QUEUED:
+                    continue
+                job["status"] = RUNNING
+                job["started_at"] = time.time()
+
+            try:
+                result = self.handlers[job["kind"]](**job["params"])
+                error = result.get("error") if isinstance(result, dict) else None
+            except Exception as e:
+                result, error = None, str(e)
+
+            with self._lock:
+                if job["status"] == RUNNING:
+                    job["status"] = FAILED if error else SUCCEEDED
+                    job["error"] = error
+                    job["result"] = None if error else result
+                    job["finished_at"] = time.time()
+                self._trim_history()
+
+            if error:
+                logger.error(f"{job['kind']} job {job_id} failed: {error}")
+            else:
+                logger.info(f"{job['kind']} job {job_id} finished with status {job['status']}")
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in FINISHED]
+        for job_id in finished[: max(len(finished) - self.history_limit, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,108 @@
+# project-agentic-system-interview-report/backend/app/core/json_repair.py
+# Tolerant parsing of the JSON objects models return. Beyond a ```json fence,
+# answers go wrong in a few typical ways: cut off at the token limit, a trailing
+# comma, a raw newline inside a string, Python literals, prose after the object.
+# These are fixed locally; a top-level member that is cut off or still invalid is
+# dropped, so the caller can re-request just that section.
+import re
+import json
+from backend.app.core.metrics import LLM_JSON_REPAIRS
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.DOTALL)
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def strip_json_fence(text: str) -> str:
+    return _FENCE_RE.sub("", text.strip()).strip()
+
+
+def parse_json_object(text: str) -> dict:
+    """
+    The JSON object in a model answer, repaired if needed: {} if not even one
+    top-level member could be recovered. Members that are cut off or invalid
+    are left out.
+    """
+    cleaned = strip_json_fence(text or "")
+    try:
+        value = json.loads(cleaned)
+        if isinstance(value, dict):
+            return value
+    except json.JSONDecodeError:
+        pass
+
+    members = top_level_members(cleaned)
+    try:
+        value = json.loads("{" + ",".join(members) + "}")
+    except json.JSONDecodeError:
+        # Keep every member that parses on its own
+        value = {}
+        for member in members:
+            try:
+                value.update(json.loads("{" + member + "}"))
+            except json.JSONDecodeError:
+                continue
+    LLM_JSON_REPAIRS.inc(outcome="repaired" if value else "failed")
+    return value
+
+
+def top_level_members(text: str) -> list:
+    """
+    The complete '"key": value' members of the first object in text, with
+    trailing commas removed, control characters in strings escaped and Python
+    literals converted. A member still open at the end of the text (a cut-off
+    answer) is not returned; text after the object is ignored.
+    """
+    start = text.find("{")
+    if start < 0:
+        return []
+    members, member = [], []
+    stack, in_string, escaped = ["}"], False, False
+    i = start + 1
+    while i < len(text):
+        char = text[i]
+        i += 1
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char < " ":
+                char = _ESCAPES.get(char, "")
+            member.append(char)
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            _drop_trailing_comma(member)
+            closer = stack.pop()
+            if not stack:
+                members.append("".join(member))
+                return [m for m in members if m.strip()]
+            char = closer
+        elif char == "," and len(stack) == 1:
+            members.append("".join(member))
+            member = []
+            continue
+        elif char.isalpha():
+            word = re.match(r"[A-Za-z]+", text[i - 1 :]).group(0)
+            char = _LITERALS.get(word, word)
+            i += len(word) - 1
+        member.append(char)
+
+    # Cut off: the last member is only kept if it was complete
+    if len(stack) == 1 and not in_string:
+        members.append("".join(member))
+    return [m for m in members if m.strip()]
+
+
+def _drop_trailing_comma(member: list):
+    while member and member[-1].isspace():
+        member.pop()
+    if member and member[-1] == ",":
+        member.pop()
@@ -0,0 +1,103 @@
+# project-agentic-system-interview-report/backend/app/core/json_stream.py
+import json
+
+
+class TopLevelObjectParser:
+    """
+    Incremental parser for a streamed JSON object (optionally inside a ```json
+    fence). feed() accepts text chunks as they arrive from the model and returns
+    the (key, value) pairs of every top-level member completed so far, so each
+    report section can be used before the rest of the completion exists.
+
+    Only the top level is tracked incrementally: the scanner follows string and
+    nesting state character by character and hands each finished member value
+    to json.loads once. If the output turns out not to be valid JSON the parser
+    marks itself failed and stops emitting; callers then parse the full text.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0  # next character to scan
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.finished = False
+        self.failed = False
+        self.member_start = None  # start of the current top-level "key": value
+        self.sections = {}
+
+    def feed(self, chunk: str) -> list:
+        if self.failed or self.finished:
+            return []
+        self.buffer += chunk
+        try:
+            return self._scan()
+        except ValueError:
+            self.failed = True
+            return []
+
+    def _scan(self) -> list:
+        completed = []
+        buffer = self.buffer
+
+        while self.pos < len(buffer) and not self.finished:
+            char = buffer[self.pos]
+
+            if not self.started:
+                if char == "{":
+                    self.started = True
+                    self.depth = 1
+                    self.member_start = self.pos + 1
+                self.pos += 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    member = self._parse_member(self.member_start, self.pos)
+                    if member:
+                        completed.append(member)
+                    self.finished = True
+            elif char == "," and self.depth == 1:
+                member = self._parse_member(self.member_start, self.pos)
+                if member:
+                    completed.append(member)
+                self.member_start = self.pos + 1
+            self.pos += 1
+
+        # Drop text that can no longer be part of an unfinished member
+        if self.member_start is not None and self.member_start > 0 and not self.finished:
+            self.buffer = buffer[self.member_start:]
+            self.pos -= self.member_start
+            self.member_start = 0
+        return completed
+
+    def _parse_member(self, start: int, end: int):
+        text = self.buffer[start:end].strip()
+        if not text:
+            return None
+        # The key is a JSON string and may itself contain ':'
+        decoder = json.JSONDecoder()
+        key, key_end = decoder.raw_decode(text)
+        value_text = text[key_end:].lstrip()
+        if not value_text.startswith(":"):
+            raise ValueError(f"Malformed member in streamed JSON: {text[:80]}")
+        value = json.loads(value_text[1:])
+        self.sections[key] = value
+        return key, value
+
+    def result(self) -> dict:
+        """All sections parsed so far, in arrival order"""
+        return dict(self.sections)
@@ -0,0 +1,358 @@
+# project-agentic-system-interview-report/backend/app/core/llm_cache.py
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from backend.app.core.config import (
+    CACHE_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_TTL_SECONDS,
+)
+from backend.app.core.cache_db import get_connection
+from backend.app.core.json_repair import strip_json_fence
+from backend.app.core.metrics import record_llm_call, usage_counts
+from backend.app.core.llm_gateway import estimate_request_tokens, get_gateway
+from backend.app.core.logging import logger
+
+LLM_CACHE_DB = os.path.join(CACHE_DIR, "llm_cache.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses (last_access);
+"""
+
+# Ask for a final chunk with token usage when streaming
+STREAM_OPTIONS = {"stream_options": {"include_usage": True}}
+
+# Eviction sums the size of the whole table, so it runs after this many stores
+# or once the bytes stored since the last run reach 1% of the budget
+EVICT_EVERY_STORES = 100
+
+_counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+_counters_lock = threading.Lock()
+_since_evict = {"stores": 0, "bytes": 0}
+
+
+def cache_key(model: str, messages: list, temperature: float, response_format=None) -> str:
+    """
+    Content address of a chat request: sha256 over model, messages, temperature
+    and the response_format, if any
+    """
+    request = {"model": model, "messages": messages, "temperature": temperature}
+    if response_format is not None:
+        request["response_format"] = response_format
+    payload = json.dumps(
+        request,
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str):
+    """Return the cached response text for key, or None if missing or expired"""
+    conn = get_connection(LLM_CACHE_DB, _SCHEMA)
+    now = time.time()
+    row = conn.execute(
+        "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+    ).fetchone()
+
+    if row is None or row[1] < now:
+        if row is not None:
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+        _count("misses")
+        return None
+
+    conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+    _count("hits")
+    return row[0]
+
+
+def store_response(key: str, model: str, response: str, ttl: int = LLM_CACHE_TTL_SECONDS):
+    """
+    Store a response. Every EVICT_EVERY_STORES stores (or 1% of the budget in
+    bytes) the least recently used entries beyond the size budget are evicted.
+    """
+    conn = get_connection(LLM_CACHE_DB, _SCHEMA)
+    now = time.time()
+    size = len(response.encode("utf-8"))
+    conn.execute(
+        "INSERT OR REPLACE INTO llm_responses "
+        "(key, model, response, size, created_at, expires_at, last_access) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (key, model, response, size, now, now + ttl, now),
+    )
+    _count("stores")
+    with _counters_lock:
+        _since_evict["stores"] += 1
+        _since_evict["bytes"] += size
+        due = (
+            _since_evict["stores"] >= EVICT_EVERY_STORES
+            or _since_evict["bytes"] >= LLM_CACHE_MAX_BYTES // 100
+        )
+        if due:
+            _since_evict.update(stores=0, bytes=0)
+    if due:
+        _evict(conn, now)
+
+
+def _evict(conn, now: float):
+    """Drop expired entries, then the least recently used ones until under budget"""
+    conn.execute("DELETE FROM llm_responses WHERE expires_at < ?", (now,))
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+    if total <= LLM_CACHE_MAX_BYTES:
+        return
+
+    evicted = 0
+    for key, size in conn.execute(
+        "SELECT key, size FROM llm_responses ORDER BY last_access ASC"
+    ).fetchall():
+        if total <= LLM_CACHE_MAX_BYTES:
+            break
+        conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+        total -= size
+        evicted += 1
+    _count("evictions", evicted)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for this process plus the current size of the cache"""
+    conn = get_connection(LLM_CACHE_DB, _SCHEMA)
+    entries, size = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+    ).fetchone()
+    with _counters_lock:
+        stats = dict(_counters)
+    lookups = stats["hits"] + stats["misses"]
+    stats.update(
+        {
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": LLM_CACHE_MAX_BYTES,
+        }
+    )
+    return stats
+
+
+def clear_cache():
+    """Remove every cached response"""
+    get_connection(LLM_CACHE_DB, _SCHEMA).execute("DELETE FROM llm_responses")
+
+
+def _count(name: str, amount: int = 1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def _settle(gateway, estimated: int, usage):
+    """Charge the gateway's token budget for what the call actually used"""
+    counts = usage_counts(usage)
+    gateway.settle(estimated, counts["prompt"] + counts["completion"])
+
+
+def is_json_response(text: str) -> bool:
+    """True if text (optionally wrapped in a ```json fence) parses as JSON"""
+    try:
+        json.loads(strip_json_fence(text))
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def chat_completion_text(
+    client,
+    model: str,
+    messages: list,
+    temperature: float,
+    validate=is_json_response,
+    response_format=None,
+) -> str:
+    """
+    Call client.chat.completions.create and return the message text.
+    Identical requests are served from the persistent cache; only responses
+    accepted by `validate` are stored, so a malformed answer is retried next time.
+    response_format (e.g. from structured_output.json_schema_format) is passed on.
+    Requests sent to the API go through the model's LLM gateway (rate limits,
+    adaptive concurrency, retries).
+    """
+    key = cache_key(model, messages, temperature, response_format)
+    options = {"response_format": response_format} if response_format else {}
+    if LLM_CACHE_ENABLED:
+        cached = get_cached_response(key)
+        if cached is not None:
+            logger.info(f"LLM cache hit ({model}, {key[:12]})")
+            record_llm_call(model, cached=True)
+            return cached
+
+    gateway = get_gateway(model)
+    estimated = estimate_request_tokens(messages)
+    started = time.perf_counter()
+    completion = gateway.call(
+        lambda: client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, **options
+        ),
+        estimated,
+    )
+    record_llm_call(model, False, completion.usage, time.perf_counter() - started)
+    _settle(gateway, estimated, completion.usage)
+    text = completion.choices[0].message.content
+
+    if LLM_CACHE_ENABLED and (validate is None or validate(text)):
+        store_response(key, model, text)
+    return text
+
+
+async def chat_completion_text_async(
+    async_client,
+    model: str,
+    messages: list,
+    temperature: float,
+    validate=is_json_response,
+    response_format=None,
+) -> str:
+    """Async variant of chat_completion_text for AsyncOpenAI clients"""
+    key = cache_key(model, messages, temperature, response_format)
+    options = {"response_format": response_format} if response_format else {}
+    if LLM_CACHE_ENABLED:
+        # SQLite blocks (up to its busy timeout), so keep it off the event loop
+        cached = await asyncio.to_thread(get_cached_response, key)
+        if cached is not None:
+            logger.info(f"LLM cache hit ({model}, {key[:12]})")
+            record_llm_call(model, cached=True)
+            return cached
+
+    gateway = get_gateway(model)
+    estimated = estimate_request_tokens(messages)
+    started = time.perf_counter()
+    completion = await gateway.call_async(
+        lambda: async_client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, **options
+        ),
+        estimated,
+    )
+    record_llm_call(model, False, completion.usage, time.perf_counter() - started)
+    _settle(gateway, estimated, completion.usage)
+    text = completion.choices[0].message.content
+
+    if LLM_CACHE_ENABLED and (validate is None or validate(text)):
+        await asyncio.to_thread(store_response, key, model, text)
+    return text
+
+
+def chat_completion_stream(
+    client,
+    model: str,
+    messages: list,
+    temperature: float,
+    validate=is_json_response,
+    response_format=None,
+):
+    """
+    Streaming variant of chat_completion_text: yields the response text in chunks
+    as the model generates it. A cache hit yields the whole cached text at once;
+    a completed stream is stored like a normal response.
+    """
+    key = cache_key(model, messages, temperature, response_format)
+    options = {"response_format": response_format} if response_format else {}
+    if LLM_CACHE_ENABLED:
+        cached = get_cached_response(key)
+        if cached is not None:
+            logger.info(f"LLM cache hit ({model}, {key[:12]})")
+            record_llm_call(model, cached=True)
+            yield cached
+            return
+
+    gateway = get_gateway(model)
+    estimated = estimate_request_tokens(messages)
+    parts, usage = [], None
+    started = time.perf_counter()
+    stream = gateway.open(
+        lambda: client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            **STREAM_OPTIONS,
+            **options,
+        ),
+        estimated,
+    )
+    try:
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+            usage = getattr(chunk, "usage", None) or usage
+    finally:
+        gateway.release()
+    record_llm_call(model, False, usage, time.perf_counter() - started)
+    _settle(gateway, estimated, usage)
+
+    text = "".join(parts)
+    if LLM_CACHE_ENABLED and (validate is None or validate(text)):
+        store_response(key, model, text)
+
+
+async def chat_completion_stream_async(
+    async_client,
+    model: str,
+    messages: list,
+    temperature: float,
+    validate=is_json_response,
+    response_format=None,
+):
+    """Async variant of chat_completion_stream for AsyncOpenAI clients"""
+    key = cache_key(model, messages, temperature, response_format)
+    options = {"response_format": response_format} if response_format else {}
+    if LLM_CACHE_ENABLED:
+        cached = await asyncio.to_thread(get_cached_response, key)
+        if cached is not None:
+            logger.info(f"LLM cache hit ({model}, {key[:12]})")
+            record_llm_call(model, cached=True)
+            yield cached
+            return
+
+    gateway = get_gateway(model)
+    estimated = estimate_request_tokens(messages)
+    parts, usage = [], None
+    started = time.perf_counter()
+    stream = await gateway.open_async(
+        lambda: async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            **STREAM_OPTIONS,
+            **options,
+        ),
+        estimated,
+    )
+    try:
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+            usage = getattr(chunk, "usage", None) or usage
+    finally:
+        gateway.release()
+    record_llm_call(model, False, usage, time.perf_counter() - started)
+    _settle(gateway, estimated, usage)
+
+    text = "".join(parts)
+    if LLM_CACHE_ENABLED and (validate is None or validate(text)):
+        await asyncio.to_thread(store_response, key, model, text)
@@ -0,0 +1,364 @@
+# project-agentic-system-interview-report/backend/app/core/llm_gateway.py
+# Admission control for chat completions, shared by every agent in the process
+# (sync calls from worker threads and async calls from any event loop alike):
+#   - requests-per-minute and tokens-per-minute token buckets per model,
+#   - a concurrency limit that halves when the API signals overload (429, 5xx,
+#     timeouts) and creeps back up while calls succeed (AIMD),
+#   - waiters admitted in priority order (interactive before batch work),
+#   - retries with jittered exponential backoff that honour Retry-After.
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from backend.app.core.config import (
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_COMPLETION_TOKEN_ESTIMATE,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_MIN_CONCURRENCY,
+    LLM_RPM,
+    LLM_TPM,
+)
+from backend.app.core.backoff import backoff_delay, retry_after_seconds
+from backend.app.core.metrics import LLM_CONCURRENCY, LLM_QUEUE_SECONDS, LLM_RETRIES
+from backend.app.core.prompt_budget import estimate_tokens
+from backend.app.core.logging import logger
+
+# Lower values are admitted first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+
+# Halve the concurrency limit at most once per this many seconds, so one burst
+# of 429s from requests already in flight counts as a single signal
+DECREASE_COOLDOWN_SECONDS = 5.0
+
+_priority = contextvars.ContextVar("llm_priority", default=PRIORITY_NORMAL)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Queue the chat completions made in this context (and tasks started from it) at priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    A bucket refilled continuously at per_minute/60 per second up to per_minute.
+    Takes are reservations: the bucket may go into debt, and the caller waits
+    until its share is refilled, so waiters are served in the order they reserve.
+    """
+
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens; returns the seconds to wait before using them"""
+        if self.capacity <= 0:
+            return 0.0
+        with self.lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float):
+        """Take (or, when negative, give back) tokens after the fact, e.g. actual usage"""
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class _Waiter:
+    def __init__(self, priority: int, wake):
+        self.priority = priority
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+
+
+class PriorityLimiter:
+    """
+    A concurrency limit whose waiters are admitted lowest priority value first
+    (FIFO within a priority). Works for threads and for coroutines on any loop:
+    a released slot is handed directly to the next waiter.
+    """
+
+    def __init__(self, limit: int, minimum: int = 1):
+        self.maximum = max(1, limit)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(self.maximum)
+        self.active = 0
+        self.lock = threading.Lock()
+        self._waiters = []
+        self._order = itertools.count()
+
+    def acquire(self, priority: int = PRIORITY_NORMAL):
+        event = threading.Event()
+        waiter = self._enqueue(priority, event.set)
+        if waiter is not None:
+            event.wait()
+
+    async def acquire_async(self, priority: int = PRIORITY_NORMAL):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enqueue(priority, wake)
+        if waiter is None:
+            return
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self.lock:
+                if waiter.granted:
+                    self._release_locked()
+                else:
+                    waiter.cancelled = True
+            raise
+
+    def release(self):
+        with self.lock:
+            self._release_locked()
+
+    def increase(self):
+        """Additive increase: about one more slot per `limit` successful calls"""
+        with self.lock:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake_locked()
+
+    def decrease(self):
+        """Multiplicative decrease; calls already in flight finish normally"""
+        with self.lock:
+            self.limit = max(self.minimum, self.limit / 2)
+
+    def _enqueue(self, priority: int, wake):
+        """Take a free slot (returns None) or queue a waiter for one"""
+        with self.lock:
+            if not self._waiters and self.active < int(self.limit):
+                self.active += 1
+                return None
+            waiter = _Waiter(priority, wake)
+            heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+            return waiter
+
+    def _release_locked(self):
+        self.active -= 1
+        self._wake_locked()
+
+    def _wake_locked(self):
+        while self._waiters and self.active < int(self.limit):
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            self.active += 1
+            waiter.granted = True
+            waiter.wake()
+
+
+class LLMGateway:
+    """Rate limits, adaptive concurrency and retries for the chat completions of one model"""
+
+    def __init__(
+        self,
+        model: str,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        min_concurrency: int = LLM_MIN_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = LLM_BACKOFF_MAX_SECONDS,
+    ):
+        self.model = model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.limiter = PriorityLimiter(max_concurrency, min_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.paused_until = 0.0  # set from Retry-After; holds back every new request
+        self.last_decrease = float("-inf")
+        LLM_CONCURRENCY.set(self.limiter.limit, model=model)
+
+    def open(self, create, estimated_tokens: int):
+        """
+        Call create() once admitted, retrying transient API errors. Returns its
+        result with the concurrency slot still held (for a stream being read);
+        the caller must call release() when done with it.
+        """
+        for attempt in range(self.max_retries + 1):
+            delay = self._admission_delay(estimated_tokens)
+            while delay > 0:
+                time.sleep(delay)
+                delay = self._pause_remaining()
+            self._acquire(_priority.get())
+            try:
+                result = create()
+            except KeyboardInterrupt:
+                self.limiter.release()
+                raise
+            except Exception as e:
+                self.limiter.release()
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._succeeded()
+            return result
+
+    def call(self, create, estimated_tokens: int):
+        """open() for a call that completes on return"""
+        result = self.open(create, estimated_tokens)
+        self.release()
+        return result
+
+    async def open_async(self, create, estimated_tokens: int):
+        """Async variant of open(); create returns an awaitable"""
+        for attempt in range(self.max_retries + 1):
+            delay = self._admission_delay(estimated_tokens)
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._pause_remaining()
+            await self._acquire_async(_priority.get())
+            try:
+                result = await create()
+            except asyncio.CancelledError:
+                self.limiter.release()
+                raise
+            except Exception as e:
+                self.limiter.release()
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._succeeded()
+            return result
+
+    async def call_async(self, create, estimated_tokens: int):
+        result = await self.open_async(create, estimated_tokens)
+        self.release()
+        return result
+
+    def release(self):
+        self.limiter.release()
+
+    def settle(self, estimated_tokens: int, used_tokens: int):
+        """Correct the TPM bucket by the difference between estimated and actual usage"""
+        if used_tokens:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+
+    def _acquire(self, priority: int):
+        started = time.perf_counter()
+        self.limiter.acquire(priority)
+        LLM_QUEUE_SECONDS.observe(time.perf_counter() - started, model=self.model)
+
+    async def _acquire_async(self, priority: int):
+        started = time.perf_counter()
+        await self.limiter.acquire_async(priority)
+        LLM_QUEUE_SECONDS.observe(time.perf_counter() - started, model=self.model)
+
+    def _admission_delay(self, estimated_tokens: int) -> float:
+        """
+        Seconds to wait for the RPM and TPM budgets (and any Retry-After pause).
+        Waited out before taking a concurrency slot, so throttled calls do not
+        hold slots that higher-priority calls could use.
+        """
+        return max(
+            self._pause_remaining(),
+            self.requests.reserve(1),
+            self.tokens.reserve(estimated_tokens),
+            0.0,
+        )
+
+    def _pause_remaining(self) -> float:
+        """Seconds left of a Retry-After pause set, possibly while this call waited"""
+        return self.paused_until - time.monotonic()
+
+    def _succeeded(self):
+        self.limiter.increase()
+        LLM_CONCURRENCY.set(self.limiter.limit, model=self.model)
+
+    def _retry_delay(self, error: Exception, attempt: int):
+        """Seconds to back off before another attempt, or None if error is final"""
+        reason = retry_reason(error)
+        if reason is None or attempt >= self.max_retries:
+            return None
+        LLM_RETRIES.inc(model=self.model, reason=reason)
+
+        now = time.monotonic()
+        if reason != "connection" and now - self.last_decrease >= DECREASE_COOLDOWN_SECONDS:
+            self.last_decrease = now
+            self.limiter.decrease()
+            LLM_CONCURRENCY.set(self.limiter.limit, model=self.model)
+
+        # Full jitter, but never sooner than the server asked for
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+        response = getattr(error, "response", None)
+        retry_after = retry_after_seconds(getattr(response, "headers", None))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+            self.paused_until = max(self.paused_until, now + delay)
+        logger.warning(
+            f"LLM call to {self.model} failed ({reason}, attempt {attempt + 1}), "
+            f"retrying in {delay:.2f}s: {error}"
+        )
+        return delay
+
+
+def retry_reason(error: Exception):
+    """Why error is worth retrying (rate_limit, server, timeout, connection), else None"""
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        # Running out of quota is not cured by waiting
+        return None if getattr(error, "code", None) == "insufficient_quota" else "rate_limit"
+    if status is not None:
+        return "server" if status in (408, 409) or status >= 500 else None
+    name = type(error).__name__
+    if name == "APITimeoutError":
+        return "timeout"
+    if name == "APIConnectionError":
+        return "connection"
+    return None
+
+
+def estimate_request_tokens(messages: list) -> int:
+    """Tokens a request is budgeted at before its usage is known: prompt plus a typical answer"""
+    prompt = sum(estimate_tokens(message.get("content") or "") for message in messages)
+    return prompt + LLM_COMPLETION_TOKEN_ESTIMATE
+
+
+_gateways = {}
+_gateways_lock = threading.Lock()
+
+
+def get_gateway(model: str) -> LLMGateway:
+    """The process-wide gateway for model"""
+    gateway = _gateways.get(model)
+    if gateway is None:
+        with _gateways_lock:
+            gateway = _gateways.setdefault(model, LLMGateway(model))
+    return gateway
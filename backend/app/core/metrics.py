@@ -0,0 +1,249 @@
+# project-agentic-system-interview-report/backend/app/core/metrics.py
+# In-process metrics: counters and histograms rendered in the Prometheus text
+# format for GET /metrics, plus a per-run collector so one report's stage
+# timings and token usage can be returned with the report itself.
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_KINDS = ("prompt", "completion", "cached")
+
+_lock = threading.Lock()
+_registry = {}
+_run_lock = threading.Lock()
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self.values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[label] for label in self.labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(tuple(labels[label] for label in self.labels), 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with _lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_labels(self.labels, key)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        key = tuple(labels[label] for label in self.labels)
+        with _lock:
+            self.values[key] = value
+
+    def render(self) -> list:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label values -> [bucket counts..., count, sum]
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[label] for label in self.labels)
+        with _lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            items = sorted((key, list(series)) for key, series in self.series.items())
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                le = _labels(self.labels + ("le",), key + (_number(bound),))
+                lines.append(f"{self.name}_bucket{le} {count}")
+            le = _labels(self.labels + ("le",), key + ("+Inf",))
+            lines.append(f"{self.name}_bucket{le} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(series[-1])}")
+        return lines
+
+
+def counter(name: str, help: str, labels: tuple = ()) -> Counter:
+    return _register(Counter(name, help, labels))
+
+
+def gauge(name: str, help: str, labels: tuple = ()) -> Gauge:
+    return _register(Gauge(name, help, labels))
+
+
+def histogram(name: str, help: str, labels: tuple = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help, labels, buckets))
+
+
+def _register(metric):
+    with _lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def render_metrics() -> str:
+    """Every registered metric in the Prometheus text exposition format"""
+    with _lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+STAGE_SECONDS = histogram(
+    "report_stage_duration_seconds", "Duration of report pipeline stages", ("stage",)
+)
+STAGE_ERRORS = counter(
+    "report_stage_errors_total", "Report pipeline stages that raised", ("stage",)
+)
+LLM_REQUESTS = counter(
+    "llm_requests_total",
+    "Chat completions by where the answer came from (cache or api)",
+    ("model", "source"),
+)
+LLM_SECONDS = histogram(
+    "llm_request_duration_seconds",
+    "Latency of chat completions sent to the API, including gateway waits and retries",
+    ("model",),
+)
+LLM_TOKENS = counter(
+    "llm_tokens_total",
+    "Tokens used by chat completions; cached counts prompt tokens read from the prompt cache",
+    ("model", "kind"),
+)
+LLM_RETRIES = counter(
+    "llm_retries_total",
+    "Chat completions retried after a transient error (rate_limit, server, timeout, connection)",
+    ("model", "reason"),
+)
+LLM_QUEUE_SECONDS = histogram(
+    "llm_queue_wait_seconds", "Time chat completions waited for a concurrency slot", ("model",)
+)
+LLM_JSON_REPAIRS = counter(
+    "llm_json_repairs_total",
+    "Model answers that were not valid JSON (repaired or failed locally), and "
+    "sections re-requested because they were missing",
+    ("outcome",),
+)
+LLM_CONCURRENCY = gauge(
+    "llm_concurrency_limit", "Current adaptive limit on concurrent chat completions", ("model",)
+)
+
+# Metrics of the run (one report) the current context belongs to, if any
+_run = contextvars.ContextVar("metrics_run", default=None)
+
+
+@contextmanager
+def collect_run():
+    """
+    Collect the stage timings and LLM usage recorded in this context (including
+    asyncio tasks and asyncio.to_thread calls started from it) into a dict:
+    {"stages": {stage: seconds}, "llm": {...}}.
+    """
+    run = {
+        "stages": {},
+        "llm": {
+            "requests": 0,
+            "cache_hits": 0,
+            **{f"{kind}_tokens": 0 for kind in TOKEN_KINDS},
+        },
+    }
+    token = _run.set(run)
+    try:
+        yield run
+    finally:
+        _run.reset(token)
+        requests = run["llm"]["requests"]
+        run["llm"]["cache_hit_rate"] = (
+            round(run["llm"]["cache_hits"] / requests, 4) if requests else 0.0
+        )
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    run = _run.get()
+    if run is not None:
+        with _run_lock:
+            run["stages"][stage] = round(run["stages"].get(stage, 0) + seconds, 4)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a block as a pipeline stage; stages that raise are also counted as errors"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def usage_counts(usage) -> dict:
+    """Prompt, completion and cached prompt token counts of an OpenAI usage object"""
+
+    def field(obj, name):
+        if obj is None:
+            return None
+        return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+    return {
+        "prompt": field(usage, "prompt_tokens") or 0,
+        "completion": field(usage, "completion_tokens") or 0,
+        "cached": field(field(usage, "prompt_tokens_details"), "cached_tokens") or 0,
+    }
+
+
+def record_llm_call(model: str, cached: bool, usage=None, seconds: float = None):
+    """Count one chat completion: served from the response cache or sent to the API"""
+    LLM_REQUESTS.inc(model=model, source="cache" if cached else "api")
+    counts = usage_counts(usage)
+    for kind, amount in counts.items():
+        if amount:
+            LLM_TOKENS.inc(amount, model=model, kind=kind)
+    if seconds is not None:
+        LLM_SECONDS.observe(seconds, model=model)
+
+    run = _run.get()
+    if run is not None:
+        with _run_lock:
+            llm = run["llm"]
+            llm["requests"] += 1
+            llm["cache_hits"] += 1 if cached else 0
+            for kind, amount in counts.items():
+                llm[f"{kind}_tokens"] += amount
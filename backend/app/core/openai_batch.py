@@ -0,0 +1,234 @@
+# project-agentic-system-interview-report/backend/app/core/openai_batch.py
+# Chat completions through the OpenAI Batch API (half price, results within the
+# completion window). Requests are written to JSONL, uploaded and submitted as
+# batches; the uploaded files, batch ids and downloaded result files are recorded
+# in a state dict that the caller persists, so an interrupted run picks up its
+# batches instead of paying for them twice.
+import os
+import json
+import time
+from backend.app.core.config import (
+    BATCH_API_COMPLETION_WINDOW,
+    BATCH_API_MAX_REQUESTS,
+    BATCH_API_MAX_SUBMISSIONS,
+    BATCH_API_POLL_SECONDS,
+    LLM_CACHE_ENABLED,
+)
+from backend.app.core.llm_cache import cache_key, get_cached_response, store_response
+from backend.app.core.metrics import record_llm_call
+from backend.app.core.logging import logger
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def batch_request(
+    custom_id: str, model: str, messages: list, temperature: float, response_format=None
+) -> dict:
+    """One line of a batch input file"""
+    body = {"model": model, "messages": messages, "temperature": temperature}
+    if response_format:
+        body["response_format"] = response_format
+    return {"custom_id": custom_id, "method": "POST", "url": CHAT_ENDPOINT, "body": body}
+
+
+def request_cache_key(body: dict) -> str:
+    return cache_key(
+        body["model"], body["messages"], body["temperature"], body.get("response_format")
+    )
+
+
+def cached_result(request: dict):
+    """The LLM cache entry for a batch request, in the form of a batch result, or None"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    body = request["body"]
+    text = get_cached_response(request_cache_key(body))
+    if text is None:
+        return None
+    record_llm_call(body["model"], cached=True)
+    return {"text": text}
+
+
+def run_batch(
+    client,
+    requests: list,
+    state: dict,
+    work_dir: str,
+    save_state=None,
+    wait: bool = True,
+    poll_seconds: float = BATCH_API_POLL_SECONDS,
+    max_submissions: int = BATCH_API_MAX_SUBMISSIONS,
+) -> dict:
+    """
+    Get a result for every request: {custom_id: {"text", "usage"} or {"error"}}.
+
+    state["batches"] records the batches submitted so far and save_state(state)
+    is called whenever it changes, so batches from an interrupted run are polled
+    rather than submitted again. A batch is recorded as "submitting" with its
+    uploaded file before it is created; a run stopped in between looks the file
+    up in the account's batches and creates one only if none was. Requests that
+    got no answer from a finished batch (failed lines, expired batch) are
+    resubmitted, in at most max_submissions rounds. With wait=False the call
+    returns after submitting and polling once, with the results known so far;
+    call it again to continue.
+    """
+    save_state = save_state or (lambda _: None)
+    by_id = {request["custom_id"]: request for request in requests}
+    state.setdefault("batches", [])
+    state.setdefault("submissions", 0)
+
+    while True:
+        for batch in state["batches"]:
+            if batch["status"] == "submitting":
+                # Uploaded, but the run stopped before the batch id was saved
+                create_batch(client, batch, find_batch(client, batch))
+                save_state(state)
+        for batch in state["batches"]:
+            if batch["status"] not in TERMINAL_STATUSES:
+                poll_batch(client, batch, work_dir)
+                save_state(state)
+        if any(batch["status"] not in TERMINAL_STATUSES for batch in state["batches"]):
+            if not wait:
+                return read_results(state["batches"])
+            time.sleep(poll_seconds)
+            continue
+
+        results = read_results(state["batches"])
+        pending = [custom_id for custom_id in by_id if "text" not in results.get(custom_id, {})]
+        if not pending or state["submissions"] >= max_submissions:
+            return results
+        state["submissions"] += 1
+        for start in range(0, len(pending), BATCH_API_MAX_REQUESTS):
+            chunk = pending[start : start + BATCH_API_MAX_REQUESTS]
+            batch = upload_batch(client, [by_id[custom_id] for custom_id in chunk], work_dir)
+            state["batches"].append(batch)
+            save_state(state)
+            create_batch(client, batch)
+            save_state(state)
+
+
+def upload_batch(client, requests: list, work_dir: str) -> dict:
+    """
+    Write requests to JSONL and upload it; returns the batch's state record,
+    "submitting" until create_batch has given it an id
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    name = f"input-{time.strftime('%Y%m%d-%H%M%S')}-{len(os.listdir(work_dir))}.jsonl"
+    input_path = os.path.join(work_dir, name)
+    with open(input_path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+    with open(input_path, "rb") as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    return {
+        "id": None,
+        "status": "submitting",
+        "input_file_id": input_file.id,
+        "input_path": input_path,
+        "requests": len(requests),
+        "uploaded_at": time.time(),
+    }
+
+
+def create_batch(client, batch: dict, remote=None):
+    """Create the batch of an uploaded record, or adopt remote, one already created for it"""
+    if remote is None:
+        remote = client.batches.create(
+            input_file_id=batch["input_file_id"],
+            endpoint=CHAT_ENDPOINT,
+            completion_window=BATCH_API_COMPLETION_WINDOW,
+        )
+        logger.info(
+            f"Submitted batch {remote.id} with {batch['requests']} requests ({batch['input_path']})"
+        )
+    else:
+        logger.info(f"Batch {remote.id} for {batch['input_path']} was already submitted")
+    batch.update(
+        id=remote.id, status=remote.status, submitted_at=time.strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+
+def find_batch(client, batch: dict):
+    """The batch created from a record's input file, or None if the create call never got through"""
+    for remote in client.batches.list(limit=100):
+        if remote.input_file_id == batch["input_file_id"]:
+            return remote
+        # Listed newest first: anything older than the upload cannot be it
+        if remote.created_at < batch["uploaded_at"] - 300:
+            break
+    return None
+
+
+def poll_batch(client, batch: dict, work_dir: str):
+    """Refresh a batch record; once it has finished, download its output and error files"""
+    remote = client.batches.retrieve(batch["id"])
+    batch["status"] = remote.status
+    counts = remote.request_counts
+    if counts is not None:
+        batch["request_counts"] = {
+            "total": counts.total,
+            "completed": counts.completed,
+            "failed": counts.failed,
+        }
+    logger.info(f"Batch {batch['id']}: {remote.status} {batch.get('request_counts', '')}")
+    if remote.status not in TERMINAL_STATUSES:
+        return
+
+    for kind, file_id in (("output", remote.output_file_id), ("error", remote.error_file_id)):
+        if file_id:
+            path = os.path.join(work_dir, f"{batch['id']}-{kind}.jsonl")
+            with open(path, "wb") as f:
+                f.write(client.files.content(file_id).content)
+            batch[f"{kind}_path"] = path
+    if remote.status == "failed" and remote.errors:
+        batch["errors"] = [error.message for error in remote.errors.data or []]
+
+
+def read_results(batches: list) -> dict:
+    """Results in the downloaded files of finished batches; an answer beats an error"""
+    results = {}
+    for batch in batches:
+        for key in ("error_path", "output_path"):
+            path = batch.get(key)
+            if not path or not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        custom_id, result = parse_result_line(json.loads(line))
+                        if "text" in result or "text" not in results.get(custom_id, {}):
+                            results[custom_id] = result
+        if batch.get("errors"):
+            logger.warning(f"Batch {batch['id']} failed: {batch['errors']}")
+    return results
+
+
+def parse_result_line(line: dict) -> tuple:
+    """(custom_id, {"text", "usage"} or {"error"}) of one line of a batch output/error file"""
+    custom_id = line.get("custom_id")
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        error = line.get("error") or body.get("error") or {}
+        if isinstance(error, dict):
+            error = error.get("message") or f"HTTP {response.get('status_code')}"
+        return custom_id, {"error": str(error)}
+    try:
+        text = body["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return custom_id, {"error": "batch response without a message"}
+    return custom_id, {"text": text, "usage": body.get("usage"), "model": body.get("model")}
+
+
+def remember_results(requests: list, results: dict, validate=None):
+    """Store batch answers in the LLM cache and count their token usage"""
+    for request in requests:
+        result = results.get(request["custom_id"]) or {}
+        if "text" not in result:
+            continue
+        body = request["body"]
+        record_llm_call(body["model"], False, result.get("usage"))
+        if LLM_CACHE_ENABLED and (validate is None or validate(result["text"])):
+            store_response(request_cache_key(body), body["model"], result["text"])
@@ -0,0 +1,39 @@
+# project-agentic-system-interview-report/backend/app/core/openai_client.py
+# OpenAI clients, created on first use: importing the openai package costs more
+# than the rest of an agent's imports together, and scripts that never call the
+# API (CLIs printing help, cache and index tools, workers waiting for jobs)
+# should not pay for it. The clients do not retry on their own; retries and
+# backoff are left to the LLM gateway, which sees every call.
+import asyncio
+import threading
+import weakref
+from backend.app.core.config import OPENAI_API_KEY
+
+_client = None
+_client_lock = threading.Lock()
+
+# Async clients keep an HTTP connection pool, which is tied to the event loop
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """The process-wide OpenAI client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+
+                _client = OpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+    return _client
+
+
+def get_async_client():
+    """Return the AsyncOpenAI client bound to the running event loop"""
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        from openai import AsyncOpenAI
+
+        async_client = _async_clients[loop] = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+    return async_client
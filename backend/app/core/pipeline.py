@@ -0,0 +1,82 @@
+# project-agentic-system-interview-report/backend/app/core/pipeline.py
+import asyncio
+import time
+from backend.app.core.metrics import stage_timer
+
+
+async def run_stages(stages: dict) -> tuple:
+    """
+    Run a DAG of async stages, starting each stage as soon as its inputs are ready.
+
+    `stages` maps a stage name to `(dependencies, func)`. `func` is called with the
+    results of its dependencies as positional arguments (in the listed order) and
+    must return an awaitable. Returns `(results, timings)`, where timings holds the
+    start/end offset and duration of every stage in seconds plus the total run time.
+    If a stage raises, the remaining stages are cancelled and the error propagates.
+    """
+    for name, (deps, _) in stages.items():
+        unknown = [dep for dep in deps if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {unknown}")
+    _check_acyclic(stages)
+
+    started = time.perf_counter()
+    timings = {}
+    tasks = {}
+
+    async def run(name: str):
+        deps, func = stages[name]
+        inputs = [await tasks[dep] for dep in deps]
+        stage_start = time.perf_counter()
+        try:
+            return await func(*inputs)
+        finally:
+            stage_end = time.perf_counter()
+            timings[name] = {
+                "start_s": round(stage_start - started, 3),
+                "end_s": round(stage_end - started, 3),
+                "duration_s": round(stage_end - stage_start, 3),
+            }
+
+    for name in stages:
+        tasks[name] = asyncio.ensure_future(run(name))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    timings["total"] = {"duration_s": round(time.perf_counter() - started, 3)}
+    return {name: task.result() for name, task in tasks.items()}, timings
+
+
+def timed_stage(stage: str, func):
+    """Wrap a stage function so its duration is recorded in the stage metrics"""
+
+    async def run(*inputs):
+        with stage_timer(stage):
+            return await func(*inputs)
+
+    return run
+
+
+def _check_acyclic(stages: dict):
+    """Raise ValueError if the stage dependencies contain a cycle."""
+    visiting, done = set(), set()
+
+    def visit(name: str, path: list):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage dependency cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dep in stages[name][0]:
+            visit(dep, path + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for name in stages:
+        visit(name, [])
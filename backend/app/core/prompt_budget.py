@@ -0,0 +1,177 @@
+# project-agentic-system-interview-report/backend/app/core/prompt_budget.py
+import re
+import json
+import math
+import textwrap
+from backend.app.core.config import PROMPT_TOKEN_BUDGET
+from backend.app.core.logging import logger
+
+# Bookkeeping fields that carry no meaning for the model
+NON_SEMANTIC_FIELDS = {"scraped_at", "source_url", "duplicate_of", "metadata"}
+
+_EMPTY_VALUES = (None, "", "N/A", "n/a", "Not specified", "Not mentioned", [], {})
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]+|\s{2,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Offline token estimate for GPT-4o style BPE. Words cost one token per ~6
+    characters, punctuation runs one per 2 characters, and each run of repeated
+    whitespace (indentation, blank lines) one token. Good enough for budgeting;
+    no tokenizer download needed.
+    """
+    tokens = 0
+    for piece in _TOKEN_RE.findall(text):
+        first = piece[0]
+        if first.isspace():
+            tokens += 1
+        elif first.isalnum() or first == "_":
+            tokens += 1 + (len(piece) - 1) // 6
+        else:
+            tokens += math.ceil(len(piece) / 2)
+    return tokens
+
+
+def prune(data, top_level: bool = True):
+    """Drop non-semantic fields (top level only) and empty values (everywhere)"""
+    if isinstance(data, dict):
+        pruned = {}
+        for key, value in data.items():
+            if top_level and key in NON_SEMANTIC_FIELDS:
+                continue
+            value = prune(value, top_level=False)
+            if value in _EMPTY_VALUES:
+                continue
+            pruned[key] = value
+        return pruned
+    if isinstance(data, list):
+        items = [prune(item, top_level=False) for item in data]
+        return [item for item in items if item not in _EMPTY_VALUES]
+    return data
+
+
+def compact_json(data) -> str:
+    return json.dumps(prune(data), ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines left behind by PDF/DOCX extraction"""
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    return re.sub(r"\n\s*\n+", "\n", text).strip()
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Keep whole lines from the start of text until max_tokens is reached"""
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            # Keep a proportional prefix of the line that crosses the budget
+            keep_chars = len(line) * max(max_tokens - used, 0) // cost
+            if keep_chars:
+                kept.append(line[:keep_chars])
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept) + "\n[...truncated to fit the token budget...]"
+
+
+def shrink_json(data, max_tokens: int) -> str:
+    """
+    Serialize data within max_tokens by repeatedly dropping the last item of the
+    longest list, then shortening the longest strings, keeping valid JSON.
+    """
+    data = prune(data)
+    text = compact_json(data)
+    while estimate_tokens(text) > max_tokens:
+        longest_list = _largest(data, list)
+        if longest_list is not None and len(longest_list) > 1:
+            longest_list.pop()
+        else:
+            parent, key = _longest_string(data)
+            if parent is None or len(parent[key]) <= 40:
+                return truncate_text(text, max_tokens)
+            parent[key] = parent[key][: len(parent[key]) * 2 // 3] + "..."
+        text = compact_json(data)
+    return text
+
+
+def _largest(data, kind):
+    best, best_size = None, 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, kind) and len(node) > best_size:
+            best, best_size = node, len(node)
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return best
+
+
+def _longest_string(data):
+    best, best_len = (None, None), 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, str) and len(value) > best_len:
+                best, best_len = (node, key), len(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return best
+
+
+def assemble_prompt(
+    template: str, budget: int = PROMPT_TOKEN_BUDGET, label: str = "prompt", **fields
+) -> str:
+    """
+    Fill template's {placeholders} so the whole prompt fits within budget tokens.
+    dict/list fields are serialized as compact JSON without bookkeeping fields;
+    str fields and the template itself lose redundant whitespace. If the result
+    is still too large, the budget is shared fairly: small fields are kept whole
+    and the largest ones are trimmed. Logs the tokens saved versus the naive
+    indent=4 / raw text assembly.
+    """
+    template = textwrap.dedent(template).strip()
+    naive = {
+        name: json.dumps(value, indent=4) if isinstance(value, (dict, list)) else str(value)
+        for name, value in fields.items()
+    }
+    naive_tokens = estimate_tokens(template.format(**naive))
+
+    rendered = {
+        name: compact_json(value) if isinstance(value, (dict, list)) else compact_text(str(value))
+        for name, value in fields.items()
+    }
+    fixed_tokens = estimate_tokens(template.format(**{name: "" for name in fields}))
+    sizes = {name: estimate_tokens(text) for name, text in rendered.items()}
+
+    available = budget - fixed_tokens
+    if sum(sizes.values()) > available:
+        remaining = max(available, 0)
+        for index, name in enumerate(sorted(sizes, key=sizes.get)):
+            share = remaining // (len(sizes) - index)
+            if sizes[name] > share:
+                value = fields[name]
+                if isinstance(value, (dict, list)):
+                    rendered[name] = shrink_json(json.loads(json.dumps(value)), share)
+                else:
+                    rendered[name] = truncate_text(rendered[name], share)
+            remaining -= min(sizes[name], share)
+
+    prompt = template.format(**rendered)
+    final_tokens = estimate_tokens(prompt)
+    logger.info(
+        f"Prompt {label}: ~{final_tokens} tokens (naive ~{naive_tokens}, "
+        f"saved ~{naive_tokens - final_tokens}, budget {budget})"
+    )
+    return prompt
@@ -0,0 +1,81 @@
+# project-agentic-system-interview-report/backend/app/core/report_render.py
+# HTML report rendering. The Jinja2 environment is created once per process:
+# templates are compiled on first use, kept in memory and their bytecode is
+# cached on disk, so rendering a report only runs the compiled template.
+import os
+import time
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from backend.app.core.config import TEMPLATE_AUTO_RELOAD, TEMPLATE_CACHE_DIR
+from backend.app.core.artifact_io import write_atomic_stream
+from backend.app.core.metrics import observe_stage
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+REPORT_TEMPLATE = "report_template.html"
+
+# Chunks from Template.generate() are small; collect them into writes of this size
+WRITE_BUFFER_BYTES = 64 * 1024
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+)
+_cache_dir_ready = False
+
+
+def get_report_template():
+    """The compiled report template (recompiled on change only with TEMPLATE_AUTO_RELOAD)"""
+    global _cache_dir_ready
+    if not _cache_dir_ready:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        _cache_dir_ready = True
+    return env.get_template(REPORT_TEMPLATE)
+
+
+def render_report_chunks(job_analysis: dict, resume_analysis: dict):
+    """
+    The report HTML as a stream of UTF-8 byte chunks of about WRITE_BUFFER_BYTES.
+    The time spent rendering (not writing the chunks) is recorded as the render stage.
+    """
+    buffer, size = [], 0
+    rendering = 0.0
+    started = time.perf_counter()
+    for text in get_report_template().generate(job=job_analysis, resume=resume_analysis):
+        data = text.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= WRITE_BUFFER_BYTES:
+            rendering += time.perf_counter() - started
+            yield b"".join(buffer)
+            buffer, size = [], 0
+            started = time.perf_counter()
+    rendering += time.perf_counter() - started
+    observe_stage("render", rendering)
+    if buffer:
+        yield b"".join(buffer)
+
+
+def render_report(job_analysis: dict, resume_analysis: dict) -> str:
+    return get_report_template().render(job=job_analysis, resume=resume_analysis)
+
+
+def render_report_section(template, block: str, job_analysis: dict, resume_analysis: dict) -> str:
+    """Render a single {% block %} of the report template"""
+    context = template.new_context({"job": job_analysis, "resume": resume_analysis})
+    return "".join(template.blocks[block](context))
+
+
+def write_chunks(path: str, chunks, compression: str = "none") -> int:
+    """
+    Stream byte chunks to path atomically; with compression "gzip" or "zstd" a
+    compressed copy is written alongside (path.gz or path.zst) in the same pass.
+    Returns the number of (uncompressed) bytes written.
+    """
+    return write_atomic_stream(path, chunks, compression)
+
+
+def write_report(
+    path: str, job_analysis: dict, resume_analysis: dict, compression: str = "none"
+) -> int:
+    """Render the report straight into a file (plus a compressed copy, see write_chunks)"""
+    return write_chunks(path, render_report_chunks(job_analysis, resume_analysis), compression)
@@ -0,0 +1,274 @@
+# project-agentic-system-interview-report/backend/app/core/report_sections.py
+import re
+
+# The sections of the comprehensive analysis, in report order. "key" is the
+# top-level JSON key the report template reads, "block" the template block that
+# displays the section (None if the template has no block for it), "inputs" the
+# parts of the job analysis and resume it is written from (see section_store;
+# "job" and "resume" stand for all of their parts).
+REPORT_SECTIONS = [
+    {
+        "title": "EXECUTIVE SUMMARY",
+        "key": "EXECUTIVE_SUMMARY",
+        "block": "executive_summary",
+        "points": [
+            "Overall Match Percentage (0-100%)",
+            "Key Strengths Summary",
+            "Primary Concerns/Gaps",
+            "Recommended Preparation Focus Areas",
+        ],
+        "inputs": ["job", "resume"],
+    },
+    {
+        "title": "SKILLS ANALYSIS",
+        "key": "SKILLS_ANALYSIS",
+        "block": "skills_analysis",
+        "points": [
+            "Required Skills Assessment (match/missing/partial)",
+            "Technical Skills Gap Analysis",
+            "Soft Skills Evaluation",
+            "Certifications & Education Alignment",
+            "Experience Level Comparison",
+        ],
+        "inputs": [
+            "job.basics",
+            "job.requirements",
+            "job.candidate",
+            "resume.skills",
+            "resume.experience",
+            "resume.education",
+            "resume.certifications",
+            "resume.projects",
+        ],
+    },
+    {
+        "title": "PERSONALIZED INTRODUCTION STRATEGY",
+        "key": "PERSONALIZED INTRODUCTION STRATEGY",
+        "block": "introduction_strategy",
+        "points": [
+            "30-Second Elevator Pitch Template",
+            "2-Minute Detailed Introduction",
+            "Key Value Propositions to Highlight",
+            "Unique Selling Points",
+            "Career Story Narrative",
+        ],
+        "inputs": [
+            "job.basics",
+            "job.role",
+            "job.company",
+            "resume.summary",
+            "resume.experience",
+            "resume.skills",
+            "resume.projects",
+        ],
+    },
+    {
+        "title": "TECHNICAL PREPARATION",
+        "key": "TECHNICAL PREPARATION",
+        "block": "technical_preparation",
+        "points": [
+            "Technical Skills to Brush Up On",
+            "Coding Challenges to Practice",
+            "System Design Topics",
+            "Architecture Questions to Study",
+            "Tools & Technologies to Research",
+            "Portfolio Projects to Highlight",
+        ],
+        "inputs": [
+            "job.requirements",
+            "job.role",
+            "job.interview",
+            "resume.skills",
+            "resume.experience",
+            "resume.projects",
+        ],
+    },
+    {
+        "title": "BEHAVIORAL PREPARATION",
+        "key": "BEHAVIORAL PREPARATION",
+        "block": None,
+        "points": [
+            "STAR Method Examples to Prepare",
+            "Leadership Stories",
+            "Problem-Solving Examples",
+            "Teamwork Scenarios",
+            "Failure & Learning Stories",
+            "Success Stories Relevant to Role",
+        ],
+        "inputs": [
+            "job.role",
+            "job.interview",
+            "job.candidate",
+            "resume.experience",
+            "resume.projects",
+        ],
+    },
+    {
+        "title": "INTERVIEW QUESTIONS BANK",
+        "key": "INTERVIEW QUESTIONS BANK",
+        "block": "interview_questions",
+        "points": [
+            "Technical Questions (20+ questions)",
+            "Behavioral Questions (15+ questions)",
+            "Company-Specific Questions (10+ questions)",
+            "Role-Specific Questions (10+ questions)",
+            "Situational Questions (10+ questions)",
+        ],
+        "inputs": ["job", "resume.skills", "resume.experience", "resume.projects"],
+    },
+    {
+        "title": "QUESTIONS TO ASK INTERVIEWER",
+        "key": "QUESTIONS TO ASK INTERVIEWER",
+        "block": "questions_to_ask",
+        "points": [
+            "Technical Questions (10+ questions)",
+            "Team & Culture Questions (10+ questions)",
+            "Growth & Development Questions (10+ questions)",
+            "Role-Specific Questions (10+ questions)",
+        ],
+        "inputs": ["job.basics", "job.role", "job.company"],
+    },
+    {
+        "title": "KEYWORDS & PHRASES",
+        "key": "KEYWORDS & PHRASES",
+        "block": "keywords_phrases",
+        "points": [
+            "Technical Keywords to Use",
+            "Industry-Specific Terms",
+            "Company Values to Reference",
+            "Action Verbs to Include",
+            "Metrics & Achievements to Highlight",
+        ],
+        "inputs": [
+            "job.requirements",
+            "job.role",
+            "job.company",
+            "resume.skills",
+            "resume.experience",
+        ],
+    },
+    {
+        "title": "RED FLAGS & CONCERNS",
+        "key": "RED FLAGS & CONCERNS",
+        "block": "red_flags",
+        "points": [
+            "Potential Weaknesses to Address",
+            "Gaps to Explain Proactively",
+            "Difficult Questions to Prepare For",
+            "Salary Negotiation Points",
+            "Timeline Concerns",
+        ],
+        "inputs": ["job", "resume"],
+    },
+    {
+        "title": "SUCCESS STRATEGIES",
+        "key": "SUCCESS STRATEGIES",
+        "block": "success_strategies",
+        "points": [
+            "Interview Day Preparation",
+            "Body Language Tips",
+            "Communication Style Adjustments",
+            "Follow-up Strategy",
+            "Negotiation Preparation",
+        ],
+        "inputs": ["job.basics", "job.company", "job.interview"],
+    },
+    {
+        "title": "COMPANY RESEARCH POINTS",
+        "key": "COMPANY RESEARCH POINTS",
+        "block": "company_research",
+        "points": [
+            "Recent Company News",
+            "Products/Services to Mention",
+            "Competitors to Reference",
+            "Industry Trends to Discuss",
+            "Company Culture Insights",
+        ],
+        "inputs": ["job.basics", "job.company"],
+    },
+    {
+        "title": "ROLE-SPECIFIC PREPARATION",
+        "key": "ROLE-SPECIFIC PREPARATION",
+        "block": "role_preparation",
+        "points": [
+            "Daily Responsibilities Understanding",
+            "Team Dynamics Preparation",
+            "Tools & Processes to Learn",
+            "Metrics & KPIs to Know",
+            "Challenges to Anticipate",
+        ],
+        "inputs": ["job.basics", "job.role", "job.requirements"],
+    },
+]
+
+# Section groups requested concurrently in sharded mode. The question banks are
+# by far the longest outputs, so they get a shard each; the rest are grouped so
+# every shard produces a similar number of output tokens.
+SECTION_SHARDS = {
+    "overview": ["EXECUTIVE SUMMARY", "SKILLS ANALYSIS", "RED FLAGS & CONCERNS"],
+    "introduction": ["PERSONALIZED INTRODUCTION STRATEGY", "BEHAVIORAL PREPARATION", "KEYWORDS & PHRASES"],
+    "interview_questions": ["INTERVIEW QUESTIONS BANK"],
+    "questions_to_ask": ["QUESTIONS TO ASK INTERVIEWER"],
+    "technical": ["TECHNICAL PREPARATION", "ROLE-SPECIFIC PREPARATION"],
+    "strategy": ["SUCCESS STRATEGIES", "COMPANY RESEARCH POINTS"],
+}
+
+_BY_TITLE = {section["title"]: section for section in REPORT_SECTIONS}
+
+
+def section_id(name: str) -> str:
+    """Section name reduced to its letters, so "RED FLAGS & CONCERNS" and "red_flags_concerns" match"""
+    return re.sub(r"[^A-Z]", "", name.upper())
+
+
+_BY_ID = {section_id(section["title"]): section for section in REPORT_SECTIONS}
+
+
+def find_section(name: str):
+    """The REPORT_SECTIONS entry a model-chosen top-level key refers to, or None"""
+    return _BY_ID.get(section_id(name))
+
+
+def section_field(data, section: str, field: str, default=None):
+    """data[section][field], or default when the model left either out or answered another type"""
+    values = data.get(section) if isinstance(data, dict) else None
+    return values.get(field, default) if isinstance(values, dict) else default
+
+
+def shard_sections(shard: str) -> list:
+    return [_BY_TITLE[title] for title in SECTION_SHARDS[shard]]
+
+
+def format_sections(sections: list) -> str:
+    """Numbered outline of sections and their points, as used in the analysis prompts"""
+    lines = []
+    for number, section in enumerate(sections, 1):
+        label = f"{number}. "
+        lines.append(f"{label}{section['title']}:")
+        lines.extend(f"{' ' * len(label)}- {point}" for point in section["points"])
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def merge_sections(results: list) -> dict:
+    """
+    Merge per-shard analysis dicts into one dict in report order. Keys the model
+    spelled differently are renamed to the key the template reads; unknown keys
+    are kept as returned, after the known sections.
+    """
+    known, extra = {}, {}
+    for result in results:
+        for key, value in result.items():
+            section = find_section(key)
+            if section:
+                known[section["key"]] = value
+            else:
+                extra[key] = value
+
+    merged = {
+        section["key"]: known[section["key"]]
+        for section in REPORT_SECTIONS
+        if section["key"] in known
+    }
+    merged.update(extra)
+    return merged
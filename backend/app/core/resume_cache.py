@@ -0,0 +1,78 @@
+# project-agentic-system-interview-report/backend/app/core/resume_cache.py
+import os
+import time
+import hashlib
+from backend.app.core.config import CACHE_DIR
+from backend.app.core.cache_db import get_connection
+
+RESUME_CACHE_DB = os.path.join(CACHE_DIR, "resume_cache.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+DROP TABLE IF EXISTS resume_texts;
+CREATE TABLE IF NOT EXISTS resume_extractions (
+    digest TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    text TEXT NOT NULL,
+    page_count INTEGER,
+    extraction_ms REAL NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (digest, extractor)
+);
+"""
+
+
+def file_digest(file_path: str, stat=None) -> str:
+    """
+    sha256 of the file contents. The digest is remembered per path together with
+    mtime and size, so unchanged files are not re-hashed on later lookups.
+    """
+    stat = stat or os.stat(file_path)
+    path = os.path.abspath(file_path)
+    conn = get_connection(RESUME_CACHE_DB, _SCHEMA)
+    row = conn.execute(
+        "SELECT digest FROM resume_files WHERE path = ? AND mtime_ns = ? AND size = ?",
+        (path, stat.st_mtime_ns, stat.st_size),
+    ).fetchone()
+    if row:
+        return row[0]
+
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    conn.execute(
+        "INSERT OR REPLACE INTO resume_files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+        (path, stat.st_mtime_ns, stat.st_size, digest),
+    )
+    return digest
+
+
+def get_extracted(digest: str, extractor: str):
+    """
+    Return the cached extraction for a content digest, or None. extractor names
+    the extraction code and its caps: text cut under other caps is not reused.
+    """
+    row = get_connection(RESUME_CACHE_DB, _SCHEMA).execute(
+        "SELECT text, page_count, extraction_ms FROM resume_extractions "
+        "WHERE digest = ? AND extractor = ?",
+        (digest, extractor),
+    ).fetchone()
+    if row is None:
+        return None
+    return {"text": row[0], "page_count": row[1], "extraction_ms": row[2]}
+
+
+def store_extracted(digest: str, extractor: str, text: str, page_count, extraction_ms: float):
+    get_connection(RESUME_CACHE_DB, _SCHEMA).execute(
+        "INSERT OR REPLACE INTO resume_extractions "
+        "(digest, extractor, text, page_count, extraction_ms, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (digest, extractor, text, page_count, extraction_ms, time.time()),
+    )
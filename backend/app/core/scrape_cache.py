@@ -0,0 +1,94 @@
+# project-agentic-system-interview-report/backend/app/core/scrape_cache.py
+import os
+import json
+import time
+import zlib
+import hashlib
+from backend.app.core.config import CACHE_DIR
+from backend.app.core.cache_db import get_connection
+
+SCRAPE_CACHE_DB = os.path.join(CACHE_DIR, "scrape_cache.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scraped_pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_sha256 TEXT NOT NULL,
+    body BLOB NOT NULL,
+    result TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    validated_at REAL NOT NULL
+);
+"""
+
+
+def get_cached_page(url: str):
+    """Return the cached entry for url (validators, body digest, parsed result) or None"""
+    row = get_connection(SCRAPE_CACHE_DB, _SCHEMA).execute(
+        "SELECT etag, last_modified, body_sha256, result, fetched_at "
+        "FROM scraped_pages WHERE url = ?",
+        (url,),
+    ).fetchone()
+    if row is None:
+        return None
+    return {
+        "etag": row[0],
+        "last_modified": row[1],
+        "body_sha256": row[2],
+        "result": json.loads(row[3]),
+        "fetched_at": row[4],
+    }
+
+
+def get_cached_body(url: str):
+    """Return the raw page body stored for url, or None"""
+    row = get_connection(SCRAPE_CACHE_DB, _SCHEMA).execute(
+        "SELECT body FROM scraped_pages WHERE url = ?", (url,)
+    ).fetchone()
+    return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+
+def conditional_headers(cached) -> dict:
+    """If-None-Match / If-Modified-Since headers for revalidating a cached page"""
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def body_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def store_page(url: str, etag, last_modified, digest: str, body: str, result: dict):
+    """Store a freshly downloaded page together with its cleaned, parsed result"""
+    now = time.time()
+    get_connection(SCRAPE_CACHE_DB, _SCHEMA).execute(
+        "INSERT OR REPLACE INTO scraped_pages "
+        "(url, etag, last_modified, body_sha256, body, result, fetched_at, validated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            url,
+            etag,
+            last_modified,
+            digest,
+            zlib.compress(body.encode("utf-8")),
+            json.dumps(result, ensure_ascii=False),
+            now,
+            now,
+        ),
+    )
+
+
+def mark_revalidated(url: str, etag=None, last_modified=None):
+    """Record that the cached copy of url is still current, refreshing its validators"""
+    get_connection(SCRAPE_CACHE_DB, _SCHEMA).execute(
+        "UPDATE scraped_pages SET validated_at = ?, "
+        "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+        "WHERE url = ?",
+        (time.time(), etag, last_modified, url),
+    )
@@ -0,0 +1,245 @@
+# project-agentic-system-interview-report/backend/app/core/section_store.py
+# Section-level results of the comprehensive analysis, stored per job/resume pair
+# with fingerprints of the inputs each section is written from (its "inputs" in
+# REPORT_SECTIONS). A rerun after a resume or job edit regenerates only the
+# sections whose inputs changed and reuses the stored values of the rest.
+import os
+import re
+import json
+import time
+import hashlib
+from backend.app.core.config import CACHE_DIR
+from backend.app.core.cache_db import get_connection
+from backend.app.core.metrics import counter
+from backend.app.core.report_sections import REPORT_SECTIONS, find_section, section_id
+
+SECTION_STORE_DB = os.path.join(CACHE_DIR, "analysis_sections.sqlite3")
+# Bump to invalidate every stored section (e.g. after a prompt change that the
+# section definitions in REPORT_SECTIONS do not show)
+SECTION_STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_sections (
+    pair TEXT NOT NULL,
+    section TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (pair, section)
+);
+"""
+
+ANALYSIS_SECTIONS = counter(
+    "analysis_sections_total",
+    "Comprehensive analysis sections reused from the section store or recomputed",
+    ("status",),
+)
+
+# Parts of the job analysis (top-level keys, matched like section keys)
+JOB_INPUTS = {
+    "job.basics": "BASIC_INFORMATION",
+    "job.requirements": "TECHNICAL_REQUIREMENTS",
+    "job.role": "ROLE_DETAILS",
+    "job.company": "COMPANY_INFORMATION",
+    "job.interview": "INTERVIEW_PREPARATION_INSIGHTS",
+    "job.candidate": "CANDIDATE_PROFILE",
+}
+# Added by the pipeline, not by the analysis: they change on every scrape
+JOB_METADATA_KEYS = {"scraped_at", "source_url", "duplicate_of"}
+
+# Resume headings, lowercased and reduced to letters and spaces
+RESUME_HEADINGS = {
+    "resume.summary": (
+        "summary", "professional summary", "career summary", "profile",
+        "professional profile", "objective", "career objective", "about me",
+    ),
+    "resume.experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience",
+    ),
+    "resume.skills": (
+        "skills", "technical skills", "core skills", "key skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools", "tools and technologies",
+    ),
+    "resume.education": ("education", "academic background", "education and training"),
+    "resume.projects": ("projects", "personal projects", "selected projects", "key projects"),
+    "resume.certifications": (
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses",
+    ),
+}
+_HEADING_PARTS = {
+    heading: part for part, headings in RESUME_HEADINGS.items() for heading in headings
+}
+# Other headings: a short line in capitals ("VOLUNTEERING", "LANGUAGES:")
+_OTHER_HEADING_RE = re.compile(r"^[A-Z][A-Z &/-]{2,40}:?$")
+
+
+def resume_parts(resume_text: str) -> dict:
+    """
+    Split resume text into {part: text} at its headings. Text under headings this
+    does not know, and the whole resume if it has no known heading at all, is
+    "resume.other"; the lines above the first heading (name, contact) "resume.contact".
+    """
+    parts, part = {}, None
+    for line in resume_text.splitlines():
+        stripped = line.strip()
+        heading = re.sub(r"[^a-z ]", "", stripped.lower().replace("&", " and "))
+        heading = " ".join(heading.split())
+        if len(stripped) <= 45 and heading in _HEADING_PARTS:
+            part = _HEADING_PARTS[heading]
+            continue
+        if part is not None and _OTHER_HEADING_RE.match(stripped):
+            part = "resume.other"
+            continue
+        parts.setdefault(part, []).append(stripped)
+
+    if set(parts) <= {None}:
+        return {"resume.other": " ".join(resume_text.split())}
+    contact = parts.pop(None, [])
+    parts = {name: " ".join(" ".join(lines).split()) for name, lines in parts.items()}
+    parts["resume.contact"] = " ".join(" ".join(contact).split())
+    return parts
+
+
+def job_parts(job_analysis: dict) -> dict:
+    """Split the job analysis into {part: value}; unknown top-level keys are "job.other" """
+    by_id = {section_id(key): name for name, key in JOB_INPUTS.items()}
+    parts = {}
+    for key, value in job_analysis.items():
+        if key in JOB_METADATA_KEYS:
+            continue
+        name = by_id.get(section_id(key))
+        if name:
+            parts[name] = value
+        else:
+            parts.setdefault("job.other", {})[key] = value
+    return parts
+
+
+def analysis_inputs(job_analysis: dict, resume_text: str) -> dict:
+    """{input name: fingerprint} of every part of the job analysis and the resume"""
+    parts = {**job_parts(job_analysis), **resume_parts(resume_text)}
+    return {name: fingerprint(value) for name, value in parts.items()}
+
+
+def fingerprint(value) -> str:
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def section_inputs(section: dict, inputs: dict) -> dict:
+    """
+    The fingerprints a section depends on. "job"/"resume" expand to all their
+    parts; parts that could not be told apart ("job.other", "resume.other") are
+    inputs of every section that reads the job or the resume.
+    """
+    names = set()
+    for name in section["inputs"]:
+        source = name.split(".")[0]
+        names.add(f"{source}.other")
+        if "." in name:
+            names.add(name)
+        else:
+            names.update(part for part in inputs if part.startswith(f"{source}."))
+    names.discard("resume.contact")
+    return {name: inputs.get(name, "") for name in sorted(names)}
+
+
+def section_fingerprint(section: dict, depends: dict) -> str:
+    return fingerprint(
+        {
+            "version": SECTION_STORE_VERSION,
+            "title": section["title"],
+            "points": section["points"],
+            "inputs": depends,
+        }
+    )
+
+
+def pair_key(job_url: str, resume_path: str) -> str:
+    return hashlib.sha256(f"{job_url}\n{resume_path}".encode("utf-8")).hexdigest()
+
+
+def plan_sections(job_url: str, resume_path: str, inputs: dict) -> tuple:
+    """
+    (reused, diff) for a new analysis of a job/resume pair. reused maps the key
+    of every section whose inputs are unchanged to its stored value; diff lists
+    each section as "reused", "recomputed" (with the inputs that changed) or
+    "new" (nothing stored yet).
+    """
+    conn = get_connection(SECTION_STORE_DB, _SCHEMA)
+    stored = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            "SELECT section, fingerprint, inputs, value FROM analysis_sections WHERE pair = ?",
+            (pair_key(job_url, resume_path),),
+        )
+    }
+
+    reused, sections = {}, []
+    for section in REPORT_SECTIONS:
+        depends = section_inputs(section, inputs)
+        entry = {"section": section["key"]}
+        previous = stored.get(section["key"])
+        if previous is None:
+            entry["status"] = "new"
+        elif previous[0] == section_fingerprint(section, depends):
+            entry["status"] = "reused"
+            reused[section["key"]] = json.loads(previous[2])
+        else:
+            old = json.loads(previous[1])
+            entry["status"] = "recomputed"
+            entry["changed_inputs"] = [
+                name for name, digest in depends.items() if old.get(name) != digest
+            ] or ["section definition"]
+        sections.append(entry)
+
+    diff = {
+        "reused": sum(1 for entry in sections if entry["status"] == "reused"),
+        "recomputed": sum(1 for entry in sections if entry["status"] != "reused"),
+        "changed_inputs": sorted(
+            {name for entry in sections for name in entry.get("changed_inputs", [])}
+        ),
+        "sections": sections,
+    }
+    ANALYSIS_SECTIONS.inc(diff["reused"], status="reused")
+    ANALYSIS_SECTIONS.inc(diff["recomputed"], status="recomputed")
+    return reused, diff
+
+
+def store_sections(job_url: str, resume_path: str, inputs: dict, analysis: dict):
+    """Store the known sections of an analysis with the fingerprints of their inputs"""
+    rows, now = [], time.time()
+    for key, value in analysis.items():
+        section = find_section(key)
+        if section is None:
+            continue
+        depends = section_inputs(section, inputs)
+        rows.append(
+            (
+                pair_key(job_url, resume_path),
+                section["key"],
+                section_fingerprint(section, depends),
+                json.dumps(depends),
+                json.dumps(value, ensure_ascii=False),
+                now,
+            )
+        )
+    get_connection(SECTION_STORE_DB, _SCHEMA).executemany(
+        "INSERT OR REPLACE INTO analysis_sections "
+        "(pair, section, fingerprint, inputs, value, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def format_section_diff(diff: dict) -> str:
+    """Human-readable diff report: one line per section"""
+    lines = [f"{diff['recomputed']} sections recomputed, {diff['reused']} reused"]
+    for entry in diff["sections"]:
+        line = f"  {entry['status']:<10} {entry['section']}"
+        if entry.get("changed_inputs"):
+            line += f" ({', '.join(entry['changed_inputs'])} changed)"
+        lines.append(line)
+    return "\n".join(lines)
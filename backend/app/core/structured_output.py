@@ -0,0 +1,208 @@
+# project-agentic-system-interview-report/backend/app/core/structured_output.py
+# JSON answers made of named sections (the job analysis, the resume analysis):
+# their JSON schemas for response_format, and completions that repair a broken
+# answer locally and re-request only the sections still missing, instead of
+# paying for the whole call again.
+from backend.app.core.config import MISSING_SECTION_RETRIES, STRUCTURED_OUTPUTS
+from backend.app.core.json_repair import parse_json_object
+from backend.app.core.llm_cache import chat_completion_text, chat_completion_text_async
+from backend.app.core.metrics import LLM_JSON_REPAIRS
+from backend.app.core.report_sections import section_id
+from backend.app.core.logging import logger
+
+# Top-level sections of the job analysis and the points each one covers
+JOB_ANALYSIS_SECTIONS = {
+    "BASIC_INFORMATION": [
+        "Job Title (exact title)",
+        "Company Name",
+        "Location (city, state, country, remote/hybrid/onsite)",
+        "Experience Level (entry/mid/senior/staff/principal)",
+        "Employment Type (full-time/part-time/contract)",
+        "Salary Range (if mentioned)",
+    ],
+    "TECHNICAL_REQUIREMENTS": [
+        "Required Skills (programming languages, frameworks, tools)",
+        "Nice-to-Have Skills (preferred but not mandatory)",
+        "Tools & Technologies (specific software, platforms, systems)",
+        "Certifications Required",
+        "Years of Experience Required",
+    ],
+    "ROLE_DETAILS": [
+        "Key Responsibilities (detailed list)",
+        "Daily Tasks",
+        "Team Structure (who they'll work with)",
+        "Reporting Structure",
+        "Growth Opportunities",
+    ],
+    "COMPANY_INFORMATION": [
+        "Company Size",
+        "Industry",
+        "Company Culture & Values",
+        "Mission Statement",
+        "Benefits & Perks",
+        "Work Environment",
+    ],
+    "INTERVIEW_PREPARATION_INSIGHTS": [
+        "Likely Technical Interview Topics",
+        "Behavioral Questions to Expect",
+        "Skills Assessment Areas",
+        "Portfolio/Project Requirements",
+        "Key Metrics/KPIs for Success",
+    ],
+    "CANDIDATE_PROFILE": [
+        "Ideal Candidate Description",
+        "Educational Requirements",
+        "Soft Skills Needed",
+        "Leadership Requirements",
+        "Communication Skills",
+    ],
+}
+
+MISSING_SECTIONS_PROMPT = (
+    "Create ONLY the following sections of the JSON analysis:\n\n{outline}\n\n"
+    "Use exactly these top-level keys: {keys}.\nReturn ONLY valid JSON format."
+)
+
+
+def report_section_points(sections: list) -> dict:
+    """{key: points} of REPORT_SECTIONS entries, the form the helpers below take"""
+    return {section["key"]: section["points"] for section in sections}
+
+
+def json_schema(sections: dict) -> dict:
+    """
+    JSON schema of an answer with the given top-level sections. Each section is
+    an object described by its points; what goes inside is left to the model
+    (the report template reads the keys models already use).
+    """
+    return {
+        "type": "object",
+        "properties": {
+            key: {"type": "object", "description": "; ".join(points)}
+            for key, points in sections.items()
+        },
+        "required": list(sections),
+    }
+
+
+def json_schema_format(name: str, sections: dict):
+    """response_format asking for the schema of sections, or None if disabled"""
+    if not STRUCTURED_OUTPUTS:
+        return None
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": json_schema(sections), "strict": False},
+    }
+
+
+def missing_sections(data: dict, sections: dict) -> dict:
+    """The sections (of the given {key: points}) that data has no value for"""
+    present = {section_id(key) for key, value in data.items() if value not in (None, "", {}, [])}
+    return {key: points for key, points in sections.items() if section_id(key) not in present}
+
+
+def missing_sections_messages(messages: list, sections: dict) -> list:
+    """
+    The original request plus a final message asking for just these sections,
+    so the provider can serve the shared prefix from its prompt cache
+    """
+    outline = "\n".join(
+        f"- {key}: {'; '.join(points)}" for key, points in sections.items()
+    )
+    keys = ", ".join(f'"{key}"' for key in sections)
+    return messages + [
+        {
+            "role": "user",
+            "content": MISSING_SECTIONS_PROMPT.format(outline=outline, keys=keys),
+        }
+    ]
+
+
+def complete_json(
+    client,
+    model: str,
+    messages: list,
+    temperature: float,
+    sections: dict,
+    name: str,
+    text: str = None,
+    retries: int = MISSING_SECTION_RETRIES,
+) -> dict:
+    """
+    Request a JSON answer with the given top-level sections ({key: points}) and
+    return it parsed, repaired locally if needed (json_repair). Sections that are
+    still missing are re-requested on their own, up to `retries` times; whatever
+    is missing after that is left out ({} if nothing could be recovered).
+    text, if given, is an answer already received for messages.
+    """
+    if text is None:
+        text = chat_completion_text(
+            client,
+            model,
+            messages,
+            temperature,
+            response_format=json_schema_format(name, sections),
+        )
+    data = parse_json_object(text)
+    for attempt in range(1, retries + 1):
+        missing = missing_sections(data, sections)
+        if not missing:
+            break
+        log_missing(name, missing, attempt)
+        text = chat_completion_text(
+            client,
+            model,
+            missing_sections_messages(messages, missing),
+            temperature,
+            response_format=json_schema_format(name, missing),
+        )
+        data.update(pick_sections(parse_json_object(text), missing))
+    return data
+
+
+async def complete_json_async(
+    async_client,
+    model: str,
+    messages: list,
+    temperature: float,
+    sections: dict,
+    name: str,
+    text: str = None,
+    retries: int = MISSING_SECTION_RETRIES,
+) -> dict:
+    """Async variant of complete_json"""
+    if text is None:
+        text = await chat_completion_text_async(
+            async_client,
+            model,
+            messages,
+            temperature,
+            response_format=json_schema_format(name, sections),
+        )
+    data = parse_json_object(text)
+    for attempt in range(1, retries + 1):
+        missing = missing_sections(data, sections)
+        if not missing:
+            break
+        log_missing(name, missing, attempt)
+        text = await chat_completion_text_async(
+            async_client,
+            model,
+            missing_sections_messages(messages, missing),
+            temperature,
+            response_format=json_schema_format(name, missing),
+        )
+        data.update(pick_sections(parse_json_object(text), missing))
+    return data
+
+
+def pick_sections(data: dict, sections: dict) -> dict:
+    wanted = {section_id(key) for key in sections}
+    return {key: value for key, value in data.items() if section_id(key) in wanted}
+
+
+def log_missing(name: str, missing: dict, attempt: int):
+    LLM_JSON_REPAIRS.inc(len(missing), outcome="rerequested")
+    logger.warning(
+        f"{name}: answer lacks {', '.join(missing)}; re-requesting only those (attempt {attempt})"
+    )
@@ -0,0 +1,125 @@
+# project-agentic-system-interview-report/backend/app/core/text_normalize.py
+import re
+from urllib.parse import urlparse
+
+# Job board boilerplate removed from every page. Only the phrase itself is
+# removed, matching the behaviour of the original lazy ".*?" patterns.
+NOISE_PHRASES = [
+    "Apply now",
+    "Click here",
+    "Powered by",
+    "©",
+    "All rights reserved",
+    "Privacy policy",
+    "Terms of service",
+    "Cookie policy",
+    "Subscribe",
+    "Follow us",
+    "Share this",
+    "Report this job",
+    "Save job",
+    "Email job",
+]
+
+# Extra phrases per job board, keyed by domain (subdomains match too)
+BOARD_NOISE_PHRASES = {
+    "linkedin.com": [
+        "Show more",
+        "Show less",
+        "Easy Apply",
+        "See who you know",
+        "Get notified about new",
+        "Sign in to",
+    ],
+    "indeed.com": ["Report job", "Not provided by employer", "Indeed's salary guide"],
+    "greenhouse.io": ["Apply for this job", "Submit application"],
+    "lever.co": ["Apply for this job"],
+    "myworkdayjobs.com": ["Apply manually", "Use my last application"],
+}
+
+# Compiled patterns by (board, flags)
+_patterns = {}
+
+
+def register_board_rules(domain: str, phrases: list):
+    """Add noise phrases for a job board; takes effect on the next normalization"""
+    BOARD_NOISE_PHRASES.setdefault(domain.lower(), []).extend(phrases)
+    _patterns.clear()
+
+
+def normalize_job_text(text: str, source_url: str = None) -> str:
+    """
+    Collapse whitespace, remove job board noise phrases and squash runs of
+    dots/dashes. All phrase and punctuation rules are compiled into a single
+    trie-shaped pattern and applied in one scan over a lowercased copy of the
+    text, instead of one case-insensitive re.sub per rule.
+    """
+    text = " ".join(text.split())
+    board = _board_for(source_url)
+
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters change length when lowercased; spans would not line up
+        return _apply(_pattern_for(board, re.IGNORECASE), text, text).strip()
+    return _apply(_pattern_for(board), text, lowered).strip()
+
+
+def _apply(pattern: re.Pattern, text: str, scan_text: str) -> str:
+    pieces = []
+    last = 0
+    for match in pattern.finditer(scan_text):
+        start, end = match.span()
+        pieces.append(text[last:start])
+        first = scan_text[start]
+        if first == ".":
+            pieces.append("...")
+        elif first == "-":
+            pieces.append("---")
+        last = end
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def _board_for(source_url: str) -> str:
+    if not source_url:
+        return ""
+    host = (urlparse(source_url).hostname or "").lower()
+    for domain in BOARD_NOISE_PHRASES:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return ""
+
+
+def _pattern_for(board: str, flags: int = 0) -> re.Pattern:
+    pattern = _patterns.get((board, flags))
+    if pattern is None:
+        phrases = NOISE_PHRASES + BOARD_NOISE_PHRASES.get(board, [])
+        source = _trie_pattern([phrase.lower() for phrase in phrases if phrase])
+        pattern = _patterns[(board, flags)] = re.compile(source + r"|\.{3,}|-{3,}", flags)
+    return pattern
+
+
+def _trie_pattern(phrases: list) -> str:
+    """
+    Build an alternation that shares common prefixes, e.g. ["save job", "share this"]
+    becomes "s(?:ave job|hare this)". The regex engine then rejects most positions
+    after a single character instead of trying every phrase.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A shorter phrase ends here; the longer continuation is optional
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
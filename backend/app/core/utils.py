@@ -1,87 +1,45 @@
 # project-agentic-system-interview-report/backend/app/core/utils.py
-import requests
-from bs4 import BeautifulSoup
-from docling.datamodel.document import DoclingDocument
+import asyncio
 from backend.app.core.logging import logger
-import re
+from backend.app.core.html_extract import decode_html, extract_job_text
+from backend.app.core.text_normalize import normalize_job_text
+from backend.app.core.config import SCRAPE_CACHE_ENABLED
+from backend.app.core.metrics import stage_timer
+from backend.app.core.scrape_cache import (
+    body_digest,
+    conditional_headers,
+    get_cached_page,
+    mark_revalidated,
+    store_page,
+)
 import time
 
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
 
 def scrape_job_description(url: str) -> dict:
     """
     Enhanced job posting scraper with better text extraction and cleaning.
     Uses multiple strategies to extract clean, relevant job description text.
     """
+    import requests
+
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-        }
-
-        resp = requests.get(url, headers=headers, timeout=30)
+        cached = get_cached_page(url) if SCRAPE_CACHE_ENABLED else None
+        resp = requests.get(
+            url, headers={**REQUEST_HEADERS, **conditional_headers(cached)}, timeout=30
+        )
+        if resp.status_code == 304 and cached:
+            return reuse_cached_page(url, cached, resp.headers)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Remove unwanted elements
-        for tag in soup(
-            ["script", "style", "noscript", "nav", "header", "footer", "aside"]
-        ):
-            tag.extract()
-
-        # Try to find job-specific content areas
-        job_content_selectors = [
-            '[class*="job-description"]',
-            '[class*="job-content"]',
-            '[class*="description"]',
-            '[class*="requirements"]',
-            '[class*="responsibilities"]',
-            '[id*="job-description"]',
-            '[id*="description"]',
-            "main",
-            "article",
-            ".content",
-        ]
-
-        job_text = ""
-        for selector in job_content_selectors:
-            elements = soup.select(selector)
-            if elements:
-                for element in elements:
-                    job_text += element.get_text() + "\n"
-                break
-
-        # If no specific job content found, use all text
-        if not job_text.strip():
-            job_text = soup.get_text()
-
-        # Clean and structure the text
-        cleaned_text = clean_job_text(job_text)
-
-        # Structure the data for DoclingDocument
-        doc_data = {
-            "name": "job_posting",
-            "content": cleaned_text,
-            "metadata": {
-                "source_url": url,
-                "content_type": "job_posting",
-                "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "text_length": len(cleaned_text),
-            },
-        }
-
-        doc = DoclingDocument(**doc_data)
-        structured_data = doc.dict()
-
-        return {
-            "job_description": cleaned_text,
-            "structured_data": structured_data,
-            "raw_text": job_text,
-            "url": url,
-        }
+        return parse_or_reuse(url, cached, resp.headers, resp.content)
 
     except requests.RequestException as e:
         logger.error(f"HTTP error while fetching URL {url}: {e}")
@@ -91,40 +49,109 @@ def scrape_job_description(url: str) -> dict:
         return {"error": str(e)}
 
 
-def clean_job_text(text: str) -> str:
+async def scrape_job_description_async(url: str, http_client=None) -> dict:
+    """
+    Async variant of scrape_job_description.
+    Fetches the page with httpx so the event loop stays free while waiting on the
+    network; HTML parsing and the scrape cache's SQLite reads and writes are
+    pushed to worker threads. http_client is an optional shared httpx.AsyncClient.
+    """
+    import httpx
+
+    try:
+        cached = await asyncio.to_thread(get_cached_page, url) if SCRAPE_CACHE_ENABLED else None
+        headers = {**REQUEST_HEADERS, **conditional_headers(cached)}
+        if http_client is None:
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                resp = await client.get(url, headers=headers, timeout=30)
+        else:
+            resp = await http_client.get(url, headers=headers, timeout=30)
+        if resp.status_code == 304 and cached:
+            return await asyncio.to_thread(reuse_cached_page, url, cached, resp.headers)
+        resp.raise_for_status()
+
+        return await asyncio.to_thread(
+            parse_or_reuse, url, cached, resp.headers, resp.content
+        )
+
+    except httpx.HTTPError as e:
+        logger.error(f"HTTP error while fetching URL {url}: {e}")
+        return {"error": f"HTTP error: {e}"}
+    except Exception as e:
+        logger.error(f"Error processing job description: {e}")
+        return {"error": str(e)}
+
+
+def reuse_cached_page(url: str, cached: dict, headers) -> dict:
+    """Serve a 304 Not Modified response from the scrape cache without parsing"""
+    logger.info(f"Scrape cache: {url} not modified, reusing cached result")
+    mark_revalidated(url, headers.get("ETag"), headers.get("Last-Modified"))
+    return cached["result"]
+
+
+def parse_or_reuse(url: str, cached, headers, content: bytes) -> dict:
+    """
+    Parse a 200 response, unless its body is byte-identical to the cached copy
+    (servers that ignore conditional requests), then store the result.
+    """
+    digest = body_digest(content)
+    if cached and cached["body_sha256"] == digest:
+        logger.info(f"Scrape cache: {url} body unchanged, reusing cached result")
+        mark_revalidated(url, headers.get("ETag"), headers.get("Last-Modified"))
+        return cached["result"]
+
+    html = decode_html(content, headers.get("Content-Type", ""))
+    result = parse_job_page(html, url)
+    if SCRAPE_CACHE_ENABLED:
+        store_page(
+            url,
+            headers.get("ETag"),
+            headers.get("Last-Modified"),
+            digest,
+            html,
+            result,
+        )
+    return result
+
+
+def parse_job_page(html: str, url: str) -> dict:
+    """
+    Extract, clean and structure the job description from a downloaded page.
+    """
+    with stage_timer("clean"):
+        job_text = extract_job_text(html)
+
+        # Clean and structure the text
+        cleaned_text = clean_job_text(job_text, url)
+
+    # Structure the data for DoclingDocument
+    doc_data = {
+        "name": "job_posting",
+        "content": cleaned_text,
+        "metadata": {
+            "source_url": url,
+            "content_type": "job_posting",
+            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "text_length": len(cleaned_text),
+        },
+    }
+
+    from docling.datamodel.document import DoclingDocument
+
+    doc = DoclingDocument(**doc_data)
+    structured_data = doc.dict()
+
+    return {
+        "job_description": cleaned_text,
+        "structured_data": structured_data,
+        "raw_text": job_text,
+        "url": url,
+    }
+
+
+def clean_job_text(text: str, source_url: str = None) -> str:
     """
     Clean and normalize job description text for better processing.
+    source_url selects the job board specific noise rules, if any.
     """
-    # Remove extra whitespace and normalize
-    text = re.sub(r"\s+", " ", text)
-
-    # Remove common job board noise
-    noise_patterns = [
-        r"Apply now.*?",
-        r"Click here.*?",
-        r"Powered by.*?",
-        r"©.*?",
-        r"All rights reserved.*?",
-        r"Privacy policy.*?",
-        r"Terms of service.*?",
-        r"Cookie policy.*?",
-        r"Subscribe.*?",
-        r"Follow us.*?",
-        r"Share this.*?",
-        r"Report this job.*?",
-        r"Save job.*?",
-        r"Email job.*?",
-    ]
-
-    for pattern in noise_patterns:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE | re.DOTALL)
-
-    # Remove excessive punctuation
-    text = re.sub(r"[.]{3,}", "...", text)
-    text = re.sub(r"[-]{3,}", "---", text)
-
-    # Clean up line breaks and spacing
-    text = re.sub(r"\n\s*\n", "\n\n", text)
-    text = text.strip()
-
-    return text
+    return normalize_job_text(text, source_url)
@@ -1,29 +1,182 @@
 # project-agentic-system-interview-report/backend/app/core/utils_agent2.py
 import os
-from docx import Document
-import pdfplumber
+import time
+import multiprocessing
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from backend.app.core.config import (
+    RESUME_CACHE_ENABLED,
+    PDF_MAX_PAGES,
+    PDF_MAX_TEXT_BYTES,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_WORKERS,
+)
+from backend.app.core.logging_agent2 import logger
+from backend.app.core.resume_cache import file_digest, get_extracted, store_extracted
+
+# Pages per task in parallel extraction: small enough that the text cap stops
+# the extraction early, large enough to amortize opening the PDF in each task
+PDF_RANGE_PAGES = 8
+# Part of the resume cache key: bump when a change alters the extracted text
+EXTRACTOR_VERSION = 1
+
+_pdf_pool = None
+
+def extract_text_from_pdf(
+    file_path: str, max_pages: int = PDF_MAX_PAGES, max_bytes: int = PDF_MAX_TEXT_BYTES
+) -> str:
+    return "".join(page_text + "\n" for page_text in iter_pdf_pages(file_path, max_pages, max_bytes))
+
+def iter_pdf_pages(
+    file_path: str, max_pages: int = PDF_MAX_PAGES, max_bytes: int = PDF_MAX_TEXT_BYTES
+):
+    """
+    Yield the text of each non-empty page as soon as it is extracted.
+    Stops after max_pages pages or once max_bytes of text has been produced.
+    """
+    import pdfplumber
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
+        if len(pdf.pages) > max_pages:
+            logger.warning(f"PDF page cap of {max_pages} reached: {file_path}")
+        page_texts = (page.extract_text() for page in pdf.pages[:max_pages])
+        yield from _cap_text((text for text in page_texts if text), max_bytes, file_path)
+
+def extract_text_from_pdf_parallel(
+    file_path: str,
+    workers: int = PDF_WORKERS,
+    max_pages: int = PDF_MAX_PAGES,
+    max_bytes: int = PDF_MAX_TEXT_BYTES,
+) -> tuple:
+    """
+    Extract a PDF with a process pool, in contiguous page ranges of at most
+    PDF_RANGE_PAGES pages. Returns (text, page_count). Ranges are consumed in
+    order with at most `workers` in flight, so no more are submitted once
+    max_bytes of text has been produced. Small documents are extracted
+    in-process because the pool hand-off costs more than it saves.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+    pages = min(page_count, max_pages)
+
+    if workers <= 1 or pages < PDF_PARALLEL_MIN_PAGES:
+        return extract_text_from_pdf(file_path, max_pages, max_bytes), page_count
+
+    if page_count > max_pages:
+        logger.warning(f"PDF page cap of {max_pages} reached: {file_path}")
+    step = min(-(-pages // workers), PDF_RANGE_PAGES)
+    ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+    page_texts = _iter_page_ranges(file_path, ranges, workers)
+    try:
+        text = "".join(
+            page_text + "\n" for page_text in _cap_text(page_texts, max_bytes, file_path)
+        )
+    finally:
+        page_texts.close()
+    return text, page_count
+
+def _iter_page_ranges(file_path: str, ranges: list, workers: int):
+    """Page texts of the ranges in order, keeping up to `workers` ranges in flight"""
+    pool = _get_pdf_pool(workers)
+    queued = iter(ranges)
+    pending = deque(
+        pool.submit(_extract_page_range, file_path, *page_range)
+        for page_range in islice(queued, workers)
+    )
+    try:
+        while pending:
+            chunk = pending.popleft().result()
+            for page_range in islice(queued, 1):
+                pending.append(pool.submit(_extract_page_range, file_path, *page_range))
+            yield from chunk
+    finally:
+        # Closed early (text cap reached): drop the ranges not started yet
+        for future in pending:
+            future.cancel()
+
+def _cap_text(page_texts, max_bytes: int, file_path: str):
+    produced = 0
+    for page_text in page_texts:
+        size = len(page_text.encode("utf-8"))
+        if produced + size > max_bytes:
+            logger.warning(f"PDF text cap of {max_bytes} bytes reached: {file_path}")
+            remainder = page_text.encode("utf-8")[: max_bytes - produced].decode("utf-8", "ignore")
+            if remainder:
+                yield remainder
+            return
+        produced += size
+        yield page_text
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list:
+    import pdfplumber
+
+    with pdfplumber.open(file_path, pages=list(range(start + 1, stop + 1))) as pdf:
+        return [text for text in (page.extract_text() for page in pdf.pages) if text]
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn, not fork: callers run inside threaded servers and asyncio.to_thread
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+def _extract_pdf(file_path: str) -> tuple:
+    return extract_text_from_pdf_parallel(
+        file_path, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_TEXT_BYTES
+    )
+
+def extractor_key() -> str:
+    """The extraction code and caps the cached text was produced with"""
+    return f"v{EXTRACTOR_VERSION}:pages={PDF_MAX_PAGES}:bytes={PDF_MAX_TEXT_BYTES}"
 
 def extract_text_from_docx(file_path: str) -> str:
+    from docx import Document
+
     doc = Document(file_path)
     text = "\n".join([para.text for para in doc.paragraphs])
     return text
 
 def read_resume(file_name: str, resume_dir: str) -> str:
+    return read_resume_with_info(file_name, resume_dir)["text"]
+
+def read_resume_with_info(file_name: str, resume_dir: str) -> dict:
+    """
+    Extract resume text along with page count and extraction time.
+    Results are cached by content digest and extractor_key(), so the same file
+    is only parsed once across jobs and agents; editing the file, raising a cap
+    or bumping EXTRACTOR_VERSION invalidates the entry.
+    """
     file_path = os.path.join(resume_dir, file_name)
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Resume file not found: {file_path}")
+    if not file_path.endswith((".pdf", ".docx")):
+        raise ValueError("Unsupported resume format. Only PDF or DOCX allowed.")
+
+    digest = file_digest(file_path) if RESUME_CACHE_ENABLED else None
+    extractor = extractor_key()
+    if digest:
+        cached = get_extracted(digest, extractor)
+        if cached is not None:
+            return {**cached, "digest": digest, "cached": True}
+
+    started = time.perf_counter()
     if file_path.endswith(".pdf"):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith(".docx"):
-        return extract_text_from_docx(file_path)
+        text, page_count = _extract_pdf(file_path)
     else:
-        raise ValueError("Unsupported resume format. Only PDF or DOCX allowed.")
+        text, page_count = extract_text_from_docx(file_path), None
+    extraction_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    if digest:
+        store_extracted(digest, extractor, text, page_count, extraction_ms)
+    return {
+        "text": text,
+        "page_count": page_count,
+        "extraction_ms": extraction_ms,
+        "digest": digest,
+        "cached": False,
+    }
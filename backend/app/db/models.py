@@ -0,0 +1,236 @@
+# project-agentic-system-interview-report/backend/app/db/models.py
+import os
+import time
+import hashlib
+from backend.app.core.config import ARTIFACT_COMPRESSION, REPORT_COMPRESSION, REPORT_STORE_DIR
+from backend.app.core.artifact_io import (
+    COMPRESSION_SUFFIXES,
+    compress,
+    compression_codec,
+    decompress,
+    dumps_json,
+    loads_json,
+    write_atomic,
+    write_atomic_stream,
+)
+from backend.app.core.cache_db import get_connection
+
+REPORT_STORE_DB = os.path.join(REPORT_STORE_DIR, "reports.sqlite3")
+BLOB_DIR = os.path.join(REPORT_STORE_DIR, "blobs")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    digest TEXT PRIMARY KEY,
+    extension TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_url TEXT,
+    job_url_hash TEXT,
+    resume_file TEXT,
+    resume_hash TEXT,
+    job_analysis TEXT REFERENCES artifacts (digest),
+    resume_analysis TEXT REFERENCES artifacts (digest),
+    html_report TEXT REFERENCES artifacts (digest),
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_job ON reports (job_url_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_resume ON reports (resume_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at);
+"""
+
+ARTIFACT_FIELDS = ("job_analysis", "resume_analysis", "html_report")
+
+_COLUMNS = (
+    "id",
+    "job_url",
+    "job_url_hash",
+    "resume_file",
+    "resume_hash",
+    "job_analysis",
+    "resume_analysis",
+    "html_report",
+    "created_at",
+)
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM reports"
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+
+def blob_path(digest: str, extension: str) -> str:
+    """Sharded location of an artifact: blobs/ab/cd/abcd....ext"""
+    return os.path.join(BLOB_DIR, digest[:2], digest[2:4], f"{digest}.{extension}")
+
+
+def put_artifact(data, extension: str = None) -> str:
+    """
+    Store an artifact under the sha256 of its bytes and return the digest.
+    dict/list values are stored as JSON (artifact_io encoding, compressed with
+    ARTIFACT_COMPRESSION), str as UTF-8. Identical artifacts are stored once;
+    writes go through a temporary file and an atomic rename, so concurrent
+    writers of the same artifact cannot leave a partial file.
+    """
+    compression = "none"
+    if isinstance(data, (dict, list)):
+        data = dumps_json(data)
+        extension = extension or "json"
+        compression = compression_codec(ARTIFACT_COMPRESSION)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    extension = (extension or "bin") + COMPRESSION_SUFFIXES[compression]
+
+    digest = hashlib.sha256(data).hexdigest()
+    existing = artifact_path(digest)
+    if existing and os.path.exists(existing):
+        return digest
+    path = blob_path(digest, extension)
+    if not os.path.exists(path):
+        write_atomic(path, compress(data, compression))
+
+    # REPLACE: a row whose file is gone may name another compression
+    get_connection(REPORT_STORE_DB, _SCHEMA).execute(
+        "INSERT OR REPLACE INTO artifacts (digest, extension, size, created_at) "
+        "VALUES (?, ?, ?, ?)",
+        (digest, extension, len(data), time.time()),
+    )
+    return digest
+
+
+def put_artifact_stream(chunks, extension: str, copy_compression: str = "none") -> str:
+    """
+    put_artifact for content produced as a stream of byte chunks (a rendered
+    report): the chunks are hashed while being written to a temporary file,
+    which is renamed to their digest path, so the content is never held in
+    memory as a whole. With copy_compression "gzip" or "zstd" a compressed copy
+    is stored as <path>.gz or <path>.zst.
+    """
+    digest = hashlib.sha256()
+
+    def hashed():
+        for chunk in chunks:
+            digest.update(chunk)
+            yield chunk
+
+    size = write_atomic_stream(
+        lambda: blob_path(digest.hexdigest(), extension),
+        hashed(),
+        copy_compression,
+        directory=BLOB_DIR,
+    )
+    digest = digest.hexdigest()
+    get_connection(REPORT_STORE_DB, _SCHEMA).execute(
+        "INSERT OR IGNORE INTO artifacts (digest, extension, size, created_at) VALUES (?, ?, ?, ?)",
+        (digest, extension, size, time.time()),
+    )
+    return digest
+
+
+def artifact_path(digest: str):
+    """File path of a stored artifact, or None if unknown"""
+    row = get_connection(REPORT_STORE_DB, _SCHEMA).execute(
+        "SELECT extension FROM artifacts WHERE digest = ?", (digest,)
+    ).fetchone()
+    return blob_path(digest, row[0]) if row else None
+
+
+def load_artifact(digest: str):
+    """Stored artifact contents: parsed JSON, text for html, bytes otherwise"""
+    path = artifact_path(digest)
+    if path is None:
+        return None
+    with open(path, "rb") as f:
+        data = decompress(f.read(), path)
+    name = path.removesuffix(".zst").removesuffix(".gz")
+    if name.endswith(".json"):
+        return loads_json(data)
+    if name.endswith(".html"):
+        return data.decode("utf-8")
+    return data
+
+
+def save_report(
+    job_url: str = None,
+    resume_file: str = None,
+    resume_hash: str = None,
+    job_analysis: dict = None,
+    resume_analysis: dict = None,
+    html_report=None,
+) -> dict:
+    """
+    Store the artifacts of one run and index them; returns the report record.
+    html_report is the HTML text or an iterable of UTF-8 byte chunks, which is
+    streamed into the store (plus a compressed copy with REPORT_GZIP).
+    """
+    if html_report is None or isinstance(html_report, str):
+        html_digest = put_artifact(html_report, "html") if html_report is not None else None
+    else:
+        html_digest = put_artifact_stream(html_report, "html", REPORT_COMPRESSION)
+    digests = {
+        "job_analysis": put_artifact(job_analysis) if job_analysis is not None else None,
+        "resume_analysis": put_artifact(resume_analysis) if resume_analysis is not None else None,
+        "html_report": html_digest,
+    }
+    conn = get_connection(REPORT_STORE_DB, _SCHEMA)
+    cursor = conn.execute(
+        "INSERT INTO reports (job_url, job_url_hash, resume_file, resume_hash, "
+        "job_analysis, resume_analysis, html_report, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            job_url,
+            url_hash(job_url) if job_url else None,
+            resume_file,
+            resume_hash,
+            digests["job_analysis"],
+            digests["resume_analysis"],
+            digests["html_report"],
+            time.time(),
+        ),
+    )
+    return get_report(cursor.lastrowid)
+
+
+def get_report(report_id: int):
+    """Report record by id, with artifact paths; None if unknown"""
+    conn = get_connection(REPORT_STORE_DB, _SCHEMA)
+    row = conn.execute(f"{_SELECT} WHERE id = ?", (report_id,)).fetchone()
+    return _record(row) if row else None
+
+
+def find_reports(
+    job_url: str = None, resume_hash: str = None, since: float = None, limit: int = 50
+) -> list:
+    """Newest first reports for a job URL and/or resume, using the indexes"""
+    conditions, params = [], []
+    if job_url:
+        conditions.append("job_url_hash = ?")
+        params.append(url_hash(job_url))
+    if resume_hash:
+        conditions.append("resume_hash = ?")
+        params.append(resume_hash)
+    if since:
+        conditions.append("created_at >= ?")
+        params.append(since)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    conn = get_connection(REPORT_STORE_DB, _SCHEMA)
+    rows = conn.execute(
+        f"{_SELECT}{where} ORDER BY created_at DESC, id DESC LIMIT ?", (*params, limit)
+    ).fetchall()
+    return [_record(row) for row in rows]
+
+
+def latest_report(job_url: str = None, resume_hash: str = None):
+    reports = find_reports(job_url=job_url, resume_hash=resume_hash, limit=1)
+    return reports[0] if reports else None
+
+
+def _record(row) -> dict:
+    record = dict(zip(_COLUMNS, row))
+    record["paths"] = {
+        field: artifact_path(record[field]) for field in ARTIFACT_FIELDS if record[field]
+    }
+    return record
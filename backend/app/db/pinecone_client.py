@@ -0,0 +1,402 @@
+# project-agentic-system-interview-report/backend/app/db/pinecone_client.py
+import io
+import os
+import json
+import threading
+import contextlib
+import numpy as np
+from backend.app.core.artifact_io import write_atomic
+from backend.app.core.config import EMBEDDING_DIM, VECTOR_BACKEND, VECTOR_INDEX_DIR
+from backend.app.core.logging import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not coordinated between processes
+    fcntl = None
+
+
+class _Namespace:
+    """Vectors, ids and metadata of one namespace, stored row-wise in NumPy arrays"""
+
+    def __init__(self, dim: int, quantize: bool):
+        self.dim = dim
+        self.quantize = quantize
+        self.ids = []
+        self.rows = {}
+        self.metadata = []
+        self.vectors = np.zeros((0, dim), dtype=np.int8 if quantize else np.float32)
+        self.scales = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def encode(self, values: np.ndarray):
+        """Rows as stored: float32, or int8 with a per-row scale"""
+        if not self.quantize:
+            return values, np.ones(len(values), dtype=np.float32)
+        scales = np.abs(values).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(values / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def decode(self, rows) -> np.ndarray:
+        return self.vectors[rows].astype(np.float32) * self.scales[rows, None]
+
+    def upsert(self, ids: list, values: np.ndarray, metadata: list):
+        encoded, scales = self.encode(values)
+        new = [i for i, vector_id in enumerate(ids) if vector_id not in self.rows]
+        size = len(self.ids) + len(new)
+        if size > len(self.vectors):
+            # Grow geometrically so repeated small upserts stay amortized O(1)
+            capacity = max(size, 2 * len(self.vectors), 64)
+            vectors = np.zeros((capacity, self.dim), dtype=self.vectors.dtype)
+            vectors[: len(self.ids)] = self.vectors[: len(self.ids)]
+            scale_rows = np.zeros(capacity, dtype=np.float32)
+            scale_rows[: len(self.ids)] = self.scales[: len(self.ids)]
+            self.vectors, self.scales = vectors, scale_rows
+
+        for i, vector_id in enumerate(ids):
+            row = self.rows.get(vector_id)
+            if row is None:
+                row = self.rows[vector_id] = len(self.ids)
+                self.ids.append(vector_id)
+                self.metadata.append(metadata[i])
+            else:
+                self.metadata[row] = metadata[i]
+            self.vectors[row] = encoded[i]
+            self.scales[row] = scales[i]
+
+    def delete(self, ids: list):
+        for vector_id in ids:
+            row = self.rows.pop(vector_id, None)
+            if row is None:
+                continue
+            # Move the last row into the hole
+            last = len(self.ids) - 1
+            if row != last:
+                moved = self.ids[last]
+                self.ids[row] = moved
+                self.metadata[row] = self.metadata[last]
+                self.vectors[row] = self.vectors[last]
+                self.scales[row] = self.scales[last]
+                self.rows[moved] = row
+            self.ids.pop()
+            self.metadata.pop()
+
+    def mask(self, filter: dict):
+        if not filter:
+            return None
+        return np.fromiter(
+            (matches_filter(meta, filter) for meta in self.metadata), dtype=bool, count=len(self)
+        )
+
+
+class LocalVectorIndex:
+    """
+    In-process vector index with the Pinecone Index interface (upsert, query,
+    fetch, delete, describe_index_stats), so retrieval code runs unchanged
+    against a hosted Pinecone index or fully offline.
+
+    Similarity is cosine/dot product over L2-normalized vectors. With quantize=True
+    vectors are stored as int8 with a per-vector scale (4x smaller, scores within
+    about 1% of float32). Batched queries are scored with one matrix product.
+
+    Several processes may write to the same file: changes since the last save
+    are kept and replayed onto the file's current contents under a file lock.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, quantize: bool = False, path: str = None):
+        self.dim = dim
+        self.quantize = quantize
+        self.path = path
+        self._namespaces = {}
+        self._changes = []  # (operation, namespace, ...) since the last load or save
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ns = self._namespaces[namespace] = _Namespace(self.dim, self.quantize)
+        return ns
+
+    def upsert(self, vectors: list, namespace: str = "") -> dict:
+        """vectors: dicts {"id", "values", "metadata"} or (id, values[, metadata]) tuples"""
+        ids, values, metadata = [], [], []
+        for item in vectors:
+            if isinstance(item, dict):
+                vector_id, vector, meta = item["id"], item["values"], item.get("metadata")
+            else:
+                vector_id, vector, meta = (tuple(item) + (None,))[:3]
+            ids.append(str(vector_id))
+            values.append(vector)
+            metadata.append(dict(meta or {}))
+        if not ids:
+            return {"upserted_count": 0}
+
+        values = np.asarray(values, dtype=np.float32).reshape(len(ids), self.dim)
+        with self._lock:
+            self._apply(("upsert", namespace, ids, values, metadata))
+        return {"upserted_count": len(ids)}
+
+    def _apply(self, change: tuple):
+        operation, namespace, *args = change
+        if operation == "upsert":
+            self._namespace(namespace).upsert(*args)
+        elif operation == "delete_all":
+            self._namespaces.pop(namespace, None)
+        elif namespace in self._namespaces:
+            self._namespaces[namespace].delete(*args)
+        if self.path:
+            self._changes.append(change)
+
+    def query(
+        self,
+        vector=None,
+        id: str = None,
+        top_k: int = 10,
+        filter: dict = None,
+        include_values: bool = False,
+        include_metadata: bool = False,
+        namespace: str = "",
+    ) -> dict:
+        """Top-k matches for one vector (or for a stored vector given by id)"""
+        if vector is None:
+            fetched = self.fetch([id], namespace=namespace)["vectors"]
+            if id not in fetched:
+                return {"matches": [], "namespace": namespace}
+            vector = fetched[id]["values"]
+        matches = self.query_batch(
+            [vector], top_k, filter, include_values, include_metadata, namespace
+        )[0]
+        return {"matches": matches, "namespace": namespace}
+
+    def query_batch(
+        self,
+        vectors,
+        top_k: int = 10,
+        filter: dict = None,
+        include_values: bool = False,
+        include_metadata: bool = False,
+        namespace: str = "",
+    ) -> list:
+        """Top-k matches for each row of vectors, scored in a single matrix product"""
+        queries = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None or not len(ns):
+                return [[] for _ in queries]
+            count = len(ns)
+            scores = (ns.vectors[:count].astype(np.float32) @ queries.T) * ns.scales[:count, None]
+            mask = ns.mask(filter)
+            if mask is not None:
+                scores[~mask] = -np.inf
+
+            k = min(top_k, count)
+            top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            results = []
+            for column in range(len(queries)):
+                rows = top[:, column]
+                rows = rows[np.argsort(-scores[rows, column], kind="stable")]
+                matches = []
+                for row in rows:
+                    score = scores[row, column]
+                    if score == -np.inf:
+                        break
+                    match = {"id": ns.ids[row], "score": float(score)}
+                    if include_values:
+                        match["values"] = ns.decode([row])[0].tolist()
+                    if include_metadata:
+                        match["metadata"] = dict(ns.metadata[row])
+                    matches.append(match)
+                results.append(matches)
+            return results
+
+    def fetch(self, ids: list, namespace: str = "") -> dict:
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            vectors = {}
+            for vector_id in ids:
+                row = ns.rows.get(vector_id) if ns else None
+                if row is not None:
+                    vectors[vector_id] = {
+                        "id": vector_id,
+                        "values": ns.decode([row])[0].tolist(),
+                        "metadata": dict(ns.metadata[row]),
+                    }
+        return {"vectors": vectors, "namespace": namespace}
+
+    def delete(
+        self, ids: list = None, delete_all: bool = False, namespace: str = "", filter: dict = None
+    ) -> dict:
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None:
+                return {}
+            if delete_all:
+                self._apply(("delete_all", namespace))
+            elif filter:
+                mask = ns.mask(filter)
+                self._apply(("delete", namespace, [ns.ids[row] for row in np.flatnonzero(mask)]))
+            else:
+                self._apply(("delete", namespace, [str(vector_id) for vector_id in ids or []]))
+        return {}
+
+    def describe_index_stats(self) -> dict:
+        with self._lock:
+            namespaces = {
+                name: {"vector_count": len(ns)} for name, ns in self._namespaces.items()
+            }
+        return {
+            "dimension": self.dim,
+            "namespaces": namespaces,
+            "total_vector_count": sum(ns["vector_count"] for ns in namespaces.values()),
+        }
+
+    def save(self, path: str = None):
+        """
+        Write the index to an .npz file (atomically replaced). Saving to the
+        index's own path first reloads the file, holding its lock, and replays
+        this process' changes onto it, so other writers' vectors are kept.
+        """
+        path = path or self.path
+        if path != self.path:
+            self._write(path)
+            return
+        with _file_lock(path), self._lock:
+            changes, self._changes = self._changes, []
+            try:
+                if os.path.exists(path):
+                    self.load(path)
+                for change in changes:
+                    self._apply(change)
+                self._write(path)
+            except BaseException:
+                self._changes = changes  # replayed again by the next save
+                raise
+            self._changes = []
+
+    def _write(self, path: str):
+        arrays = {}
+        with self._lock:
+            layout = {}
+            for index, (name, ns) in enumerate(self._namespaces.items()):
+                count = len(ns)
+                arrays[f"vectors_{index}"] = ns.vectors[:count]
+                arrays[f"scales_{index}"] = ns.scales[:count]
+                layout[name] = {"key": index, "ids": ns.ids, "metadata": ns.metadata}
+            arrays["layout"] = np.array(
+                json.dumps({"dim": self.dim, "quantize": self.quantize, "namespaces": layout})
+            )
+
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        write_atomic(path, buffer.getbuffer())
+
+    def load(self, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            layout = json.loads(str(data["layout"]))
+            if layout["dim"] != self.dim:
+                raise ValueError(f"Index {path} has dimension {layout['dim']}, expected {self.dim}")
+            with self._lock:
+                self._namespaces = {}
+                self._changes = []
+                for name, entry in layout["namespaces"].items():
+                    ns = _Namespace(self.dim, layout["quantize"])
+                    ns.vectors = data[f"vectors_{entry['key']}"].copy()
+                    ns.scales = data[f"scales_{entry['key']}"].copy()
+                    ns.ids = list(entry["ids"])
+                    ns.metadata = list(entry["metadata"])
+                    ns.rows = {vector_id: row for row, vector_id in enumerate(ns.ids)}
+                    if ns.quantize != self.quantize:
+                        values = ns.decode(np.arange(len(ns)))
+                        ns.quantize = self.quantize
+                        ns.vectors, ns.scales = ns.encode(values)
+                    self._namespaces[name] = ns
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """Exclusive lock on path.lock, held across processes (no-op without fcntl)"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def matches_filter(metadata: dict, filter: dict) -> bool:
+    """
+    Evaluate a Pinecone metadata filter: {"field": value}, {"field": {"$eq"|"$ne"|
+    "$in"|"$nin"|"$gt"|"$gte"|"$lt"|"$lte": ...}}, "$and" / "$or" lists. A list
+    valued field matches if any of its items does.
+    """
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, part) for part in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, part) for part in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        values = value if isinstance(value, list) else [value]
+        operators = condition if isinstance(condition, dict) else {"$eq": condition}
+        for operator, operand in operators.items():
+            if not _compare(operator, values, operand):
+                return False
+    return True
+
+
+def _compare(operator: str, values: list, operand) -> bool:
+    if operator == "$eq":
+        return operand in values
+    if operator == "$ne":
+        return operand not in values
+    if operator == "$in":
+        return any(value in operand for value in values)
+    if operator == "$nin":
+        return not any(value in operand for value in values)
+    present = [value for value in values if isinstance(value, (int, float))]
+    if operator == "$gt":
+        return any(value > operand for value in present)
+    if operator == "$gte":
+        return any(value >= operand for value in present)
+    if operator == "$lt":
+        return any(value < operand for value in present)
+    if operator == "$lte":
+        return any(value <= operand for value in present)
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(name: str, quantize: bool = False):
+    """
+    The vector index called name. With VECTOR_BACKEND=pinecone this is a hosted
+    Pinecone index (needs the pinecone package and PINECONE_API_KEY); otherwise a
+    LocalVectorIndex persisted to VECTOR_INDEX_DIR/<name>.npz.
+    """
+    with _indexes_lock:
+        index = _indexes.get(name)
+        if index is None:
+            if VECTOR_BACKEND == "pinecone":
+                from pinecone import Pinecone
+
+                index = Pinecone(api_key=os.getenv("PINECONE_API_KEY")).Index(name)
+            else:
+                path = os.path.join(VECTOR_INDEX_DIR, f"{name}.npz")
+                index = LocalVectorIndex(quantize=quantize, path=path)
+                count = index.describe_index_stats()["total_vector_count"]
+                logger.info(f"Vector index {name}: {count} vectors")
+            _indexes[name] = index
+        return index
@@ -0,0 +1,274 @@
+# project-agentic-system-interview-report/backend/app/db/question_bank.py
+# Interview question bank backed by the vector index: questions from past
+# reports (and curated imports) are tagged by category, skill and seniority and
+# retrieved for new jobs, so most of a report's question bank no longer has to
+# be generated.
+import re
+import json
+import glob
+import hashlib
+import argparse
+import threading
+from backend.app.core.config import (
+    QUESTION_INDEX_QUANTIZE,
+    QUESTION_MIN_PER_CATEGORY,
+    QUESTION_MIN_SCORE,
+)
+from backend.app.core.embeddings import embed
+from backend.app.core.artifact_io import read_json
+from backend.app.core.report_sections import section_id
+from backend.app.core.logging import logger
+from backend.app.db.pinecone_client import get_index
+
+QUESTION_INDEX = "interview-questions"
+
+# Categories that can be filled by retrieval, with the number of questions the
+# analysis prompt asks for. Company-specific questions are always generated.
+RETRIEVABLE_CATEGORIES = {
+    "Technical Questions": 20,
+    "Behavioral Questions": 15,
+    "Role-Specific Questions": 10,
+    "Situational Questions": 10,
+}
+# Categories that are not about the job's skills; their questions are ranked by
+# similarity but need no minimum score
+GENERIC_CATEGORIES = {"Behavioral Questions", "Situational Questions"}
+
+SENIORITY_LEVELS = [
+    ("principal", "principal"),
+    ("staff", "staff"),
+    ("lead", "senior"),
+    ("senior", "senior"),
+    ("mid", "mid"),
+    ("intermediate", "mid"),
+    ("junior", "entry"),
+    ("entry", "entry"),
+    ("intern", "entry"),
+]
+
+_CATEGORY_IDS = {section_id(name): name for name in RETRIEVABLE_CATEGORIES}
+_BANK_ID = section_id("INTERVIEW QUESTIONS BANK")
+
+_save_lock = threading.Lock()
+
+
+def question_index():
+    return get_index(QUESTION_INDEX, quantize=QUESTION_INDEX_QUANTIZE)
+
+
+def question_id(text: str) -> str:
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:20]
+
+
+def lookup(data: dict, *names):
+    """data[name] for the first name present, ignoring case, spaces and punctuation"""
+    if not isinstance(data, dict):
+        return None
+    by_id = {section_id(key): value for key, value in data.items()}
+    for name in names:
+        value = by_id.get(section_id(name))
+        if value is not None:
+            return value
+    return None
+
+
+def seniority_of(job_analysis: dict) -> str:
+    level = lookup(lookup(job_analysis, "BASIC_INFORMATION") or {}, "Experience_Level")
+    text = str(level or "").lower()
+    for keyword, seniority in SENIORITY_LEVELS:
+        if keyword in text:
+            return seniority
+    return "any"
+
+
+def job_skills(job_analysis: dict) -> list:
+    requirements = lookup(job_analysis, "TECHNICAL_REQUIREMENTS") or {}
+    skills = []
+    for name in ("Required_Skills", "Tools_Technologies", "Nice_to_Have_Skills"):
+        value = lookup(requirements, name)
+        if isinstance(value, list):
+            skills.extend(str(skill).strip().lower() for skill in value if skill)
+    return list(dict.fromkeys(skills))[:30]
+
+
+def job_query_text(job_analysis: dict) -> str:
+    """What a job's questions should be about: title, skills and responsibilities"""
+    basic = lookup(job_analysis, "BASIC_INFORMATION") or {}
+    role = lookup(job_analysis, "ROLE_DETAILS") or {}
+    responsibilities = lookup(role, "Key_Responsibilities")
+    parts = [str(lookup(basic, "Job_Title") or "")]
+    parts.extend(job_skills(job_analysis))
+    if isinstance(responsibilities, list):
+        parts.extend(str(item) for item in responsibilities[:10])
+    return "\n".join(part for part in parts if part)
+
+
+def index_questions(
+    questions: list, category: str, skills: list = (), seniority: str = "any", source: str = ""
+) -> int:
+    """
+    Add questions to the index. A question already present keeps its id; its
+    skill tags are merged with the new ones.
+    """
+    questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()]
+    if not questions:
+        return 0
+
+    index = question_index()
+    ids = [question_id(q) for q in questions]
+    existing = index.fetch(ids)["vectors"]
+    vectors = embed(questions)
+    items = []
+    for vector_id, text, vector in zip(ids, questions, vectors):
+        old = existing.get(vector_id, {}).get("metadata", {})
+        items.append(
+            {
+                "id": vector_id,
+                "values": vector.tolist(),
+                "metadata": {
+                    "text": text,
+                    "category": category,
+                    "skills": sorted(set(old.get("skills", [])) | set(skills)),
+                    "seniority": old.get("seniority", seniority),
+                    "source": old.get("source", source),
+                },
+            }
+        )
+    index.upsert(items)
+    return len(items)
+
+
+def index_question_bank(analysis: dict, job_analysis: dict = None, source: str = "") -> int:
+    """Index the retrievable categories of an analysis' INTERVIEW QUESTIONS BANK"""
+    bank = lookup(analysis, "INTERVIEW QUESTIONS BANK")
+    if not isinstance(bank, dict):
+        return 0
+
+    skills = job_skills(job_analysis or {})
+    seniority = seniority_of(job_analysis or {})
+    added = 0
+    for key, questions in bank.items():
+        category = _CATEGORY_IDS.get(section_id(key))
+        if category and isinstance(questions, list):
+            added += index_questions(questions, category, skills, seniority, source)
+    if added:
+        save_question_index()
+        logger.info(f"Indexed {added} interview questions from {source or 'analysis'}")
+    return added
+
+
+def save_question_index():
+    index = question_index()
+    if getattr(index, "path", None):  # hosted indexes persist on their own
+        with _save_lock:
+            index.save()
+
+
+def retrieve_question_bank(job_analysis: dict, min_per_category: int = QUESTION_MIN_PER_CATEGORY):
+    """
+    Questions for every retrievable category, ranked by similarity to the job
+    (same seniority preferred). Returns {category: [question, ...]} or None when
+    the index cannot supply min_per_category good matches for each category,
+    in which case the whole bank should be generated. In skill-dependent
+    categories a match counts only if it scores at least QUESTION_MIN_SCORE and,
+    when the job lists skills, was tagged with one of them.
+    """
+    index = question_index()
+    if not index.describe_index_stats()["total_vector_count"]:
+        return None
+
+    query = embed([job_query_text(job_analysis)])[0].tolist()
+    seniority = seniority_of(job_analysis)
+    skills = set(job_skills(job_analysis))
+    bank = {}
+    for category, wanted in RETRIEVABLE_CATEGORIES.items():
+        filters = [{"category": category}]
+        if seniority != "any":
+            filters.insert(0, {"category": category, "seniority": {"$in": [seniority, "any"]}})
+
+        generic = category in GENERIC_CATEGORIES
+        min_score = -1.0 if generic else QUESTION_MIN_SCORE
+        for filter in filters:
+            matches = index.query(
+                vector=query, top_k=wanted, filter=filter, include_metadata=True
+            )["matches"]
+            questions = [
+                match["metadata"]["text"]
+                for match in matches
+                if match["score"] >= min_score
+                and (generic or not skills or skills & set(match["metadata"]["skills"]))
+            ]
+            if len(questions) >= min_per_category:
+                break
+        if len(questions) < min_per_category:
+            logger.info(
+                f"Question retrieval: only {len(questions)} {category}; generating the bank"
+            )
+            return None
+        bank[category] = questions
+
+    logger.info(
+        f"Question retrieval: {sum(len(q) for q in bank.values())} questions from the index"
+    )
+    return bank
+
+
+def reduce_bank_section(section: dict, retrieved: dict) -> dict:
+    """The INTERVIEW QUESTIONS BANK prompt section without the retrieved categories"""
+    retrieved_ids = {section_id(category) for category in retrieved}
+    points = [
+        point
+        for point in section["points"]
+        if section_id(point.split("(")[0]) not in retrieved_ids
+    ]
+    return {**section, "points": points}
+
+
+def merge_question_bank(analysis: dict, retrieved: dict) -> dict:
+    """Put the retrieved categories into the analysis' question bank"""
+    if not retrieved or not isinstance(analysis, dict):
+        return analysis
+    key = next((key for key in analysis if section_id(key) == _BANK_ID), "INTERVIEW QUESTIONS BANK")
+    bank = analysis.get(key)
+    if not isinstance(bank, dict):
+        bank = {}
+    analysis[key] = {**retrieved, **bank}
+    return analysis
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the interview question index.")
+    parser.add_argument(
+        "--import",
+        dest="imports",
+        nargs="*",
+        default=[],
+        help="Analysis JSON files (globs allowed) whose question banks are indexed",
+    )
+    parser.add_argument("--job", help="Job analysis JSON used to tag imported questions")
+    parser.add_argument("--query", help="Show the closest questions for a text")
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    job_analysis = None
+    if args.job:
+        job_analysis = read_json(args.job)
+    for pattern in args.imports:
+        for path in sorted(glob.glob(pattern)):
+            count = index_question_bank(read_json(path), job_analysis, source=path)
+            print(f"{path}: {count} questions")
+
+    if args.query:
+        vector = embed([args.query])[0].tolist()
+        for match in question_index().query(
+            vector=vector, top_k=args.top_k, include_metadata=True
+        )["matches"]:
+            meta = match["metadata"]
+            print(f"{match['score']:.3f}  [{meta['category']}] {meta['text']}")
+
+    print(json.dumps(question_index().describe_index_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,197 @@
-from fastapi import FastAPI
+import os
+import json
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from backend.app.core.config_agent2 import (
+    RESUME_DIR,
+    BATCH_CONCURRENCY,
+    JOB_WORKERS,
+    JOB_QUEUE_MAX,
+    JOB_HISTORY_LIMIT,
+)
+from backend.app.core.job_queue import JobQueue, QueueFull, SUCCEEDED
+from backend.app.core.metrics import render_metrics
+from backend.app.core.llm_gateway import PRIORITY_INTERACTIVE, llm_priority
+from backend.app.db.models import get_report
+from backend.app.agents.agent1_job_analysis import process_job_url
+from backend.app.agents.agent2_question_retrieval import generate_resume_analysis
+from backend.app.agents.batch_report_agent import generate_batch_reports_async, list_resumes
+from backend.app.agents.enhanced_comprehensive_agent import (
+    generate_comprehensive_report,
+    stream_comprehensive_report,
+)
+
 app = FastAPI()
 
+jobs = JobQueue(
+    handlers={
+        "job-analysis": process_job_url,
+        "resume-analysis": generate_resume_analysis,
+        "comprehensive-report": generate_comprehensive_report,
+    },
+    workers=JOB_WORKERS,
+    max_queued=JOB_QUEUE_MAX,
+    history_limit=JOB_HISTORY_LIMIT,
+)
+
+
+class BatchReportRequest(BaseModel):
+    job_url: str
+    resume_dir: str = ""  # subdirectory of data/resumes; empty means data/resumes itself
+    concurrency: int = BATCH_CONCURRENCY
+
+
+class JobAnalysisRequest(BaseModel):
+    job_url: str
+
+
+class ResumeAnalysisRequest(BaseModel):
+    job_desc_file: str  # file in data/job_descriptions
+    resume_file: str  # file in data/resumes
+
+
+class ComprehensiveReportRequest(BaseModel):
+    job_url: str
+    resume_file: str  # file in data/resumes
+
+
+def check_file_name(name: str, field: str):
+    """Reject anything but a bare file name, so requests cannot leave the data directories"""
+    if not name or os.path.basename(name) != name or name in (".", ".."):
+        raise HTTPException(status_code=400, detail=f"{field} must be a file name")
+
+
 @app.get("/")
 def root():
     return {"message": "Agent1 running locally"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Stage latencies, LLM requests and token usage in the Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/batch-reports")
+async def batch_reports(request: BatchReportRequest):
+    """Analyze the job once and screen every resume in the directory against it"""
+    resume_root = os.path.realpath(RESUME_DIR)
+    resume_dir = os.path.realpath(os.path.join(resume_root, request.resume_dir))
+    if os.path.commonpath([resume_root, resume_dir]) != resume_root:
+        raise HTTPException(status_code=400, detail="resume_dir must be inside data/resumes")
+    if request.concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be at least 1")
+    if not list_resumes(resume_dir):
+        raise HTTPException(
+            status_code=404, detail=f"No PDF or DOCX resumes found in {request.resume_dir!r}"
+        )
+
+    result = await generate_batch_reports_async(
+        request.job_url, resume_dir, concurrency=request.concurrency
+    )
+    if "error" in result:
+        raise HTTPException(status_code=502, detail=result["error"])
+    return result
+
+
+@app.get("/reports/stream")
+async def stream_report(job_url: str, resume_file: str):
+    """
+    Server-Sent Events stream of a comprehensive report: one "section" event with
+    rendered HTML per report block as soon as it is generated, then "done" or "error".
+    """
+    check_file_name(resume_file, "resume_file")
+
+    async def events():
+        # Someone is watching this one: admit its LLM calls ahead of queued work
+        with llm_priority(PRIORITY_INTERACTIVE):
+            async for event, data in stream_comprehensive_report(job_url, resume_file):
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/reports/{report_id}/html")
+def report_html(report_id: int, request: Request):
+    """
+    A stored HTML report, streamed from disk. The compressed copy written with
+    REPORT_GZIP=1 is sent as-is to clients that accept its encoding.
+    """
+    report = get_report(report_id)
+    path = (report or {}).get("paths", {}).get("html_report")
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Unknown report")
+
+    headers = {"Vary": "Accept-Encoding"}
+    accepted = request.headers.get("accept-encoding", "")
+    for encoding, suffix in (("zstd", ".zst"), ("gzip", ".gz")):
+        if encoding in accepted and os.path.exists(path + suffix):
+            path += suffix
+            headers["Content-Encoding"] = encoding
+            break
+    return FileResponse(path, media_type="text/html; charset=utf-8", headers=headers)
+
+
+def submit_job(kind: str, **params) -> dict:
+    try:
+        return jobs.submit(kind, **params)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Job queue is full: {e}")
+
+
+@app.post("/jobs/job-analysis", status_code=202)
+def submit_job_analysis(request: JobAnalysisRequest):
+    """Queue agent 1: scrape and analyze a job posting"""
+    return submit_job("job-analysis", job_url=request.job_url)
+
+
+@app.post("/jobs/resume-analysis", status_code=202)
+def submit_resume_analysis(request: ResumeAnalysisRequest):
+    """Queue agent 2: analyze a resume against a saved job description"""
+    check_file_name(request.job_desc_file, "job_desc_file")
+    check_file_name(request.resume_file, "resume_file")
+    return submit_job(
+        "resume-analysis", job_desc_file=request.job_desc_file, resume_file=request.resume_file
+    )
+
+
+@app.post("/jobs/comprehensive-report", status_code=202)
+def submit_comprehensive_report(request: ComprehensiveReportRequest):
+    """Queue the complete workflow: job analysis, resume analysis and HTML report"""
+    check_file_name(request.resume_file, "resume_file")
+    return submit_job(
+        "comprehensive-report", job_url=request.job_url, resume_file=request.resume_file
+    )
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    status = jobs.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return status
+
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    """Result of a finished job; 409 while it is still queued or running, or if it failed"""
+    found = jobs.result(job_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    status, result = found
+    if status["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=status)
+    return result
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    status = jobs.cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return status
@@ -0,0 +1,138 @@
+# project-agentic-system-interview-report/backend/benchmarks/bench_artifact_write.py
+# Throughput of writing report artifacts (a job analysis and a comprehensive
+# analysis per report): the legacy json.dump(indent=4) straight to the final path
+# against artifact_io with each compression and fsync policy, plus read-back.
+#
+#   python -m backend.benchmarks.bench_artifact_write [--reports N] [--threads N]
+
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from backend.app.core import artifact_io
+from backend.benchmarks.openai_stub import ANALYSIS_FILE, JOB_ANALYSIS_FILE
+
+
+def legacy_write(path: str, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    return path
+
+
+def legacy_read(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sample_reports(count: int) -> list:
+    """count (job_analysis, analysis) pairs that differ slightly, like real reports"""
+    with open(JOB_ANALYSIS_FILE, "r", encoding="utf-8") as f:
+        job_analysis = json.load(f)
+    with open(ANALYSIS_FILE, "r", encoding="utf-8") as f:
+        analysis = json.load(f)
+    return [
+        ({**job_analysis, "source_url": f"https://jobs.example.com/{i}"},
+         {**analysis, "report": {"id": i, "resume_file": f"resume_{i}.pdf"}})
+        for i in range(count)
+    ]
+
+
+def run_variant(name: str, write, read, reports: list, directory: str, threads: int) -> dict:
+    os.makedirs(directory, exist_ok=True)
+
+    def write_report(item):
+        i, (job_analysis, analysis) = item
+        started = time.perf_counter()
+        paths = (
+            write(os.path.join(directory, f"{i}_job_analysis.json"), job_analysis),
+            write(os.path.join(directory, f"{i}_comprehensive_analysis.json"), analysis),
+        )
+        return time.perf_counter() - started, paths
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+        results = list(pool.map(write_report, enumerate(reports)))
+    write_s = time.perf_counter() - started
+
+    paths = [path for _, written in results for path in written]
+    started = time.perf_counter()
+    for path in paths:
+        read(path)
+    read_s = time.perf_counter() - started
+
+    disk_bytes = sum(os.path.getsize(path) for path in paths)
+    latencies = sorted(duration for duration, _ in results)
+    return {
+        "variant": name,
+        "reports_per_s": round(len(reports) / write_s, 1),
+        "write_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 3),
+            "p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+        },
+        "read_reports_per_s": round(len(reports) / read_s, 1),
+        "kb_per_report": round(disk_bytes / len(reports) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report artifact writing.")
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent writers")
+    parser.add_argument(
+        "--compression", nargs="*", default=["none", "gzip", "zstd"], help="Compressions to run"
+    )
+    parser.add_argument(
+        "--fsync", nargs="*", default=["none", "file"], help="fsync policies to run"
+    )
+    parser.add_argument("--dir", default=None, help="Directory to write in (default: a temp dir)")
+    parser.add_argument("--output", default=None, help="Also save the results to this JSON file")
+    args = parser.parse_args()
+
+    reports = sample_reports(args.reports)
+    root = args.dir or tempfile.mkdtemp(prefix="bench_artifacts_")
+    variants = [("legacy json.dump indent=4", legacy_write, legacy_read)]
+    for compression in args.compression:
+        codec = artifact_io.compression_codec(compression)
+        if codec != compression:
+            print(f"Skipping {compression}: not available")
+            continue
+        for fsync in args.fsync:
+            variants.append(
+                (
+                    f"artifact_io compression={compression} fsync={fsync}",
+                    lambda path, data, c=compression, s=fsync: artifact_io.write_json(
+                        path, data, compression=c, fsync=s
+                    ),
+                    artifact_io.read_json,
+                )
+            )
+
+    results = {
+        "reports": args.reports,
+        "threads": args.threads,
+        "encoder": "orjson" if artifact_io.orjson is not None else "json",
+        "variants": [],
+    }
+    try:
+        for number, (name, write, read) in enumerate(variants):
+            directory = os.path.join(root, str(number))
+            results["variants"].append(
+                run_variant(name, write, read, reports, directory, args.threads)
+            )
+            shutil.rmtree(directory, ignore_errors=True)
+    finally:
+        if args.dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
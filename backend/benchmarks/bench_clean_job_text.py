@@ -0,0 +1,92 @@
+# project-agentic-system-interview-report/backend/benchmarks/bench_clean_job_text.py
+# Microbenchmark of the compiled text normalizer against the original
+# multi-pass clean_job_text on large job pages.
+#
+#   python -m backend.benchmarks.bench_clean_job_text [--size-kb N] [--repeat N]
+
+import re
+import json
+import time
+import random
+import argparse
+from backend.app.core.text_normalize import NOISE_PHRASES, normalize_job_text
+from backend.benchmarks.fixtures import sample_paragraph
+
+
+def legacy_clean_job_text(text: str) -> str:
+    """clean_job_text as it was before the compiled normalizer, kept as the baseline"""
+    text = re.sub(r"\s+", " ", text)
+    noise_patterns = [
+        r"Apply now.*?",
+        r"Click here.*?",
+        r"Powered by.*?",
+        r"©.*?",
+        r"All rights reserved.*?",
+        r"Privacy policy.*?",
+        r"Terms of service.*?",
+        r"Cookie policy.*?",
+        r"Subscribe.*?",
+        r"Follow us.*?",
+        r"Share this.*?",
+        r"Report this job.*?",
+        r"Save job.*?",
+        r"Email job.*?",
+    ]
+    for pattern in noise_patterns:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r"[.]{3,}", "...", text)
+    text = re.sub(r"[-]{3,}", "---", text)
+    text = re.sub(r"\n\s*\n", "\n\n", text)
+    return text.strip()
+
+
+def sample_page(size_kb: int, noise_rate: float, seed: int = 0) -> str:
+    """Job-page-like text with scattered boilerplate, dot leaders and rules"""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_kb * 1024:
+        part = sample_paragraph(rng, rng.randint(20, 80))
+        if rng.random() < noise_rate:
+            part += " " + rng.choice(NOISE_PHRASES).upper() + " "
+        if rng.random() < 0.05:
+            part += " ..... ------ "
+        parts.append(part)
+        size += len(part) + 3
+    return " \n\t ".join(parts)
+
+
+def time_call(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job text normalization.")
+    parser.add_argument("--size-kb", type=int, nargs="*", default=[16, 256, 2048])
+    parser.add_argument("--noise-rate", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size_kb in args.size_kb:
+        text = sample_page(size_kb, args.noise_rate, seed=size_kb)
+        legacy_s = time_call(legacy_clean_job_text, text, args.repeat)
+        compiled_s = time_call(normalize_job_text, text, args.repeat)
+        print(
+            json.dumps(
+                {
+                    "size_kb": size_kb,
+                    "legacy_ms": round(legacy_s * 1000, 2),
+                    "compiled_ms": round(compiled_s * 1000, 2),
+                    "speedup": round(legacy_s / compiled_s, 2),
+                    "identical_output": legacy_clean_job_text(text) == normalize_job_text(text),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# project-agentic-system-interview-report/backend/benchmarks/bench_html_extract.py
+# Throughput of the job page extraction backends on saved job-board HTML.
+#
+#   python -m backend.benchmarks.bench_html_extract [--pages DIR] [--repeat N]
+
+import os
+import json
+import time
+import argparse
+from backend.app.core.html_extract import (
+    decode_html,
+    extract_job_text_bs4,
+    extract_job_text_lxml,
+)
+
+DEFAULT_PAGES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "tests", "fixtures", "job_pages"
+)
+
+BACKENDS = {"bs4": extract_job_text_bs4, "lxml": extract_job_text_lxml}
+
+
+def load_pages(pages_dir: str) -> list:
+    pages = []
+    for name in sorted(os.listdir(pages_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(pages_dir, name), "rb") as f:
+                pages.append(decode_html(f.read()))
+    return pages
+
+
+def inflate(page: str, factor: int) -> str:
+    """Repeat the <body> contents factor times"""
+    head, sep, rest = page.partition("<body")
+    if factor <= 1 or not sep:
+        return page
+    open_tag, _, rest = rest.partition(">")
+    body, _, tail = rest.rpartition("</body>")
+    return f"{head}<body{open_tag}>{body * factor}</body>{tail}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job page extraction backends.")
+    parser.add_argument("--pages", default=DEFAULT_PAGES_DIR, help="Directory of saved pages")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--inflate",
+        type=int,
+        default=1,
+        help="Repeat each page body N times to simulate heavy job-board markup",
+    )
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    pages = [inflate(page, args.inflate) for page in pages]
+    total_bytes = sum(len(page.encode("utf-8")) for page in pages)
+
+    results = {"pages": len(pages), "bytes": total_bytes, "repeat": args.repeat}
+    for name, extract in BACKENDS.items():
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for page in pages:
+                extract(page)
+        elapsed = time.perf_counter() - started
+        processed = len(pages) * args.repeat
+        results[name] = {
+            "pages_per_s": round(processed / elapsed, 1),
+            "mb_per_s": round(total_bytes * args.repeat / elapsed / 1e6, 2),
+            "ms_per_page": round(elapsed / processed * 1000, 3),
+        }
+    results["speedup"] = round(
+        results["lxml"]["pages_per_s"] / results["bs4"]["pages_per_s"], 2
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
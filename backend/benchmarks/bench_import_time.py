@@ -0,0 +1,103 @@
+# project-agentic-system-interview-report/backend/benchmarks/bench_import_time.py
+# Cold-start regression check: imports each entry point in a fresh interpreter
+# with -X importtime and fails if it takes longer than its budget or pulls in a
+# dependency that should only be imported on first use.
+#
+#   python -m backend.benchmarks.bench_import_time [--repeat N] [--scale X]
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+# Cumulative import time budget per entry point, in milliseconds. Roughly 2x
+# what they take on a laptop, so only real regressions (an eager import of a
+# heavy package) trip them.
+IMPORT_BUDGETS_MS = {
+    "backend.app.agents.agent1_job_analysis": 400,
+    "backend.app.agents.agent2_question_retrieval": 400,
+    "backend.app.agents.enhanced_comprehensive_agent": 600,
+    "backend.app.agents.batch_report_agent": 600,
+    "backend.app.agents.job_ingest_agent": 400,
+    "backend.app.agents.batch_api_agent": 600,
+    "backend.app.main": 1500,
+}
+
+# Imported only when a job page, resume or LLM call actually needs them
+LAZY_DEPENDENCIES = ("openai", "docling", "pdfplumber", "docx", "bs4", "requests", "httpx")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+_PROBE = """
+import sys
+import {module}
+print(",".join(sorted(name for name in {lazy!r} if name in sys.modules)))
+"""
+
+
+def probe_import(module: str) -> dict:
+    """Import module in a new interpreter: its cumulative import time and eager lazy deps"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    python_path = os.pathsep.join(filter(None, [root, os.getenv("PYTHONPATH")]))
+    code = _PROBE.format(module=module, lazy=LAZY_DEPENDENCIES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": python_path},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match and match.group(2) == module:
+            cumulative_us = int(match.group(1))
+    eager = proc.stdout.strip()
+    return {
+        "import_ms": round(cumulative_us / 1000, 1) if cumulative_us is not None else None,
+        "eager_dependencies": eager.split(",") if eager else [],
+    }
+
+
+def check_imports(modules: dict = IMPORT_BUDGETS_MS, repeat: int = 3, scale: float = 1.0) -> list:
+    """One result per module, best of repeat runs, with ok=False on a regression"""
+    results = []
+    for module, budget_ms in modules.items():
+        runs = [probe_import(module) for _ in range(repeat)]
+        import_ms = min(run["import_ms"] for run in runs)
+        eager = runs[0]["eager_dependencies"]
+        budget_ms = budget_ms * scale
+        results.append(
+            {
+                "module": module,
+                "import_ms": import_ms,
+                "budget_ms": budget_ms,
+                "eager_dependencies": eager,
+                "ok": import_ms <= budget_ms and not eager,
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry point import time budgets.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply every budget (slow CI machines)"
+    )
+    args = parser.parse_args()
+
+    results = check_imports(repeat=args.repeat, scale=args.scale)
+    for result in results:
+        print(json.dumps(result))
+    if not all(result["ok"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
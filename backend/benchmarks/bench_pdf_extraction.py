@@ -0,0 +1,98 @@
+# project-agentic-system-interview-report/backend/benchmarks/bench_pdf_extraction.py
+# Compare the original page-by-page PDF extraction with the streaming and
+# page-parallel extractors in utils_agent2.
+#
+#   python -m backend.benchmarks.bench_pdf_extraction [--corpus DIR] [--repeat N]
+
+import os
+import time
+import json
+import argparse
+import tempfile
+import pdfplumber
+from backend.app.core.utils_agent2 import (
+    extract_text_from_pdf,
+    extract_text_from_pdf_parallel,
+    iter_pdf_pages,
+)
+from backend.benchmarks.fixtures import write_text_pdf
+
+SYNTHETIC_PAGES = (2, 10, 30, 60)
+
+
+def legacy_extract_text_from_pdf(file_path: str) -> str:
+    """The extractor as it was before streaming/parallel mode, kept as the baseline"""
+    text = ""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+def time_call(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2)
+
+
+def first_page_ms(file_path: str) -> float:
+    started = time.perf_counter()
+    next(iter_pdf_pages(file_path), None)
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def build_corpus(corpus_dir: str) -> list:
+    if corpus_dir:
+        return sorted(
+            os.path.join(corpus_dir, name)
+            for name in os.listdir(corpus_dir)
+            if name.lower().endswith(".pdf")
+        )
+    tmp_dir = tempfile.mkdtemp(prefix="pdf-bench-")
+    paths = []
+    for pages in SYNTHETIC_PAGES:
+        path = os.path.join(tmp_dir, f"synthetic_{pages}p.pdf")
+        write_text_pdf(path, pages, seed=pages)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume PDF extraction.")
+    parser.add_argument("--corpus", help="Directory of PDFs (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Warm the process pool so pool start-up is not billed to the first file
+    corpus = build_corpus(args.corpus)
+    extract_text_from_pdf_parallel(corpus[-1], workers=args.workers)
+
+    results = []
+    for path in corpus:
+        legacy = legacy_extract_text_from_pdf(path)
+        parallel_text, pages = extract_text_from_pdf_parallel(path, workers=args.workers)
+        row = {
+            "file": os.path.basename(path),
+            "pages": pages,
+            "legacy_ms": time_call(lambda: legacy_extract_text_from_pdf(path), args.repeat),
+            "streaming_ms": time_call(lambda: extract_text_from_pdf(path), args.repeat),
+            "parallel_ms": time_call(
+                lambda: extract_text_from_pdf_parallel(path, workers=args.workers),
+                args.repeat,
+            ),
+            "first_page_ms": first_page_ms(path),
+            "identical_output": legacy == extract_text_from_pdf(path) == parallel_text,
+        }
+        row["parallel_speedup"] = round(row["legacy_ms"] / max(row["parallel_ms"], 0.01), 2)
+        results.append(row)
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# project-agentic-system-interview-report/backend/benchmarks/bench_report_pipeline.py
+# End-to-end benchmark of generate_comprehensive_report, fully offline: job
+# pages and the OpenAI API are served by the local stub (openai_stub.py), and
+# PDF/DOCX resumes are generated. Measures per-stage and end-to-end latency,
+# throughput at each concurrency level and peak RSS, and writes the results as
+# JSON so runs can be compared.
+#
+#   python -m backend.benchmarks.bench_report_pipeline [--concurrency 1 4 8] [--reports N]
+#       [--latency-ms N] [--tokens-per-s N] [--error-rate X] [--sharded] [--output FILE]
+#       [--compare FILE]
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import statistics
+from backend.benchmarks.fixtures import write_text_docx, write_text_pdf
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Measure cold work: no response, page or resume caches, no reuse across reports
+BENCH_ENV = {
+    "OPENAI_API_KEY": "stub",
+    "LLM_CACHE_ENABLED": "0",
+    "SCRAPE_CACHE_ENABLED": "0",
+    "RESUME_CACHE_ENABLED": "0",
+    "JOB_DEDUP_ENABLED": "0",
+    "QUESTION_RETRIEVAL_ENABLED": "0",
+    "ANALYSIS_INCREMENTAL": "0",
+}
+
+
+class RssSampler:
+    """Peak resident set size while running, sampled from /proc (ru_maxrss elsewhere)"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, current_rss_kb())
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, current_rss_kb())
+            self._stop.wait(self.interval)
+
+
+def current_rss_kb() -> int:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return round(ordered[index], 4)
+
+
+def summarize(values: list) -> dict:
+    return {
+        "mean": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50": percentile(values, 0.5),
+        "p95": percentile(values, 0.95),
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+def write_resumes(resume_dir: str, count: int) -> list:
+    """Alternate 2-page PDF and DOCX resumes"""
+    names = []
+    for index in range(count):
+        if index % 2 == 0:
+            name = f"resume_{index}.pdf"
+            write_text_pdf(os.path.join(resume_dir, name), pages=2, seed=index)
+        else:
+            name = f"resume_{index}.docx"
+            write_text_docx(os.path.join(resume_dir, name), paragraphs=40, seed=index)
+        names.append(name)
+    return names
+
+
+async def run_level(base_url: str, pages: list, resumes: list, concurrency: int, reports: int):
+    """Generate `reports` reports with at most `concurrency` in flight"""
+    from backend.app.agents.enhanced_comprehensive_agent import (
+        generate_comprehensive_report_async,
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> dict:
+        # A distinct URL per report, so nothing is shared between reports
+        job_url = f"{base_url}/jobs/{pages[index % len(pages)]}?report={index}"
+        async with semaphore:
+            started = time.perf_counter()
+            resume = resumes[index % len(resumes)]
+            result = await generate_comprehensive_report_async(job_url, resume)
+            return {"latency_s": time.perf_counter() - started, **result}
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(index) for index in range(reports)))
+    return results, time.perf_counter() - started
+
+
+def level_summary(results: list, wall_s: float, concurrency: int, peak_rss_kb: int) -> dict:
+    ok = [result for result in results if result.get("success")]
+    errors = {result.get("error", "") for result in results if not result.get("success")}
+    stages = {}
+    for result in ok:
+        for stage, seconds in result["metrics"]["stages"].items():
+            stages.setdefault(stage, []).append(seconds)
+    tokens = {}
+    for result in ok:
+        for name, value in result["metrics"]["llm"].items():
+            if name.endswith("_tokens") or name == "requests":
+                tokens[name] = tokens.get(name, 0) + value
+    return {
+        "concurrency": concurrency,
+        "reports": len(results),
+        "failed": len(results) - len(ok),
+        "errors": sorted(errors),
+        "wall_s": round(wall_s, 3),
+        "throughput_reports_per_min": round(len(ok) / wall_s * 60, 2) if wall_s else 0.0,
+        "end_to_end_s": summarize([result["latency_s"] for result in ok]),
+        "stages_s": {stage: summarize(values) for stage, values in sorted(stages.items())},
+        "llm": tokens,
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+    }
+
+
+def compare(current: dict, previous: dict):
+    """Print latency and throughput ratios against an earlier results file"""
+    before = {level["concurrency"]: level for level in previous["levels"]}
+    for level in current["levels"]:
+        old = before.get(level["concurrency"])
+        if not old:
+            continue
+        print(
+            json.dumps(
+                {
+                    "concurrency": level["concurrency"],
+                    "p50_latency_ratio": _ratio(
+                        level["end_to_end_s"]["p50"], old["end_to_end_s"]["p50"]
+                    ),
+                    "throughput_ratio": _ratio(
+                        level["throughput_reports_per_min"], old["throughput_reports_per_min"]
+                    ),
+                    "peak_rss_ratio": _ratio(level["peak_rss_mb"], old["peak_rss_mb"]),
+                }
+            )
+        )
+
+
+def _ratio(new: float, old: float):
+    return round(new / old, 3) if old else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the comprehensive report pipeline.")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4, 8])
+    parser.add_argument(
+        "--reports", type=int, default=0, help="Reports per level (default: 2x concurrency)"
+    )
+    parser.add_argument("--latency-ms", type=float, default=300, help="Stub time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=500, help="Stub output token rate")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of stub completions that get 429"
+    )
+    parser.add_argument(
+        "--truncate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of stub completions cut off mid-JSON",
+    )
+    parser.add_argument("--sharded", action="store_true", help="Use ANALYSIS_SHARDED=1")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_report_")
+    resume_dir = os.path.join(workdir, "resumes")
+    for name, value in BENCH_ENV.items():
+        os.environ.setdefault(name, value)
+    os.environ.setdefault("REPORT_STORE_DIR", os.path.join(workdir, "store"))
+    os.environ.setdefault("VECTOR_INDEX_DIR", os.path.join(workdir, "vector_index"))
+    os.environ["RESUME_DIR"] = resume_dir
+    os.environ["ANALYSIS_SHARDED"] = "1" if args.sharded else "0"
+
+    # Configuration is read on import, so the app is imported after the env is set
+    from backend.benchmarks.openai_stub import JOB_PAGES_DIR, start_stub
+
+    server, base_url = start_stub(
+        0,
+        args.latency_ms,
+        args.tokens_per_s,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+    )
+    os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    pages = sorted(name for name in os.listdir(JOB_PAGES_DIR) if name.endswith(".html"))
+    resumes = write_resumes(resume_dir, 4)
+
+    levels = []
+    try:
+        for concurrency in args.concurrency:
+            reports = args.reports or 2 * concurrency
+            with RssSampler() as rss:
+                results, wall_s = asyncio.run(
+                    run_level(base_url, pages, resumes, concurrency, reports)
+                )
+            level = level_summary(results, wall_s, concurrency, rss.peak_kb)
+            levels.append(level)
+            print(json.dumps(level))
+    finally:
+        server.shutdown()
+
+    output = {
+        "benchmark": "report_pipeline",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "latency_ms": args.latency_ms,
+            "tokens_per_s": args.tokens_per_s,
+            "error_rate": args.error_rate,
+            "truncate_rate": args.truncate_rate,
+            "sharded": args.sharded,
+            "job_pages": len(pages),
+            "resumes": len(resumes),
+        },
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "levels": levels,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    path = args.output or os.path.join(
+        RESULTS_DIR, f"report_pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results saved to {path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(output, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
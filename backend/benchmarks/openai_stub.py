@@ -0,0 +1,426 @@
+# project-agentic-system-interview-report/backend/benchmarks/openai_stub.py
+# Local OpenAI-compatible server for offline benchmarks. Answers
+# POST /v1/chat/completions (plain and streamed) with canned analyses after a
+# configurable time to first token and token rate, reports usage including
+# prompt-cache hits, and serves saved job pages under GET /jobs/<file>.
+# Optionally rejects a fraction of completions with 429 and Retry-After, to
+# exercise the LLM gateway's backoff. Also stands in for the Batch API: files
+# uploaded to /v1/files are run as batches (/v1/batches, also listed there) that
+# complete after batch_latency_s, with results under /v1/files/<id>/content.
+#
+#   python -m backend.benchmarks.openai_stub [--port N] [--latency-ms N] [--tokens-per-s N]
+#       [--error-rate X]
+
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from backend.app.core.prompt_budget import estimate_tokens
+from backend.app.core.report_sections import section_id
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BACKEND_DIR, "data")
+JOB_PAGES_DIR = os.path.join(BACKEND_DIR, "tests", "fixtures", "job_pages")
+JOB_ANALYSIS_FILE = os.path.join(DATA_DIR, "job_descriptions", "enhanced_output.json")
+ANALYSIS_FILE = os.path.join(DATA_DIR, "reports", "swarnalatha.pdf_comprehensive_analysis.json")
+
+# Like the OpenAI prompt cache: prefixes of at least 1024 tokens, in 128 token steps
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_STEP = 128
+CHARS_PER_TOKEN = 4
+
+_KEYS_RE = re.compile(r"Use exactly these top-level keys: (.+?)\.\s*$", re.MULTILINE)
+
+
+class StubState:
+    """Canned answers, timing parameters and request counters shared by handler threads"""
+
+    def __init__(
+        self,
+        latency_ms: float,
+        tokens_per_s: float,
+        pages_dir: str,
+        error_rate: float = 0.0,
+        batch_latency_s: float = 1.0,
+        truncate_rate: float = 0.0,
+    ):
+        self.latency_s = latency_ms / 1000
+        self.tokens_per_s = tokens_per_s
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.truncated = 0
+        self.batch_latency_s = batch_latency_s
+        self.rejected = 0
+        self.files = {}
+        self.batches = {}
+        self.batch_due = {}
+        self.pages_dir = pages_dir
+        with open(JOB_ANALYSIS_FILE, "r", encoding="utf-8") as f:
+            self.job_analysis = json.load(f)
+        with open(ANALYSIS_FILE, "r", encoding="utf-8") as f:
+            self.analysis = json.load(f)
+        self.sections = {section_id(key): (key, value) for key, value in self.analysis.items()}
+        self.prefixes = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def answer(self, messages: list) -> str:
+        """Canned JSON for a request: job analysis, one analysis shard or the full analysis"""
+        system = messages[0].get("content", "") if messages else ""
+        last = messages[-1].get("content", "") if messages else ""
+        if "job data" in system:
+            return json.dumps(self.job_analysis, indent=2)
+        keys = _KEYS_RE.search(last)
+        if keys:
+            shard = {}
+            for key in json.loads(f"[{keys.group(1)}]"):
+                shard[key] = self.sections.get(section_id(key), (key, {}))[1]
+            return json.dumps(shard, indent=2)
+        return json.dumps(self.analysis, indent=2)
+
+    def cached_tokens(self, messages: list) -> int:
+        """Prompt tokens a provider-side prefix cache would have served"""
+        if len(messages) < 2:
+            return 0
+        prefix = json.dumps(messages[:-1], sort_keys=True)
+        tokens = estimate_tokens(prefix)
+        if tokens < PROMPT_CACHE_MIN_TOKENS:
+            return 0
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        with self.lock:
+            seen = digest in self.prefixes
+            self.prefixes.add(digest)
+        return tokens - tokens % PROMPT_CACHE_STEP if seen else 0
+
+    def completion(self, request: dict) -> dict:
+        """A chat.completion object answering request"""
+        messages = request.get("messages", [])
+        text = self.answer(messages)
+        finish_reason = "stop"
+        with self.lock:
+            truncate = random.random() < self.truncate_rate
+            self.truncated += truncate
+        if truncate:
+            # Like hitting max_tokens: the answer stops mid-JSON
+            text = text[: int(len(text) * random.uniform(0.4, 0.9))]
+            finish_reason = "length"
+        return {
+            "id": f"chatcmpl-stub-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": self.usage(messages, text),
+        }
+
+    def upload(self, content_type: str, body: bytes) -> dict:
+        """Store the file of a multipart upload (POST /v1/files)"""
+        message = BytesParser(policy=default).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        fields = {
+            part.get_param("name", header="content-disposition"): part
+            for part in message.iter_parts()
+        }
+        data = fields["file"].get_payload(decode=True)
+        file_id = self.add_file(data)
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(data),
+            "created_at": int(time.time()),
+            "filename": fields["file"].get_filename() or "upload.jsonl",
+            "purpose": fields["purpose"].get_content().strip() if "purpose" in fields else "batch",
+            "status": "processed",
+        }
+
+    def add_file(self, data: bytes) -> str:
+        with self.lock:
+            file_id = f"file-stub-{len(self.files) + 1}"
+            self.files[file_id] = data
+        return file_id
+
+    def create_batch(self, request: dict) -> dict:
+        """Accept a batch; it completes batch_latency_s later (see get_batch)"""
+        with self.lock:
+            batch_id = f"batch_stub_{len(self.batches) + 1}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"],
+                "completion_window": request.get("completion_window", "24h"),
+                "status": "in_progress",
+                "created_at": int(time.time()),
+                "metadata": request.get("metadata"),
+                "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            }
+            self.batch_due[batch_id] = time.time() + self.batch_latency_s
+            return dict(self.batches[batch_id])
+
+    def list_batches(self) -> dict:
+        """GET /v1/batches: every batch, newest first, on a single page"""
+        with self.lock:
+            data = [dict(batch) for batch in reversed(list(self.batches.values()))]
+        return {
+            "object": "list",
+            "data": data,
+            "first_id": data[0]["id"] if data else None,
+            "last_id": data[-1]["id"] if data else None,
+            "has_more": False,
+        }
+
+    def get_batch(self, batch_id: str) -> tuple:
+        """(status, batch object); runs the batch's requests once it is due"""
+        with self.lock:
+            batch = self.batches.get(batch_id)
+        if batch is None:
+            return 404, {"error": {"message": "batch not found"}}
+        with self.lock:
+            due = batch["status"] == "in_progress" and time.time() >= self.batch_due[batch_id]
+            if due:
+                batch["status"] = "finalizing"
+        if due:
+            self.run_batch(batch)
+        return 200, batch
+
+    def run_batch(self, batch: dict):
+        """Answer every line of the input file; error_rate of them fail with a 500"""
+        output, errors = [], []
+        for line in self.files[batch["input_file_id"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            result = {
+                "id": f"batch_req_{len(output) + len(errors)}",
+                "custom_id": request["custom_id"],
+            }
+            if random.random() < self.error_rate:
+                result["response"] = {
+                    "status_code": 500,
+                    "body": {"error": {"message": "Internal error (stub)"}},
+                }
+                result["error"] = None
+                errors.append(result)
+                continue
+            result["response"] = {"status_code": 200, "body": self.completion(request["body"])}
+            result["error"] = None
+            output.append(result)
+
+        def jsonl(lines):
+            return "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+
+        batch["output_file_id"] = self.add_file(jsonl(output)) if output else None
+        batch["error_file_id"] = self.add_file(jsonl(errors)) if errors else None
+        batch["request_counts"] = {
+            "total": len(output) + len(errors),
+            "completed": len(output),
+            "failed": len(errors),
+        }
+        batch["completed_at"] = int(time.time())
+        batch["status"] = "completed"
+
+    def usage(self, messages: list, text: str) -> dict:
+        prompt = sum(estimate_tokens(message.get("content", "")) for message in messages)
+        completion = estimate_tokens(text)
+        return {
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "total_tokens": prompt + completion,
+            "prompt_tokens_details": {
+                "cached_tokens": min(self.cached_tokens(messages), prompt)
+            },
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        if path.endswith("/batches"):
+            self.send_json(200, self.state.list_batches())
+            return
+        batch = re.fullmatch(r".*/batches/([\w-]+)", path)
+        if batch:
+            self.send_json(*self.state.get_batch(batch.group(1)))
+            return
+        content = re.fullmatch(r".*/files/([\w-]+)/content", path)
+        if content:
+            data = self.state.files.get(content.group(1))
+            if data is None:
+                self.send_json(404, {"error": {"message": "file not found"}})
+            else:
+                self.send_body(200, "application/octet-stream", data)
+            return
+
+        name = os.path.basename(path)
+        file_path = os.path.join(self.state.pages_dir, name)
+        if not self.path.startswith("/jobs/") or not os.path.isfile(file_path):
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        with open(file_path, "rb") as f:
+            self.send_body(200, "text/html", f.read())
+
+    def do_POST(self):
+        path = self.path.split("?")[0].rstrip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if path.endswith("/files"):
+            self.send_json(200, self.state.upload(self.headers.get("Content-Type", ""), body))
+            return
+        if path.endswith("/batches"):
+            self.send_json(200, self.state.create_batch(json.loads(body)))
+            return
+        if not path.endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        request = json.loads(body)
+        state = self.state
+        with state.lock:
+            state.requests += 1
+            rejected = random.random() < state.error_rate
+            state.rejected += rejected
+        if rejected:
+            self.send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stub)", "code": "rate_limit_exceeded"}},
+                {"retry-after-ms": "200"},
+            )
+            return
+        completion = state.completion(request)
+        time.sleep(state.latency_s)
+
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            text = completion["choices"][0]["message"]["content"]
+            usage = completion["usage"] if include_usage else None
+            self.stream(completion["model"], text, usage)
+            return
+        if state.tokens_per_s:
+            time.sleep(completion["usage"]["completion_tokens"] / state.tokens_per_s)
+        self.send_json(200, completion)
+
+    def stream(self, model: str, text: str, usage):
+        """Server-sent event chunks of about 16 tokens, paced at tokens_per_s"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(choices, **extra):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n")
+
+        step = 16 * CHARS_PER_TOKEN
+        for start in range(0, len(text), step):
+            piece = text[start : start + step]
+            delta = {"content": piece} if start else {"role": "assistant", "content": piece}
+            event([{"index": 0, "delta": delta, "finish_reason": None}])
+            if self.state.tokens_per_s:
+                time.sleep(len(piece) / CHARS_PER_TOKEN / self.state.tokens_per_s)
+        event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage:
+            event([], usage=usage)
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, data: str):
+        body = data.encode("utf-8")
+        self.wfile.write(f"{len(body):x}\r\n".encode("ascii") + body + b"\r\n")
+        self.wfile.flush()
+
+    def send_json(self, status: int, payload: dict, headers: dict = None):
+        self.send_body(status, "application/json", json.dumps(payload).encode("utf-8"), headers)
+
+    def send_body(self, status: int, content_type: str, body: bytes, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub(
+    port: int = 0,
+    latency_ms: float = 300,
+    tokens_per_s: float = 500,
+    pages_dir: str = JOB_PAGES_DIR,
+    error_rate: float = 0.0,
+    batch_latency_s: float = 1.0,
+    truncate_rate: float = 0.0,
+):
+    """Start the stub on a daemon thread; returns (server, base_url). Stop with server.shutdown()"""
+    state = StubState(
+        latency_ms, tokens_per_s, pages_dir, error_rate, batch_latency_s, truncate_rate
+    )
+    handler = type("Handler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300, help="Time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=500, help="0 for no pacing")
+    parser.add_argument("--pages", default=JOB_PAGES_DIR, help="Job pages served under /jobs/")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of completions answered with 429"
+    )
+    parser.add_argument(
+        "--batch-latency-s", type=float, default=1.0, help="Time until a batch completes"
+    )
+    parser.add_argument(
+        "--truncate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of completions cut off mid-JSON (finish_reason=length)",
+    )
+    args = parser.parse_args()
+
+    server, base_url = start_stub(
+        args.port,
+        args.latency_ms,
+        args.tokens_per_s,
+        args.pages,
+        args.error_rate,
+        args.batch_latency_s,
+        args.truncate_rate,
+    )
+    print(f"OPENAI_BASE_URL={base_url}/v1  (job pages under {base_url}/jobs/)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
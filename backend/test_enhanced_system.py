@@ -37,7 +37,7 @@ def test_enhanced_system():
             print("✅ Test completed successfully!")
             print(f"📊 Job Analysis Keys: {list(result['job_analysis'].keys())}")
             print(f"📈 Resume Analysis Keys: {list(result['resume_analysis'].keys())}")
-            print(f"📄 HTML Report Length: {len(result['html_report'])} characters")
+            print(f"📄 HTML Report: {result['html_report_path']}")
         else:
             print(f"❌ Test failed: {result.get('error')}")
 
@@ -65,7 +65,9 @@ def test_individual_components():
         print("✅ Resume reading utility imported successfully")
 
         # Test OpenAI client
-        from app.agents.enhanced_comprehensive_agent import client
+        from app.agents.enhanced_comprehensive_agent import get_client
+
+        client = get_client()
 
         print("✅ OpenAI client initialized successfully")
 
@@ -0,0 +1,456 @@
+import os
+import glob
+import json
+
+import pytest
+
+from backend.app.core import job_dedup, section_store
+from backend.app.core.json_repair import parse_json_object
+from backend.app.core.json_stream import TopLevelObjectParser
+from backend.app.core.report_sections import (
+    REPORT_SECTIONS,
+    SECTION_SHARDS,
+    merge_sections,
+    section_field,
+)
+from backend.app.core.text_normalize import normalize_job_text
+from backend.benchmarks.bench_clean_job_text import legacy_clean_job_text, sample_page
+from backend.benchmarks.bench_import_time import check_imports
+from backend.app.core.html_extract import (
+    decode_html,
+    extract_job_text,
+    extract_job_text_bs4,
+    extract_job_text_lxml,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+JOB_PAGES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "job_pages", "*.html")))
+
+
+def normalize(text: str) -> str:
+    # clean_job_text collapses all whitespace, so that is the equivalence we need
+    return " ".join(text.split())
+
+
+@pytest.mark.parametrize("path", JOB_PAGES, ids=os.path.basename)
+def test_lxml_extraction_matches_bs4_on_saved_pages(path):
+    with open(path, "rb") as f:
+        html = decode_html(f.read())
+
+    expected = normalize(extract_job_text_bs4(html))
+    assert expected
+    assert normalize(extract_job_text_lxml(html)) == expected
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        # nested matches of the same selector are all included, in document order
+        '<div class="description">outer <div class="description">inner</div></div>',
+        # selectors inside removed elements must not match
+        '<header class="job-description">nav</header><main>body text</main>',
+        # comments and scripts are dropped, but text around them is kept
+        "<article>keep <!-- hidden --> this<script>var x = 1;</script> too</article>",
+        # class token selector vs substring selector
+        '<div class="contents">no</div><div class="main content">yes</div>',
+        # nothing matches: fall back to the whole document text
+        "<html><head><title>Job</title></head><body><p>Plain page</p></body></html>",
+        # unclosed tags
+        "<div id='job-description-1'><p>First<p>Second<li>Third</div>",
+    ],
+)
+def test_lxml_extraction_matches_bs4_on_edge_cases(html):
+    assert normalize(extract_job_text_lxml(html)) == normalize(extract_job_text_bs4(html))
+
+
+def test_extract_job_text_falls_back_to_bs4_for_empty_documents():
+    assert extract_job_text("", backend="lxml") == extract_job_text_bs4("")
+
+
+def test_decode_html_prefers_header_then_meta_charset():
+    latin1 = '<meta charset="iso-8859-1"><p>Montréal</p>'.encode("iso-8859-1")
+    assert "Montréal" in decode_html(latin1)
+    assert "Montréal" in decode_html(latin1, "text/html; charset=ISO-8859-1")
+    assert decode_html("<p>naïve</p>".encode("utf-8")) == "<p>naïve</p>"
+
+
+@pytest.mark.parametrize("path", JOB_PAGES, ids=os.path.basename)
+def test_normalizer_matches_legacy_clean_job_text_on_saved_pages(path):
+    with open(path, "rb") as f:
+        text = extract_job_text_bs4(decode_html(f.read()))
+    assert normalize_job_text(text) == legacy_clean_job_text(text)
+
+
+def test_normalizer_matches_legacy_clean_job_text_on_noisy_text():
+    text = sample_page(64, noise_rate=0.5)
+    text += " İstanbul office. APPLY\n  NOW ©2026 ....  ----- Cookie Policy"
+    assert normalize_job_text(text) == legacy_clean_job_text(text)
+
+
+def test_normalizer_applies_job_board_rules_only_for_that_board():
+    text = "Great role. Show more Easy Apply"
+    assert normalize_job_text(text, "https://www.linkedin.com/jobs/view/1") == "Great role."
+    assert normalize_job_text(text, "https://example.com/jobs/1") == text
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, 10_000])
+def test_streamed_json_sections_are_emitted_as_they_complete(chunk_size):
+    analysis = {
+        "EXECUTIVE SUMMARY": {"Match": "85%", "Notes": 'uses "quotes", {braces} and: colons'},
+        "KEYWORDS & PHRASES": ["a,b", "[c]"],
+        "key: with colon": None,
+    }
+    text = "```json\n" + json.dumps(analysis, indent=2) + "\n```"
+
+    parser = TopLevelObjectParser()
+    emitted = []
+    for start in range(0, len(text), chunk_size):
+        emitted.extend(parser.feed(text[start : start + chunk_size]))
+
+    assert emitted == list(analysis.items())
+    assert parser.result() == analysis
+
+
+def test_streamed_json_parser_stops_on_malformed_output():
+    parser = TopLevelObjectParser()
+    assert parser.feed('{"A": 1, "B": oops, "C": 3}') == []
+    assert parser.failed
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('```json\n{"A": {"x": [1, 2,],}, "B": True,}\n```', {"A": {"x": [1, 2]}, "B": True}),
+        ('{"A": "one\ntwo", "B": None} Hope this helps!', {"A": "one\ntwo", "B": None}),
+        ('{"A": {"x": 1}, "B": {"y": [1, 2', {"A": {"x": 1}}),
+        ('{"A": 1, "B": oops, "C": "3"}', {"A": 1, "C": "3"}),
+        ("Sorry, I cannot help with that.", {}),
+    ],
+)
+def test_json_answers_are_repaired_member_by_member(text, expected):
+    assert parse_json_object(text) == expected
+
+
+def test_section_shards_cover_every_report_section_once():
+    sharded = [title for titles in SECTION_SHARDS.values() for title in titles]
+    assert sorted(sharded) == sorted(section["title"] for section in REPORT_SECTIONS)
+
+
+def test_section_field_tolerates_sections_of_another_type():
+    analysis = {"EXECUTIVE_SUMMARY": {"Overall_Match_Percentage": "80%"}, "BASIC_INFORMATION": []}
+    assert section_field(analysis, "EXECUTIVE_SUMMARY", "Overall_Match_Percentage") == "80%"
+    assert section_field(analysis, "BASIC_INFORMATION", "Job_Title", "") == ""
+    assert section_field({"EXECUTIVE_SUMMARY": "Strong match"}, "EXECUTIVE_SUMMARY", "x") is None
+    assert section_field("not json", "EXECUTIVE_SUMMARY", "x") is None
+
+
+def test_failing_shard_costs_at_most_shard_retries_extra_calls(monkeypatch):
+    from backend.app.agents import enhanced_comprehensive_agent as agent
+    from backend.app.core import structured_output
+
+    calls = []
+
+    def no_json(client, model, messages, *args, **kwargs):
+        calls.append(model)
+        return "no json here"
+
+    monkeypatch.setattr(structured_output, "chat_completion_text", no_json)
+    monkeypatch.setattr(agent, "get_client", lambda: None)
+    monkeypatch.setattr(agent, "SHARD_RETRIES", 2)
+    shard = next(iter(SECTION_SHARDS))
+    shards = {shard: agent.shard_sections(shard)}
+    with pytest.raises(RuntimeError, match=f"shard {shard} failed"):
+        agent.generate_sharded_analysis({}, "resume", shards=shards)
+    assert len(calls) == 3  # the shard request and two re-requests, nothing more
+
+
+def test_merged_shards_use_template_keys_in_report_order():
+    merged = merge_sections(
+        [
+            {"red_flags_concerns": {"a": 1}, "Executive Summary": {"b": 2}},
+            {"KEYWORDS_PHRASES": ["c"], "Notes": "kept"},
+        ]
+    )
+    assert list(merged) == ["EXECUTIVE_SUMMARY", "KEYWORDS & PHRASES", "RED FLAGS & CONCERNS", "Notes"]
+
+
+def test_section_store_reuses_sections_whose_inputs_did_not_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(section_store, "SECTION_STORE_DB", str(tmp_path / "sections.sqlite3"))
+    job = {
+        "BASIC_INFORMATION": {"Job_Title": "Data Scientist"},
+        "TECHNICAL_REQUIREMENTS": {"Required_Skills": ["Python"]},
+        "COMPANY_INFORMATION": {"Industry": "Retail"},
+        "scraped_at": "2024-01-01",
+    }
+    resume = "Jane Doe\nSKILLS\nPython, SQL\nWork Experience:\nAcme - churn models"
+    assert section_store.resume_parts(resume) == {
+        "resume.skills": "Python, SQL",
+        "resume.experience": "Acme - churn models",
+        "resume.contact": "Jane Doe",
+    }
+
+    inputs = section_store.analysis_inputs(job, resume)
+    reused, diff = section_store.plan_sections("https://a.example/job", "jane.pdf", inputs)
+    assert reused == {} and diff["recomputed"] == len(REPORT_SECTIONS)
+    analysis = {section["key"]: {"v": 1} for section in REPORT_SECTIONS}
+    section_store.store_sections("https://a.example/job", "jane.pdf", inputs, analysis)
+
+    # A new scrape time and contact details change nothing; a skills edit only
+    # invalidates the sections written from the skills
+    job["scraped_at"] = "2024-02-01"
+    edited = resume.replace("Jane Doe", "Jane Doe, PhD").replace("SQL", "SQL, Spark")
+    inputs = section_store.analysis_inputs(job, edited)
+    reused, diff = section_store.plan_sections("https://a.example/job", "jane.pdf", inputs)
+    by_key = {entry["section"]: entry for entry in diff["sections"]}
+    assert by_key["SKILLS_ANALYSIS"] == {
+        "section": "SKILLS_ANALYSIS",
+        "status": "recomputed",
+        "changed_inputs": ["resume.skills"],
+    }
+    assert by_key["COMPANY RESEARCH POINTS"]["status"] == "reused"
+    assert by_key["BEHAVIORAL PREPARATION"]["status"] == "reused"
+    assert reused["COMPANY RESEARCH POINTS"] == {"v": 1}
+    assert diff["changed_inputs"] == ["resume.skills"]
+    assert diff["reused"] + diff["recomputed"] == len(REPORT_SECTIONS)
+
+
+def test_near_duplicate_job_postings_reuse_the_stored_analysis(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_dedup, "JOB_DEDUP_DB", str(tmp_path / "fingerprints.sqlite3"))
+    text = normalize_job_text(extract_job_text(open(JOB_PAGES[0], "rb").read()))
+    job_dedup.remember_job("https://a.example/job/1", text, {"title": "Engineer"})
+
+    repost = text.replace("\n", " ") + " Apply via our careers page today."
+    duplicate = job_dedup.find_duplicate("https://b.example/jobs/99", repost)
+    assert duplicate["source_url"] == "https://a.example/job/1"
+    assert duplicate["similarity"] >= job_dedup.JOB_DEDUP_THRESHOLD
+    reused = job_dedup.reuse_analysis(duplicate)
+    assert reused["title"] == "Engineer"
+    assert reused["duplicate_of"]["source_url"] == "https://a.example/job/1"
+
+    other = normalize_job_text(extract_job_text(open(JOB_PAGES[-1], "rb").read()))
+    assert job_dedup.find_duplicate("https://c.example/x", other) is None
+    assert job_dedup.find_duplicate("https://a.example/job/1", text) is None
+    assert job_dedup.find_duplicate("https://b.example/jobs/99", repost, kind="enhanced") is None
+
+
+def test_entry_points_import_fast_without_heavy_dependencies():
+    # Generous scale: this guards against eager imports, not machine speed
+    for result in check_imports(repeat=1, scale=3.0):
+        assert result["eager_dependencies"] == [], result
+        assert result["ok"], result
+
+
+def test_crawler_caps_each_domain_retries_and_limits_response_size(monkeypatch):
+    import asyncio
+    import httpx
+    from backend.app.core import crawler
+
+    monkeypatch.setattr(crawler, "SCRAPE_CACHE_ENABLED", False)
+    monkeypatch.setattr(crawler, "BACKOFF_BASE_SECONDS", 0.001)
+    monkeypatch.setattr(
+        crawler, "parse_or_reuse", lambda url, cached, headers, body: {"size": len(body)}
+    )
+    in_flight, peak, attempts = {}, {}, {}
+
+    async def handler(request):
+        host, path = request.url.host, request.url.path
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        attempts[path] = attempts.get(path, 0) + 1
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        if path == "/flaky" and attempts[path] < 3:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        if path == "/huge":
+            return httpx.Response(200, content=b"x" * 2000)
+        return httpx.Response(200, content=b"<html>job</html>")
+
+    urls = [f"https://{host}.example/{n}" for host in ("a", "b") for n in range(6)]
+    urls += ["https://c.example/flaky", "https://c.example/huge"]
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return dict(
+                [item async for item in crawler.crawl(urls, client, 8, 2, 0, max_bytes=1000)]
+            )
+
+    results = asyncio.run(run())
+    assert set(results) == set(urls)
+    assert peak["a.example"] == peak["b.example"] == 2
+    assert results["https://c.example/flaky"] == {"size": len(b"<html>job</html>")}
+    assert attempts["/flaky"] == 3
+    assert "error" in results["https://c.example/huge"]
+
+
+def test_stage_dag_runs_in_dependency_order_and_cancels_on_failure():
+    import asyncio
+    from backend.app.core.pipeline import run_stages
+
+    async def value(result, delay=0.0):
+        await asyncio.sleep(delay)
+        return result
+
+    results, timings = asyncio.run(
+        run_stages(
+            {
+                "a": ((), lambda: value(1, 0.02)),
+                "b": ((), lambda: value(2)),
+                "sum": (("a", "b"), lambda a, b: value(a + b)),
+            }
+        )
+    )
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    assert timings["sum"]["start_s"] >= timings["a"]["end_s"]
+    assert set(timings) == {"a", "b", "sum", "total"}
+
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(run_stages({"slow": ((), slow), "fail": ((), fail)}))
+    assert cancelled == ["slow"]
+
+    with pytest.raises(ValueError, match="cycle"):
+        asyncio.run(run_stages({"x": (("y",), value), "y": (("x",), value)}))
+    with pytest.raises(ValueError, match="unknown"):
+        asyncio.run(run_stages({"x": (("missing",), value)}))
+
+
+def test_scrape_cache_revalidates_and_reuses_unchanged_pages(tmp_path, monkeypatch):
+    import asyncio
+    import httpx
+    import threading
+    from backend.app.core import scrape_cache, utils
+
+    monkeypatch.setattr(scrape_cache, "SCRAPE_CACHE_DB", str(tmp_path / "scrape.sqlite3"))
+    monkeypatch.setattr(utils, "SCRAPE_CACHE_ENABLED", True)
+    parse_calls = []
+
+    def parse(html, url):
+        parse_calls.append(url)
+        return {"job_description": normalize(extract_job_text(html))}
+
+    monkeypatch.setattr(utils, "parse_job_page", parse)
+    # Cache reads and writes may wait on SQLite locks: they must not run on the loop
+    cache_threads = []
+    for name in ("get_cached_page", "mark_revalidated"):
+        def recorded(*args, _original=getattr(utils, name)):
+            cache_threads.append(threading.get_ident())
+            return _original(*args)
+        monkeypatch.setattr(utils, name, recorded)
+    page = b"<html><body><h1>Data Engineer</h1><p>Build pipelines.</p></body></html>"
+    validators = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    # (status, headers, body) answered per request; the requests are recorded
+    responses = [
+        (200, validators, page),
+        (304, {"ETag": '"v2"'}, b""),
+        (200, {}, page),  # a server that ignores conditional requests
+        (200, {}, page.replace(b"</body>", b"<p>Now hiring remotely.</p></body>")),
+    ]
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers)
+        status, headers, body = responses[len(seen) - 1]
+        return httpx.Response(status, headers=headers, content=body)
+
+    async def scrape():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            url = "https://jobs.example.com/1"
+            return [await utils.scrape_job_description_async(url, client) for _ in responses]
+
+    first, not_modified, same_body, changed = asyncio.run(scrape())
+    assert "If-None-Match" not in seen[0]
+    assert seen[1]["If-None-Match"] == '"v1"'
+    assert seen[1]["If-Modified-Since"] == validators["Last-Modified"]
+    assert seen[2]["If-None-Match"] == '"v2"'  # refreshed by the 304
+    assert not_modified == same_body == first
+    assert "Now hiring remotely" in changed["job_description"]
+    assert len(parse_calls) == 2
+    assert len(cache_threads) == 6 and threading.get_ident() not in cache_threads
+
+
+def test_resume_cache_hits_by_digest_and_invalidates_on_change(tmp_path, monkeypatch):
+    import shutil
+    from backend.app.core import resume_cache, utils_agent2
+    from backend.benchmarks.fixtures import write_text_pdf
+
+    monkeypatch.setattr(resume_cache, "RESUME_CACHE_DB", str(tmp_path / "resumes.sqlite3"))
+    monkeypatch.setattr(utils_agent2, "RESUME_CACHE_ENABLED", True)
+    write_text_pdf(str(tmp_path / "a.pdf"), pages=2)
+
+    first = utils_agent2.read_resume_with_info("a.pdf", str(tmp_path))
+    again = utils_agent2.read_resume_with_info("a.pdf", str(tmp_path))
+    assert not first["cached"] and again["cached"]
+    assert again["text"] == first["text"] and again["page_count"] == 2
+
+    # Same contents under another name: a digest hit, indexed for the new path
+    shutil.copy(tmp_path / "a.pdf", tmp_path / "copy.pdf")
+    copy = utils_agent2.read_resume_with_info("copy.pdf", str(tmp_path))
+    assert copy["cached"] and copy["digest"] == first["digest"]
+    conn = resume_cache.get_connection(resume_cache.RESUME_CACHE_DB, resume_cache._SCHEMA)
+    assert conn.execute("SELECT COUNT(*) FROM resume_files").fetchone()[0] == 2
+
+    # The index is keyed by mtime and size: unchanged files are not re-hashed...
+    with monkeypatch.context() as no_hashing:
+        no_hashing.setattr(resume_cache.hashlib, "sha256", None)
+        assert resume_cache.file_digest(str(tmp_path / "a.pdf")) == first["digest"]
+
+    # ...and an edited file (new size and mtime) is extracted again
+    write_text_pdf(str(tmp_path / "a.pdf"), pages=3, seed=1)
+    edited = utils_agent2.read_resume_with_info("a.pdf", str(tmp_path))
+    assert not edited["cached"] and edited["digest"] != first["digest"]
+    assert edited["page_count"] == 3
+
+    # A touched but identical file is re-hashed to the same digest and still hits
+    os.utime(tmp_path / "copy.pdf", ns=(1, 1))
+    touched = utils_agent2.read_resume_with_info("copy.pdf", str(tmp_path))
+    assert touched["cached"] and touched["digest"] == first["digest"]
+
+    # Text cut under other caps or by another extractor version is not reused
+    monkeypatch.setattr(utils_agent2, "PDF_MAX_TEXT_BYTES", 10)
+    capped = utils_agent2.read_resume_with_info("copy.pdf", str(tmp_path))
+    assert not capped["cached"] and len(capped["text"].encode("utf-8")) <= 11
+    monkeypatch.setattr(utils_agent2, "EXTRACTOR_VERSION", utils_agent2.EXTRACTOR_VERSION + 1)
+    assert not utils_agent2.read_resume_with_info("copy.pdf", str(tmp_path))["cached"]
+
+
+def test_parallel_pdf_extraction_stops_submitting_at_the_text_cap(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.app.core import utils_agent2
+    from backend.benchmarks.fixtures import write_text_pdf
+
+    path = str(tmp_path / "long.pdf")
+    write_text_pdf(path, pages=16)
+    monkeypatch.setattr(utils_agent2, "PDF_RANGE_PAGES", 2)
+    submitted = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def submit(self, func, *args):
+            submitted.append(args[1:])
+            return super().submit(func, *args)
+
+    with CountingPool(max_workers=2) as pool:
+        monkeypatch.setattr(utils_agent2, "_get_pdf_pool", lambda workers: pool)
+        text, page_count = utils_agent2.extract_text_from_pdf_parallel(path, workers=2)
+        assert page_count == 16 and len(submitted) == 8
+        assert text == utils_agent2.extract_text_from_pdf(path)
+
+        # A cap inside the first range: besides the ranges already in flight, only
+        # the one submitted when the first completed is extracted
+        submitted.clear()
+        capped, _ = utils_agent2.extract_text_from_pdf_parallel(path, workers=2, max_bytes=3000)
+        assert submitted == [(0, 2), (2, 4), (4, 6)]
+        assert capped == utils_agent2.extract_text_from_pdf(path, max_bytes=3000)
+        assert len(capped.encode("utf-8")) <= 3000 + capped.count("\n")
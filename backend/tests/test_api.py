@@ -0,0 +1,336 @@
+import json
+import time
+import uuid
+import threading
+
+import pytest
+
+from backend.app.core.job_queue import JobQueue, QueueFull
+
+
+def wait_for(jobs, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while jobs.get(job_id)["status"] in ("queued", "running"):
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return jobs.get(job_id)
+
+
+def test_job_queue_runs_jobs_and_reports_failures():
+    jobs = JobQueue(
+        handlers={"ok": lambda value: {"value": value}, "bad": lambda: {"error": "boom"}},
+        workers=2,
+    )
+    ok = jobs.submit("ok", value=3)
+    bad = jobs.submit("bad")
+
+    assert wait_for(jobs, ok["id"])["status"] == "succeeded"
+    assert jobs.result(ok["id"])[1] == {"value": 3}
+    status = wait_for(jobs, bad["id"])
+    assert status["status"] == "failed" and status["error"] == "boom"
+    assert jobs.result(bad["id"])[1] is None
+
+
+def test_job_queue_cancels_queued_jobs_before_they_start():
+    release = threading.Event()
+    started = []
+
+    def handler(name):
+        started.append(name)
+        release.wait(5)
+        return {}
+
+    jobs = JobQueue(handlers={"work": handler}, workers=1)
+    first = jobs.submit("work", name="first")
+    second = jobs.submit("work", name="second")
+    assert jobs.cancel(second["id"])["status"] == "cancelled"
+    release.set()
+
+    assert wait_for(jobs, first["id"])["status"] == "succeeded"
+    assert started == ["first"]
+
+
+def test_job_queue_rejects_work_beyond_its_limit():
+    release = threading.Event()
+    jobs = JobQueue(handlers={"work": lambda: release.wait(5) and {}}, workers=1, max_queued=1)
+    jobs.submit("work")
+    time.sleep(0.05)  # let the worker pick up the first job
+    jobs.submit("work")
+    with pytest.raises(QueueFull):
+        jobs.submit("work")
+    release.set()
+
+
+def test_run_metrics_and_prometheus_endpoint():
+    from fastapi.testclient import TestClient
+    from backend.app.main import app
+    from backend.app.core.metrics import collect_run, record_llm_call, stage_timer
+
+    # Counters are process-wide: a label of its own keeps other tests' calls out
+    model = f"test-model-{uuid.uuid4().hex[:8]}"
+    usage = {
+        "prompt_tokens": 900,
+        "completion_tokens": 100,
+        "prompt_tokens_details": {"cached_tokens": 512},
+    }
+    with collect_run() as run:
+        with stage_timer("analysis"):
+            record_llm_call(model, False, usage, 0.2)
+            record_llm_call(model, True)
+    assert run["llm"] == {
+        "requests": 2,
+        "cache_hits": 1,
+        "prompt_tokens": 900,
+        "completion_tokens": 100,
+        "cached_tokens": 512,
+        "cache_hit_rate": 0.5,
+    }
+    assert run["stages"]["analysis"] >= 0
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert f'llm_tokens_total{{model="{model}",kind="cached"}} 512' in response.text
+    assert f'llm_requests_total{{model="{model}",source="cache"}} 1' in response.text
+    assert 'report_stage_duration_seconds_bucket{stage="analysis",le="+Inf"}' in response.text
+
+
+def test_openai_stub_serves_completions_shards_and_job_pages():
+    import httpx
+    from openai import OpenAI
+    from backend.benchmarks.openai_stub import start_stub
+
+    server, base_url = start_stub(latency_ms=0, tokens_per_s=0)
+    try:
+        client = OpenAI(api_key="stub", base_url=f"{base_url}/v1")
+        context = [{"role": "system", "content": "resume " * 2000}]
+        full = client.chat.completions.create(
+            model="stub", messages=context + [{"role": "user", "content": "Analyze."}]
+        )
+        assert full.usage.prompt_tokens_details.cached_tokens == 0
+        assert len(json.loads(full.choices[0].message.content)) > 2
+
+        shard = "Use exactly these top-level keys: \"missing_skills\"."
+        stream = client.chat.completions.create(
+            model="stub",
+            messages=context + [{"role": "user", "content": shard}],
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        chunks = list(stream)
+        text = "".join(chunk.choices[0].delta.content or "" for chunk in chunks if chunk.choices)
+        assert list(json.loads(text)) == ["missing_skills"]
+        assert chunks[-1].usage.prompt_tokens_details.cached_tokens >= 1024
+
+        page = httpx.get(f"{base_url}/jobs/lever_data_scientist.html?report=1")
+        assert page.status_code == 200 and "<html" in page.text.lower()
+    finally:
+        server.shutdown()
+
+
+def test_llm_gateway_admits_by_priority_and_rate():
+    from backend.app.core.llm_gateway import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+    from backend.app.core.llm_gateway import PriorityLimiter, TokenBucket
+
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(30) == 30  # one token per second
+    now[0] = 30
+    bucket.adjust(-30)  # the call used less than reserved
+    assert bucket.reserve(30) == 0
+
+    limiter = PriorityLimiter(1)
+    limiter.acquire()
+    admitted = []
+
+    def worker(name, priority):
+        limiter.acquire(priority)
+        admitted.append(name)
+        limiter.release()
+
+    threads = [threading.Thread(target=worker, args=("batch", PRIORITY_BATCH))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE)))
+    threads[1].start()
+    time.sleep(0.05)
+    limiter.release()
+    for thread in threads:
+        thread.join(5)
+    assert admitted == ["interactive", "batch"]
+
+
+def test_llm_gateway_retries_rate_limits_after_retry_after():
+    import asyncio
+    from backend.app.core.llm_gateway import LLMGateway
+
+    class RateLimited(Exception):
+        status_code = 429
+        code = "rate_limit_exceeded"
+
+        class response:
+            headers = {"retry-after-ms": "50"}
+
+    class OutOfQuota(RateLimited):
+        code = "insufficient_quota"
+
+    gateway = LLMGateway("test-model", rpm=0, tpm=0, max_concurrency=8, backoff_base=0.001)
+    calls = []
+
+    def create():
+        calls.append(time.perf_counter())
+        if len(calls) < 3:
+            raise RateLimited("slow down")
+        return "ok"
+
+    assert gateway.call(create, 100) == "ok"
+    assert calls[2] - calls[0] >= 0.1
+    assert gateway.limiter.limit < 8  # halved on the first 429, then grew back a little
+    assert gateway.limiter.active == 0
+
+    async def create_async():
+        raise OutOfQuota("no credits")
+
+    with pytest.raises(OutOfQuota):
+        asyncio.run(gateway.call_async(create_async, 100))
+    assert gateway.limiter.active == 0
+
+
+def test_llm_gateway_waits_out_throttling_before_taking_a_slot():
+    from backend.app.core.llm_gateway import LLMGateway
+
+    gateway = LLMGateway("test-model", rpm=0, tpm=0, max_concurrency=1)
+    gateway.paused_until = time.monotonic() + 0.3  # a Retry-After pause
+    calls = []
+    create = lambda: calls.append(time.monotonic())
+    throttled = threading.Thread(target=gateway.call, args=(create, 10))
+    throttled.start()
+    time.sleep(0.1)
+    assert gateway.limiter.active == 0 and not calls  # waiting, but not holding the slot
+    # A pause set while the call was already waiting is honoured too
+    gateway.paused_until = time.monotonic() + 0.4
+    throttled.join(5)
+    assert calls and calls[0] >= gateway.paused_until
+    assert gateway.limiter.active == 0
+
+
+def test_openai_batch_resumes_submitted_batches(tmp_path):
+    from openai import OpenAI
+    from backend.app.core.openai_batch import batch_request, run_batch
+    from backend.benchmarks.openai_stub import start_stub
+
+    server, base_url = start_stub(latency_ms=0, tokens_per_s=0, batch_latency_s=0.2)
+    try:
+        client = OpenAI(api_key="stub", base_url=f"{base_url}/v1")
+        messages = [{"role": "user", "content": "Analyze."}]
+        requests = [batch_request(f"req-{i}", "stub", messages, 0.3) for i in range(3)]
+        state = {}
+        results = run_batch(client, requests, state, str(tmp_path), wait=False)
+        assert results == {} and state["batches"][0]["status"] == "in_progress"
+
+        # A second call (e.g. after a restart) polls the same batch to completion
+        results = run_batch(client, requests, state, str(tmp_path), poll_seconds=0.05)
+        assert len(state["batches"]) == 1 and state["batches"][0]["status"] == "completed"
+        assert sorted(results) == ["req-0", "req-1", "req-2"]
+        assert all(json.loads(result["text"]) for result in results.values())
+
+        # Runs stopped after uploading, before (or right after) creating the batch:
+        # the saved "submitting" record is created once, or adopted, never twice
+        stub = server.RequestHandlerClass.state
+        create = client.batches.create
+        for create_first in (False, True):
+            def stop(**kwargs):
+                if create_first:
+                    create(**kwargs)
+                raise KeyboardInterrupt
+            saved = []
+            save_state = lambda s: saved.append(json.dumps(s))
+            client.batches.create = stop
+            with pytest.raises(KeyboardInterrupt):
+                run_batch(client, requests, {}, str(tmp_path), save_state)
+            client.batches.create = create
+            before = len(stub.batches)
+            state = json.loads(saved[-1])
+            assert state["batches"][0]["status"] == "submitting"
+            results = run_batch(client, requests, state, str(tmp_path), poll_seconds=0.05)
+            assert len(stub.batches) == before + (not create_first)
+            assert len(state["batches"]) == 1 and sorted(results) == ["req-0", "req-1", "req-2"]
+    finally:
+        server.shutdown()
+
+
+def test_cut_off_answers_re_request_only_the_missing_sections(monkeypatch):
+    from openai import OpenAI
+    from backend.app.core import llm_cache
+    from backend.app.core.structured_output import JOB_ANALYSIS_SECTIONS, complete_json
+    from backend.benchmarks.openai_stub import start_stub
+
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+    server, base_url = start_stub(latency_ms=0, tokens_per_s=0)
+    try:
+        client = OpenAI(api_key="stub", base_url=f"{base_url}/v1")
+        messages = [{"role": "user", "content": "Analyze this job."}]
+        # An answer that hit the token limit in its second section
+        cut_off = '{"BASIC_INFORMATION": {"Job Title": "Engineer"}, "TECHNICAL_REQUIREMENTS": {"Req'
+        data = complete_json(
+            client, "stub", messages, 0.3, JOB_ANALYSIS_SECTIONS, "job_analysis", text=cut_off
+        )
+        assert data["BASIC_INFORMATION"] == {"Job Title": "Engineer"}
+        assert sorted(data) == sorted(JOB_ANALYSIS_SECTIONS)
+        assert server.RequestHandlerClass.state.requests == 1
+    finally:
+        server.shutdown()
+
+
+def test_batch_reports_cap_concurrency_and_record_failures(tmp_path, monkeypatch):
+    import asyncio
+    from fastapi.testclient import TestClient
+    from backend.app import main
+    from backend.app.agents import batch_report_agent
+    from backend.app.core.artifact_io import read_json
+
+    resume_dir = tmp_path / "resumes"
+    (resume_dir / "empty").mkdir(parents=True)
+    for name in ("a.pdf", "b.docx", "bad.pdf", "notes.txt"):
+        (resume_dir / name).write_bytes(b"resume")
+    in_flight, peak = [0], [0]
+
+    async def analyze(job_analysis, resume_text, job_url):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        if resume_text == "bad.pdf":
+            return {"error": "model failed"}
+        return {"EXECUTIVE_SUMMARY": {"Overall_Match_Percentage": "80%"}}
+
+    async def scrape(url):
+        return {"job_description": "Engineer"}
+
+    async def analyze_job(job_data):
+        return {"BASIC_INFORMATION": {"Job_Title": "Engineer"}}
+
+    monkeypatch.setattr(batch_report_agent, "BATCH_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(batch_report_agent, "ANALYSIS_INCREMENTAL", False)
+    monkeypatch.setattr(batch_report_agent, "read_resume", lambda name, directory: name)
+    monkeypatch.setattr(batch_report_agent, "scrape_job_description_async", scrape)
+    monkeypatch.setattr(batch_report_agent, "analyze_job_with_ai_async", analyze_job)
+    monkeypatch.setattr(batch_report_agent, "generate_comprehensive_analysis_async", analyze)
+
+    result = asyncio.run(
+        batch_report_agent.generate_batch_reports_async(
+            "https://example.com/job", str(resume_dir), str(tmp_path / "out"), concurrency=50
+        )
+    )
+    assert result["concurrency"] == 2 and peak[0] == 2
+    assert (result["succeeded"], result["failed"]) == (2, 1)
+    assert read_json(result["index_path"])["resumes"][0]["resume_file"] == "a.pdf"
+    assert (tmp_path / "out" / "b.docx_comprehensive_report.html").exists()
+
+    monkeypatch.setattr(main, "RESUME_DIR", str(resume_dir))
+    client = TestClient(main.app)
+    for resume_subdir, status in (("empty", 404), ("missing", 404), ("../other", 400)):
+        response = client.post(
+            "/batch-reports", json={"job_url": "https://x", "resume_dir": resume_subdir}
+        )
+        assert response.status_code == status
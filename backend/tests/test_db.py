@@ -0,0 +1,257 @@
+import os
+import gzip
+import json
+import time
+import threading
+
+import pytest
+
+from backend.app.db import models
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, "REPORT_STORE_DB", str(tmp_path / "reports.sqlite3"))
+    monkeypatch.setattr(models, "BLOB_DIR", str(tmp_path / "blobs"))
+    return tmp_path
+
+
+def test_report_store_indexes_runs_and_deduplicates_artifacts(store):
+    job = {"BASIC_INFORMATION": {"Job_Title": "Engineer"}}
+    first = models.save_report(
+        job_url="https://example.com/jobs/1",
+        resume_file="a.pdf",
+        resume_hash="r1",
+        job_analysis=job,
+        resume_analysis={"EXECUTIVE_SUMMARY": {}},
+        html_report="<html>a</html>",
+    )
+    second = models.save_report(
+        job_url="https://example.com/jobs/1", resume_file="b.pdf", resume_hash="r2", job_analysis=job
+    )
+
+    assert first["job_analysis"] == second["job_analysis"]
+    assert first["paths"]["html_report"].endswith(".html")
+    blobs = [name for _, _, names in os.walk(store / "blobs") for name in names]
+    assert len(blobs) == 3
+
+    assert [r["id"] for r in models.find_reports(job_url="https://example.com/jobs/1")] == [
+        second["id"],
+        first["id"],
+    ]
+    assert models.latest_report(resume_hash="r1")["id"] == first["id"]
+    assert models.load_artifact(first["job_analysis"]) == job
+    assert models.load_artifact(first["html_report"]) == "<html>a</html>"
+    assert models.get_report(12345) is None
+
+
+def test_streamed_report_is_stored_like_the_rendered_string(store, monkeypatch):
+    from backend.app.core.report_render import render_report, render_report_chunks, write_report
+
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    with open(os.path.join(data_dir, "reports", "swarnalatha.pdf_comprehensive_analysis.json")) as f:
+        analysis = json.load(f)
+    with open(os.path.join(data_dir, "job_descriptions", "enhanced_output.json")) as f:
+        job = json.load(f)
+
+    html = render_report(job, analysis)
+    monkeypatch.setattr(models, "REPORT_COMPRESSION", "gzip")
+    streamed = models.save_report(html_report=render_report_chunks(job, analysis))
+    rendered = models.save_report(html_report=html)
+
+    assert streamed["html_report"] == rendered["html_report"]
+    assert models.load_artifact(streamed["html_report"]) == html
+    with gzip.open(streamed["paths"]["html_report"] + ".gz", "rt", encoding="utf-8") as f:
+        assert f.read() == html
+    assert not [name for _, _, names in os.walk(store / "blobs") for name in names if ".tmp" in name]
+
+    # write_report streams through the same writer: file and gzip copy, no temporary left
+    path = str(store / "out" / "report.html")
+    assert write_report(path, job, analysis, "gzip") == len(html.encode("utf-8"))
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == html
+    with gzip.open(path + ".gz", "rt", encoding="utf-8") as f:
+        assert f.read() == html
+    assert sorted(os.listdir(store / "out")) == ["report.html", "report.html.gz"]
+
+
+def test_report_store_handles_concurrent_writers(store):
+    errors = []
+
+    def write(index):
+        try:
+            for run in range(10):
+                models.save_report(
+                    job_url=f"https://example.com/jobs/{index}",
+                    job_analysis={"shared": True},
+                    html_report=f"<html>{index}-{run}</html>",
+                )
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(models.find_reports(limit=100)) == 40
+    assert len(models.find_reports(job_url="https://example.com/jobs/2")) == 10
+
+
+def test_vector_index_query_filter_delete_and_reload(tmp_path):
+    import numpy as np
+
+    from backend.app.core.embeddings import hashing_embed
+    from backend.app.db.pinecone_client import LocalVectorIndex
+
+    texts = [
+        "Explain how a vector database indexes embeddings",
+        "Describe a conflict with a teammate and how you resolved it",
+        "How would you scale a REST API under heavy load",
+    ]
+    vectors = hashing_embed(texts, dim=256)
+    index = LocalVectorIndex(dim=256, quantize=True)
+    tags = [("technical", ["vector db"]), ("behavioral", []), ("technical", ["api"])]
+    index.upsert(
+        [
+            (f"q{i}", vector.tolist(), {"category": category, "skills": skills})
+            for i, (vector, (category, skills)) in enumerate(zip(vectors, tags))
+        ]
+    )
+
+    query = hashing_embed(["vector databases and embeddings"], dim=256)[0]
+    matches = index.query(vector=query.tolist(), top_k=2, include_metadata=True)["matches"]
+    assert matches[0]["id"] == "q0"
+    exact = float(vectors[0] @ query)
+    assert abs(matches[0]["score"] - exact) < 0.02  # int8 quantization error
+
+    filtered = index.query(vector=query.tolist(), top_k=3, filter={"category": "behavioral"})
+    assert [m["id"] for m in filtered["matches"]] == ["q1"]
+    by_skill = index.query(vector=query.tolist(), filter={"skills": {"$in": ["api"]}})
+    assert [m["id"] for m in by_skill["matches"]] == ["q2"]
+
+    batch = index.query_batch(vectors, top_k=1)
+    assert [matches[0]["id"] for matches in batch] == ["q0", "q1", "q2"]
+
+    index.delete(ids=["q0"])
+    path = str(tmp_path / "questions.npz")
+    index.save(path)
+    reloaded = LocalVectorIndex(dim=256, quantize=True, path=path)
+    assert reloaded.describe_index_stats()["total_vector_count"] == 2
+    assert set(reloaded.fetch(["q0", "q1", "q2"])["vectors"]) == {"q1", "q2"}
+    assert np.allclose(reloaded.fetch(["q2"])["vectors"]["q2"]["values"], vectors[2], atol=0.02)
+
+
+def test_vector_index_saves_merge_the_changes_of_other_writers(tmp_path):
+    from backend.app.core.embeddings import hashing_embed
+    from backend.app.db.pinecone_client import LocalVectorIndex
+
+    path = str(tmp_path / "shared.npz")
+    vectors = hashing_embed(["python", "sql", "go", "rust"], dim=64)
+    index = LocalVectorIndex(dim=64, path=path)
+    index.upsert([("base", vectors[0])])
+    index.save()
+    # Two writers (an API worker and a CLI run) opened the same file
+    api, cli = LocalVectorIndex(dim=64, path=path), LocalVectorIndex(dim=64, path=path)
+    api.upsert([("api", vectors[1])])
+    cli.upsert([("cli", vectors[2])])
+    cli.delete(ids=["base"])
+    api.save()
+    cli.save()
+    assert sorted(cli.fetch(["base", "api", "cli"])["vectors"]) == ["api", "cli"]
+
+    api.upsert([("later", vectors[3])])
+    api.save()
+    reloaded = LocalVectorIndex(dim=64, path=path)
+    assert reloaded.describe_index_stats()["total_vector_count"] == 3
+    assert sorted(reloaded.fetch(["api", "cli", "later"])["vectors"]) == ["api", "cli", "later"]
+
+
+def test_question_bank_is_retrieved_only_for_similar_jobs(monkeypatch):
+    from backend.app.db import question_bank
+    from backend.app.db.pinecone_client import LocalVectorIndex
+
+    index = LocalVectorIndex()  # in memory, default EMBEDDING_DIM
+    monkeypatch.setattr(question_bank, "question_index", lambda: index)
+    job = {
+        "BASIC_INFORMATION": {"Job_Title": "Backend Engineer", "Experience_Level": "Senior"},
+        "TECHNICAL_REQUIREMENTS": {"Required_Skills": ["Python", "PostgreSQL"]},
+    }
+    analysis = {
+        "INTERVIEW_QUESTIONS_BANK": {
+            category.replace(" ", "_"): [f"{category} on python service {i}?" for i in range(count)]
+            for category, count in question_bank.RETRIEVABLE_CATEGORIES.items()
+        }
+    }
+    assert question_bank.index_question_bank(analysis, job) == 55
+
+    bank = question_bank.retrieve_question_bank(job)
+    assert {category: len(questions) for category, questions in bank.items()} == (
+        question_bank.RETRIEVABLE_CATEGORIES
+    )
+    chef = {
+        "BASIC_INFORMATION": {"Job_Title": "Pastry Chef"},
+        "TECHNICAL_REQUIREMENTS": {"Required_Skills": ["baking"]},
+    }
+    assert question_bank.retrieve_question_bank(chef) is None
+    # A shared skill tag does not make up for a low score, nor a high score for no shared tag
+    chef["TECHNICAL_REQUIREMENTS"]["Required_Skills"].append("PostgreSQL")
+    assert question_bank.retrieve_question_bank(chef) is None
+    other_stack = {
+        "BASIC_INFORMATION": {"Job_Title": "Python Service Engineer"},
+        "TECHNICAL_REQUIREMENTS": {"Required_Skills": ["Go"]},
+    }
+    assert question_bank.retrieve_question_bank(other_stack) is None
+
+    merged = question_bank.merge_question_bank(
+        {"INTERVIEW QUESTIONS BANK": {"Company-Specific Questions": ["Why us?"]}}, bank
+    )
+    assert merged["INTERVIEW QUESTIONS BANK"]["Company-Specific Questions"] == ["Why us?"]
+    assert len(merged["INTERVIEW QUESTIONS BANK"]["Technical Questions"]) == 20
+
+
+def test_compressed_json_artifacts_are_written_atomically_and_read_back(store, monkeypatch):
+    from backend.app.core import artifact_io
+
+    analysis = {"EXECUTIVE_SUMMARY": {"Match": "85%", "Notes": "naïve café"}, "big": 2**70 + 1}
+    path = str(store / "out" / "analysis.json")
+    assert artifact_io.write_json(path, analysis, compression="none") == path
+    written = artifact_io.write_json(path, analysis, compression="gzip", fsync="dir")
+
+    # The plain variant is removed, reads find and decompress the gzip one
+    assert written == path + ".gz" and not os.path.exists(path)
+    assert artifact_io.read_json(path) == analysis
+    assert os.listdir(store / "out") == ["analysis.json.gz"]
+
+    monkeypatch.setattr(models, "ARTIFACT_COMPRESSION", "gzip")
+    record = models.save_report(job_analysis=analysis)
+    assert record["paths"]["job_analysis"].endswith(".json.gz")
+    assert models.load_artifact(record["job_analysis"]) == analysis
+
+
+def test_llm_cache_expires_evicts_least_recently_used_and_counts(tmp_path, monkeypatch):
+    from backend.app.core import llm_cache
+
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DB", str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_MAX_BYTES", 250)
+    monkeypatch.setattr(llm_cache, "_since_evict", {"stores": 0, "bytes": 0})
+    before = llm_cache.cache_stats()
+
+    llm_cache.store_response("expired", "m", "x" * 10, ttl=-1)
+    assert llm_cache.get_cached_response("expired") is None
+    for key in ("a", "b"):
+        llm_cache.store_response(key, "m", key * 100)
+        time.sleep(0.01)
+    assert llm_cache.get_cached_response("a") == "a" * 100  # a is now more recent than b
+    llm_cache.store_response("c", "m", "c" * 100)
+
+    assert llm_cache.get_cached_response("b") is None
+    assert llm_cache.get_cached_response("a") and llm_cache.get_cached_response("c")
+    stats = llm_cache.cache_stats()
+    assert stats["entries"] == 2 and stats["size_bytes"] == 200
+    assert stats["hits"] - before["hits"] == 3
+    assert stats["misses"] - before["misses"] == 2
+    assert stats["stores"] - before["stores"] == 4
+    assert stats["evictions"] - before["evictions"] == 1